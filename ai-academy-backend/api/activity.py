@@ -0,0 +1,114 @@
+"""
+Write-behind tracking of User.time_spent and User.last_activity.
+
+Heartbeats only add to an in-process buffer. A daemon thread folds the
+buffer into the database every ACTIVITY_FLUSH_INTERVAL seconds (and at
+process exit) with one UPDATE ... SET time_spent = time_spent + n per
+distinct increment, so thousands of heartbeats become a few statements.
+The UPDATE bypasses save(): updated_at is not bumped and no row is
+rewritten. With ACTIVITY_FLUSH_INTERVAL <= 0 every heartbeat is written
+immediately (handy for tests and single-user development).
+
+The buffer is also flushed when a gunicorn worker exits (the worker_exit
+hook in gunicorn.conf.py), which covers graceful restarts, max-requests
+recycling and worker timeouts. A worker that dies without running any exit
+code (SIGKILL, the OOM killer, a hard crash) loses what it buffered: at most
+ACTIVITY_FLUSH_INTERVAL seconds of heartbeats from that worker. That loss
+is accepted for a time-spent counter; set the interval to 0 where it is not.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import analytics, caching
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # user_id -> [minutes, last_activity date]
+        self._thread = None
+
+    def add(self, user_id, minutes):
+        today = timezone.localdate()
+        with self._lock:
+            entry = self._pending.setdefault(user_id, [0, today])
+            entry[0] += minutes
+            entry[1] = max(entry[1], today)
+        if self.interval() <= 0:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def interval(self):
+        return getattr(settings, 'ACTIVITY_FLUSH_INTERVAL', 10)
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def flush(self):
+        """Write buffered activity to the database; returns users updated"""
+        pending = self.drain()
+        if not pending:
+            return 0
+        groups = {}
+        for user_id, (minutes, day) in pending.items():
+            groups.setdefault((minutes, day), []).append(user_id)
+        try:
+            with transaction.atomic():
+                for (minutes, day), user_ids in groups.items():
+                    User.objects.filter(pk__in=user_ids).update(
+                        time_spent=F('time_spent') + minutes,
+                        last_activity=day,
+                    )
+                caching.invalidate('users')
+                analytics.schedule(user_ids=pending)
+        except Exception:
+            # Put the increments back so the next flush retries them
+            with self._lock:
+                for user_id, (minutes, day) in pending.items():
+                    entry = self._pending.setdefault(user_id, [0, day])
+                    entry[0] += minutes
+                    entry[1] = max(entry[1], day)
+            raise
+        return len(pending)
+
+    def _ensure_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='activity-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval())
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush user activity')
+            finally:
+                connections.close_all()
+
+
+buffer = ActivityBuffer()
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        buffer.flush()
+    except Exception:
+        logger.exception('Failed to flush user activity at exit')
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import (
     User, Module, Lesson, Question, Answer,
-    UserProgress, TestResult, AIAgent, AIAgentQuestion, AIAgentQuestionOption
+    UserProgress, LessonProgress, TestResult, AIAgent, AIAgentQuestion, AIAgentQuestionOption
 )
 
 
@@ -71,6 +71,14 @@ class UserProgressAdmin(admin.ModelAdmin):
     ordering = ['-updated_at']
 
 
+@admin.register(LessonProgress)
+class LessonProgressAdmin(admin.ModelAdmin):
+    list_display = ['user', 'lesson', 'viewed_at', 'completed_at']
+    list_filter = ['lesson__module']
+    search_fields = ['user__username', 'user__email', 'lesson__title']
+    ordering = ['-viewed_at']
+
+
 @admin.register(TestResult)
 class TestResultAdmin(admin.ModelAdmin):
     list_display = ['user', 'module', 'lesson', 'score', 'passed', 'completed_at']
@@ -0,0 +1,249 @@
+"""
+Server-side analytics rollups.
+
+UserStats, DepartmentStats and ModuleStats hold precomputed counters so the
+/api/analytics/ endpoints answer from a single indexed row instead of
+shipping raw progress and test-result rows to the browser. Averages and
+pass rates are derived from the stored counts and sums.
+
+Writes call schedule() with the users they touched. After the transaction
+commits, only those users' UserStats rows are recomputed (from their own
+results and progress), and each affected DepartmentStats row is moved by
+the difference with F() updates; no department is aggregated again.
+ModuleStats is left to `python manage.py rebuild_analytics --modules`,
+meant to run periodically (e.g. from cron), so a write never aggregates
+a whole module. `python manage.py rebuild_analytics` recomputes
+everything, for backfills, to correct drift, or when
+ANALYTICS_LIVE_UPDATES is switched off.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from . import caching
+from .models import (
+    User, Module, UserProgress, TestResult,
+    UserStats, DepartmentStats, ModuleStats
+)
+
+BATCH_SIZE = 1000
+
+SCORE_AGGREGATES = {
+    'results_count': Count('id'),
+    'score_sum': Sum('score'),
+    'passed_count': Count('id', filter=Q(passed=True)),
+}
+COMPLETED = Q(total_lessons__gt=0, completed_lessons__gte=F('total_lessons'))
+
+# UserStats counters that DepartmentStats adds up
+DEPARTMENT_TOTALS = ['results_count', 'score_sum', 'passed_count', 'modules_completed', 'time_spent']
+
+
+def refresh_users(user_ids):
+    """Recompute UserStats for the given users; returns {department: Counter of changes to its totals}"""
+    user_ids = set(user_ids)
+    # Locked: two refreshes of a user must not both apply the same difference
+    stored = list(
+        UserStats.objects.select_for_update().filter(user_id__in=user_ids)
+        .values('department', *DEPARTMENT_TOTALS)
+    )
+    scores = {
+        row.pop('user_id'): row
+        for row in TestResult.objects.filter(user_id__in=user_ids, lesson__isnull=True)
+        .order_by().values('user_id').annotate(**SCORE_AGGREGATES)
+    }
+    progress = {
+        row.pop('user_id'): row
+        for row in UserProgress.objects.filter(user_id__in=user_ids)
+        .order_by().values('user_id').annotate(
+            modules_started=Count('id', filter=Q(started=True)),
+            modules_completed=Count('id', filter=COMPLETED),
+        )
+    }
+
+    rows = []
+    for user_id, department, time_spent in (
+        User.objects.filter(id__in=user_ids).values_list('id', 'department', 'time_spent')
+    ):
+        score = scores.get(user_id, {})
+        done = progress.get(user_id, {})
+        rows.append(UserStats(
+            user_id=user_id,
+            department=department,
+            results_count=score.get('results_count', 0),
+            score_sum=score.get('score_sum') or 0,
+            passed_count=score.get('passed_count', 0),
+            modules_started=done.get('modules_started', 0),
+            modules_completed=done.get('modules_completed', 0),
+            time_spent=time_spent,
+        ))
+    UserStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=[
+            'department', 'results_count', 'score_sum', 'passed_count',
+            'modules_started', 'modules_completed', 'time_spent', 'updated_at',
+        ],
+    )
+
+    changes = {}
+    for sign, department, totals in (
+        [(-1, row['department'], [row[field] for field in DEPARTMENT_TOTALS]) for row in stored]
+        + [(1, row.department, [getattr(row, field) for field in DEPARTMENT_TOTALS]) for row in rows]
+    ):
+        change = changes.setdefault(department, Counter())
+        change['users_count'] += sign
+        for field, value in zip(DEPARTMENT_TOTALS, totals):
+            change[field] += sign * value
+    return changes
+
+
+def move_departments(changes):
+    """Add {department: Counter} to the DepartmentStats rows with F() updates; drops emptied departments"""
+    changes = {
+        department: {field: value for field, value in change.items() if value}
+        for department, change in changes.items()
+    }
+    changes = {department: change for department, change in changes.items() if change}
+    if not changes:
+        return
+    DepartmentStats.objects.bulk_create(
+        [DepartmentStats(department=department) for department in changes], ignore_conflicts=True,
+    )
+    now = timezone.now()
+    for department, change in changes.items():
+        DepartmentStats.objects.filter(department=department).update(
+            updated_at=now, **{field: F(field) + value for field, value in change.items()}
+        )
+    DepartmentStats.objects.filter(department__in=changes, users_count__lte=0).delete()
+
+
+def refresh_departments(departments):
+    """Recompute DepartmentStats from the (already fresh) UserStats rows"""
+    departments = set(departments)
+    rows = [
+        DepartmentStats(department=row.pop('department'), **row)
+        for row in UserStats.objects.filter(department__in=departments)
+        .order_by().values('department').annotate(
+            users_count=Count('user'),
+            results_count=Sum('results_count'),
+            score_sum=Sum('score_sum'),
+            passed_count=Sum('passed_count'),
+            modules_completed=Sum('modules_completed'),
+            time_spent=Sum('time_spent'),
+        )
+    ]
+    DepartmentStats.objects.filter(department__in=departments - {row.department for row in rows}).delete()
+    DepartmentStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['department'],
+        update_fields=[
+            'users_count', 'results_count', 'score_sum', 'passed_count',
+            'modules_completed', 'time_spent', 'updated_at',
+        ],
+    )
+
+
+def refresh_modules(module_ids):
+    """Recompute ModuleStats for the given modules"""
+    module_ids = set(Module.objects.filter(id__in=module_ids).values_list('id', flat=True))
+    scores = {
+        row.pop('module_id'): row
+        for row in TestResult.objects.filter(module_id__in=module_ids, lesson__isnull=True)
+        .order_by().values('module_id').annotate(**SCORE_AGGREGATES)
+    }
+    learners = {
+        row.pop('module_id'): row
+        for row in UserProgress.objects.filter(module_id__in=module_ids)
+        .order_by().values('module_id').annotate(
+            learners_started=Count('id', filter=Q(started=True)),
+            learners_completed=Count('id', filter=COMPLETED),
+        )
+    }
+    rows = [
+        ModuleStats(
+            module_id=module_id,
+            results_count=scores.get(module_id, {}).get('results_count', 0),
+            score_sum=scores.get(module_id, {}).get('score_sum') or 0,
+            passed_count=scores.get(module_id, {}).get('passed_count', 0),
+            learners_started=learners.get(module_id, {}).get('learners_started', 0),
+            learners_completed=learners.get(module_id, {}).get('learners_completed', 0),
+        )
+        for module_id in module_ids
+    ]
+    ModuleStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['module'],
+        update_fields=[
+            'results_count', 'score_sum', 'passed_count',
+            'learners_started', 'learners_completed', 'updated_at',
+        ],
+    )
+
+
+def refresh(user_ids=(), changes=None):
+    """Recompute the users' rows and move the departments by their differences (plus `changes`)"""
+    changes = {department: Counter(change) for department, change in (changes or {}).items()}
+    with transaction.atomic():
+        for department, change in (refresh_users(user_ids) if user_ids else {}).items():
+            changes.setdefault(department, Counter()).update(change)
+        move_departments(changes)
+        # Rollups are written with bulk upserts and queryset updates, which send no signals
+        caching.invalidate('analytics')
+
+
+def schedule(user_ids=()):
+    """Refresh the users' rollups once the current transaction commits"""
+    if not getattr(settings, 'ANALYTICS_LIVE_UPDATES', True):
+        return
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: refresh(user_ids))
+
+
+def retract_user(user_id):
+    """Take a user who is about to be deleted (with their UserStats row) out of their department's totals"""
+    if not getattr(settings, 'ANALYTICS_LIVE_UPDATES', True):
+        return
+    row = UserStats.objects.filter(user_id=user_id).values('department', *DEPARTMENT_TOTALS).first()
+    if row is None:
+        return
+    change = Counter({field: -row[field] for field in DEPARTMENT_TOTALS}, users_count=-1)
+    transaction.on_commit(lambda: refresh(changes={row['department']: change}))
+
+
+def _batches(values):
+    values = list(values)
+    for start in range(0, len(values), BATCH_SIZE):
+        yield values[start:start + BATCH_SIZE]
+
+
+def rebuild_modules():
+    """Recompute every ModuleStats row (writes do not refresh them; run this periodically)"""
+    for batch in _batches(Module.objects.values_list('id', flat=True).order_by('id')):
+        with transaction.atomic():
+            refresh_modules(batch)
+    caching.invalidate('module_analytics')
+    return ModuleStats.objects.count()
+
+
+def rebuild():
+    """Recompute every rollup row from the source tables"""
+    for batch in _batches(User.objects.values_list('id', flat=True).order_by('id')):
+        with transaction.atomic():
+            refresh_users(batch)
+    departments = set(UserStats.objects.order_by().values_list('department', flat=True).distinct())
+    with transaction.atomic():
+        DepartmentStats.objects.exclude(department__in=departments).delete()
+        refresh_departments(departments)
+    caching.invalidate('analytics')
+    return {
+        'users': UserStats.objects.count(),
+        'departments': DepartmentStats.objects.count(),
+        'modules': rebuild_modules(),
+    }
@@ -0,0 +1,86 @@
+"""
+Async (ASGI) variants of the hot student read endpoints.
+
+DRF viewsets are synchronous, so these are plain Django async views that
+use the async ORM and return the same JSON as their DRF counterparts,
+serialized the same way (compiled plans and FastJSONRenderer where the DRF
+view uses them, api.compiled):
+
+- GET /api/async/modules/ - ModuleViewSet.list (catalog snapshot, ETag/304)
+- GET /api/async/lessons/by_module/?module_id= - LessonViewSet.by_module
+- GET /api/async/questions/by_module/?module_id= - QuestionViewSet.by_module
+- GET /api/async/progress/by_user/?user_id= - UserProgressViewSet.by_user
+
+Under an ASGI server a worker keeps serving other requests while these
+wait on the database.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from . import catalog, compiled, queries
+from .models import UserProgress
+from .serializers import LessonSerializer, QuestionSerializer, UserProgressSerializer
+
+
+def render(data, status=200, renderer_class=JSONRenderer):
+    return HttpResponse(renderer_class().render(data), status=status, content_type='application/json')
+
+
+async def _by(request, param, queryset, serializer_class, compile=False):
+    """Shared body of the ?<param>=<id> list endpoints; `compile` as in the DRF view's CompiledListMixin"""
+    value = request.GET.get(param)
+    if not value:
+        return render({'error': f'{param} parameter required'}, status=400)
+    queryset = queryset.filter(**{param: value})
+    drf_request = Request(request)
+    serializer = serializer_class(context={'request': drf_request})
+    plan = None
+    if compile and not serializer.requested_expansions(drf_request):
+        plan = compiled.plan_for(serializer_class, list(serializer.fields))
+    if plan is None:
+        rows = [row async for row in queryset]
+        data = serializer_class(rows, many=True, context={'request': drf_request}).data
+    else:
+        values = [row async for row in plan.queryset(queryset)]
+        # Nested lists are one more (sync) query per relation
+        data = await sync_to_async(plan.rows)(values) if plan.nested else plan.rows(values)
+    return render(data, renderer_class=compiled.FastJSONRenderer if compile else JSONRenderer)
+
+
+@require_GET
+async def modules(request):
+    drf_request = Request(request)
+    snapshot = await catalog.aget_snapshot()
+    etag = catalog.etag_for(snapshot, drf_request)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+
+    paginator = PageNumberPagination()
+    page = paginator.paginate_queryset(catalog.modules_for(snapshot, drf_request), drf_request)
+    response = render(paginator.get_paginated_response(page).data)
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+@require_GET
+async def lessons_by_module(request):
+    return await _by(request, 'module_id', queries.lessons(), LessonSerializer)
+
+
+@require_GET
+async def questions_by_module(request):
+    return await _by(request, 'module_id', queries.questions(), QuestionSerializer, compile=True)
+
+
+@require_GET
+async def progress_by_user(request):
+    queryset = UserProgress.objects.all().select_related('user', 'module')
+    return await _by(request, 'user_id', queryset, UserProgressSerializer, compile=True)
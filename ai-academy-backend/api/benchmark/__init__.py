@@ -0,0 +1,9 @@
+"""
+Repeatable API benchmark (python manage.py benchmark).
+
+- dataset: seeds a synthetic dataset of configurable size with bulk_create
+- scenarios: one request per router endpoint, built from the seeded ids
+- runner: drives the endpoints through the Django test client, measures
+  throughput, latency percentiles and query counts, and compares them
+  with a stored baseline
+"""
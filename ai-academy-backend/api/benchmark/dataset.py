@@ -0,0 +1,122 @@
+"""
+Synthetic benchmark dataset, written with bulk_create.
+
+Sizes are per parent: lessons per module, questions per lesson, answers
+per question. Every user has progress on every module and a module-final
+test result on about half of them. A fixed random seed makes the dataset,
+and therefore the benchmark, repeatable.
+"""
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .. import analytics, leaderboards
+from ..models import (
+    User, Module, Lesson, Question, Answer, UserProgress, TestResult,
+    AIAgent, AIAgentQuestion, AIAgentQuestionOption
+)
+
+DEFAULT_SIZES = {
+    'users': 1000,
+    'modules': 10,
+    'lessons': 5,
+    'questions': 4,
+    'answers': 4,
+}
+
+DEPARTMENTS = ['sales', 'marketing', 'finance', 'it', 'hr', 'support', 'legal', 'operations']
+
+BATCH_SIZE = 1000
+
+
+def seed(users, modules, lessons, questions, answers, random_seed=0):
+    """Fill an empty database; returns row counts per table"""
+    rng = random.Random(random_seed)
+    password = make_password('benchmark')
+
+    with transaction.atomic():
+        user_rows = User.objects.bulk_create([
+            User(
+                username=f'user{i}', email=f'user{i}@example.com', password=password,
+                first_name=f'First{i}', last_name=f'Last{i}',
+                department=DEPARTMENTS[i % len(DEPARTMENTS)],
+                time_spent=rng.randint(0, 600),
+            )
+            for i in range(users)
+        ], batch_size=BATCH_SIZE)
+
+        module_rows = Module.objects.bulk_create([
+            Module(title=f'Module {i}', description=f'Description of module {i}', duration=60, order=i)
+            for i in range(modules)
+        ])
+
+        lesson_rows = Lesson.objects.bulk_create([
+            Lesson(
+                module=module, title=f'Lesson {j}', content='Lorem ipsum dolor sit amet. ' * 40,
+                video_url='https://example.com/video', order=j,
+            )
+            for module in module_rows for j in range(lessons)
+        ], batch_size=BATCH_SIZE)
+
+        question_rows = Question.objects.bulk_create([
+            Question(module_id=lesson.module_id, lesson=lesson, question_text=f'Question {k}?', order=k)
+            for lesson in lesson_rows for k in range(questions)
+        ], batch_size=BATCH_SIZE)
+
+        answer_rows = Answer.objects.bulk_create([
+            Answer(question=question, answer_text=f'Answer {n}', is_correct=(n == 0), order=n)
+            for question in question_rows for n in range(answers)
+        ], batch_size=BATCH_SIZE)
+
+        progress_rows = UserProgress.objects.bulk_create([
+            UserProgress(
+                user=user, module=module, started=True,
+                viewed_lessons=rng.randint(0, lessons), completed_lessons=rng.randint(0, lessons),
+                total_lessons=lessons,
+            )
+            for user in user_rows for module in module_rows
+        ], batch_size=BATCH_SIZE)
+
+        result_rows = []
+        for user in user_rows:
+            for module in module_rows:
+                if rng.random() < 0.5:
+                    score = rng.randint(0, 100)
+                    result_rows.append(TestResult(
+                        user=user, module=module, score=score, passed=score >= 70, best_score=score,
+                    ))
+        TestResult.objects.bulk_create(result_rows, batch_size=BATCH_SIZE)
+
+        agent_rows = AIAgent.objects.bulk_create([
+            AIAgent(
+                user=user, area='support', autonomy_level='medium', data_types='text',
+                language_model='GPT-4', response_speed='fast', integrations='email',
+                personalization='high', success_metrics='csat', learning_capability='yes', budget='low',
+            )
+            for user in user_rows[::10]
+        ], batch_size=BATCH_SIZE)
+
+        agent_questions = AIAgentQuestion.objects.bulk_create([
+            AIAgentQuestion(question_id=i + 1, question_text=f'Agent question {i + 1}?', order=i)
+            for i in range(10)
+        ])
+        AIAgentQuestionOption.objects.bulk_create([
+            AIAgentQuestionOption(question=question, option_text=f'Option {n}', order=n)
+            for question in agent_questions for n in range(5)
+        ])
+
+    # bulk_create sends no signals, so build the rollups and boards in one pass
+    analytics.rebuild()
+    leaderboards.rebuild()
+
+    return {
+        'users': len(user_rows),
+        'modules': len(module_rows),
+        'lessons': len(lesson_rows),
+        'questions': len(question_rows),
+        'answers': len(answer_rows),
+        'progress': len(progress_rows),
+        'test_results': len(result_rows),
+        'ai_agents': len(agent_rows),
+    }
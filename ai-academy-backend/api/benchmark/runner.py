@@ -0,0 +1,77 @@
+"""
+Drive the scenarios through the Django test client and compare with a baseline.
+
+A scenario is warmed up with one request (filling caches and compiled
+answer keys), its query count is taken from a second request under
+CaptureQueriesContext, and then it is timed over `requests` sequential
+requests without query capture so the measurement carries no overhead.
+"""
+import json
+import math
+import time
+
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def call(client, method, url, body):
+    if body is None:
+        response = getattr(client, method)(url)
+    else:
+        response = getattr(client, method)(url, json.dumps(body), content_type='application/json')
+    if response.status_code >= 400:
+        raise AssertionError(f'{method.upper()} {url} returned {response.status_code}: {response.content[:200]!r}')
+    return response
+
+
+def measure(client, scenario, requests):
+    """{'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries'} for one scenario"""
+    method, url, body = scenario
+    call(client, method, url, body)
+    reset_queries()
+    with CaptureQueriesContext(connection) as captured:
+        call(client, method, url, body)
+    queries = len(captured)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        call(client, method, url, body)
+        latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'queries': queries,
+    }
+
+
+def compare(results, baseline, tolerance, timings=True):
+    """
+    Regressions against a baseline: any increase in query count, and with
+    `timings`, p95 latency above or throughput below the baseline by more
+    than `tolerance` (0.5 = 50%).
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(f'{name}: {current["queries"]} queries (baseline {previous["queries"]})')
+        if not timings:
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{name}: p95 {current["p95_ms"]} ms (baseline {previous["p95_ms"]} ms)')
+        if current['rps'] * (1 + tolerance) < previous['rps']:
+            regressions.append(f'{name}: {current["rps"]} req/s (baseline {previous["rps"]} req/s)')
+    return regressions
@@ -0,0 +1,94 @@
+"""
+One benchmark request per router endpoint.
+
+Each scenario is (method, url, body); urls and bodies are filled from
+ids of the seeded dataset. Writes are limited to actions that can be
+repeated without growing the tables (upserts, heartbeats, a PATCH that
+keeps the same value), so every run measures the same data.
+"""
+from ..models import (
+    User, Module, Lesson, Question, Answer, UserProgress, TestResult, AIAgent, AIAgentQuestion
+)
+
+
+def sample_ids():
+    """Ids of representative rows in the seeded dataset"""
+    user = User.objects.order_by('id').first()
+    module = Module.objects.order_by('id').first()
+    agent = AIAgent.objects.order_by('id').first()
+    return {
+        'user_id': user.id,
+        'username': user.username,
+        'department': user.department,
+        'module_id': module.id,
+        'lesson_id': Lesson.objects.filter(module=module).order_by('id').values_list('id', flat=True).first(),
+        'question_id': Question.objects.filter(module=module).order_by('id').values_list('id', flat=True).first(),
+        'progress_id': UserProgress.objects.filter(user=user).order_by('id').values_list('id', flat=True).first(),
+        'result_id': TestResult.objects.order_by('id').values_list('id', flat=True).first(),
+        'agent_id': agent.id,
+        'agent_user_id': agent.user_id,
+        'agent_question_id': AIAgentQuestion.objects.order_by('id').values_list('id', flat=True).first(),
+        'user_ids': list(User.objects.order_by('id').values_list('id', flat=True)[:50]),
+        'answers': {
+            str(question_id): [answer_id]
+            for question_id, answer_id in (
+                Answer.objects.filter(question__module=module, is_correct=True).values_list('question_id', 'id')
+            )
+        },
+    }
+
+
+def build(ids):
+    """{name: (method, url, body)} for every endpoint"""
+    user, module = ids['user_id'], ids['module_id']
+    return {
+        'users.list': ('get', '/api/users/', None),
+        'users.retrieve': ('get', f'/api/users/{user}/', None),
+        'users.detail_with_progress': ('get', f'/api/users/{user}/detail_with_progress/', None),
+        'users.search': ('get', f'/api/users/search/?q={ids["username"]}', None),
+        'users.partial_update': ('patch', f'/api/users/{user}/', {'department': ids['department']}),
+        'users.heartbeat': ('post', f'/api/users/{user}/heartbeat/', {'minutes': 1}),
+        'modules.list': ('get', '/api/modules/', None),
+        'modules.retrieve': ('get', f'/api/modules/{module}/', None),
+        'modules.all_with_inactive': ('get', '/api/modules/all_with_inactive/', None),
+        'lessons.list': ('get', '/api/lessons/', None),
+        'lessons.retrieve': ('get', f'/api/lessons/{ids["lesson_id"]}/', None),
+        'lessons.by_module': ('get', f'/api/lessons/by_module/?module_id={module}', None),
+        'lessons.body': ('get', f'/api/lessons/{ids["lesson_id"]}/body/', None),
+        'questions.list': ('get', '/api/questions/', None),
+        'questions.retrieve': ('get', f'/api/questions/{ids["question_id"]}/', None),
+        'questions.by_module': ('get', f'/api/questions/by_module/?module_id={module}', None),
+        'progress.list': ('get', '/api/progress/', None),
+        'progress.retrieve': ('get', f'/api/progress/{ids["progress_id"]}/', None),
+        'progress.by_user': ('get', f'/api/progress/by_user/?user_id={user}', None),
+        'progress.update_or_create': ('post', '/api/progress/update_or_create/', {
+            'user_id': user, 'module_id': module, 'viewed_lessons': 1,
+        }),
+        'progress.bulk_update_or_create': ('post', '/api/progress/bulk_update_or_create/', {
+            'items': [{'user_id': user_id, 'module_id': module, 'viewed_lessons': 1} for user_id in ids['user_ids']],
+        }),
+        'test_results.list': ('get', '/api/test-results/', None),
+        'test_results.retrieve': ('get', f'/api/test-results/{ids["result_id"]}/', None),
+        'test_results.by_user': ('get', f'/api/test-results/by_user/?user_id={user}', None),
+        'test_results.create': ('post', '/api/test-results/', {
+            'user': user, 'module': module, 'score': 80, 'passed': True,
+        }),
+        'test_results.grade': ('post', '/api/test-results/grade/', {
+            'user': user, 'module': module, 'answers': ids['answers'],
+        }),
+        'ai_agents.list': ('get', '/api/ai-agents/', None),
+        'ai_agents.retrieve': ('get', f'/api/ai-agents/{ids["agent_id"]}/', None),
+        'ai_agents.by_user': ('get', f'/api/ai-agents/by_user/?user_id={ids["agent_user_id"]}', None),
+        'ai_agent_questions.list': ('get', '/api/ai-agent-questions/', None),
+        'ai_agent_questions.retrieve': ('get', f'/api/ai-agent-questions/{ids["agent_question_id"]}/', None),
+        'ai_agent_questions.questionnaire': ('get', '/api/ai-agent-questions/questionnaire/', None),
+        'analytics.users.list': ('get', '/api/analytics/users/', None),
+        'analytics.users.retrieve': ('get', f'/api/analytics/users/{user}/', None),
+        'analytics.departments.list': ('get', '/api/analytics/departments/', None),
+        'analytics.departments.retrieve': ('get', f'/api/analytics/departments/{ids["department"]}/', None),
+        'analytics.modules.list': ('get', '/api/analytics/modules/', None),
+        'analytics.modules.retrieve': ('get', f'/api/analytics/modules/{module}/', None),
+        'leaderboards.top': ('get', '/api/leaderboards/top/', None),
+        'leaderboards.top.module': ('get', f'/api/leaderboards/top/?module_id={module}', None),
+        'leaderboards.rank': ('get', f'/api/leaderboards/rank/?user_id={user}', None),
+    }
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark of the compiled serializers (api.compiled) against DRF.
+
+Each target renders the same queryset twice: through the regular
+serializer and JSONRenderer, and through its compiled plan and
+FastJSONRenderer. Both paths include their queries. The outputs must be
+byte-identical; the timings are the median of `repeat` runs.
+"""
+import statistics
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from .. import compiled, queries
+from ..models import AIAgentQuestion, TestResult, UserProgress
+from ..serializers import AIAgentQuestionSerializer, QuestionSerializer, TestResultSerializer, UserProgressSerializer
+
+TARGETS = {
+    'test_results': (TestResultSerializer, lambda: TestResult.objects.select_related('user', 'module', 'lesson')),
+    'progress': (UserProgressSerializer, lambda: UserProgress.objects.select_related('user', 'module')),
+    'questions': (QuestionSerializer, queries.questions),
+    'ai_agent_questions': (AIAgentQuestionSerializer, lambda: AIAgentQuestion.objects.prefetch_related('options')),
+}
+
+
+def _median_ms(render, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def measure(serializer_class, queryset, repeat):
+    """{'rows', 'bytes', 'identical', 'regular_ms', 'compiled_ms', 'speedup'} for one serializer"""
+    plan = compiled.plan_for(serializer_class)
+    if plan is None:
+        raise ValueError(f'{serializer_class.__name__} cannot be compiled')
+
+    def regular():
+        return JSONRenderer().render(serializer_class(queryset(), many=True).data)
+
+    def fast():
+        return compiled.FastJSONRenderer().render(plan.rows(plan.queryset(queryset())))
+
+    expected, actual = regular(), fast()
+    regular_ms, compiled_ms = _median_ms(regular, repeat), _median_ms(fast, repeat)
+    return {
+        'rows': queryset().count(),
+        'bytes': len(expected),
+        'identical': expected == actual,
+        'regular_ms': round(regular_ms, 2),
+        'compiled_ms': round(compiled_ms, 2),
+        'speedup': round(regular_ms / compiled_ms, 1) if compiled_ms else None,
+    }
+
+
+def run(repeat=20, targets=None):
+    return {name: measure(*TARGETS[name], repeat) for name in (targets or TARGETS)}
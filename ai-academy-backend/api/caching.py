@@ -0,0 +1,192 @@
+"""
+Namespaced, versioned response cache shared by all workers.
+
+Cached entries live in the API_CACHE_ALIAS cache: the in-process LRU
+(LocMemCache) by default, or Redis when REDIS_URL is set in production,
+so every worker sees the same entries. With the in-process default each
+worker has its own versions and entries; its version tokens then expire
+after API_CACHE_TIMEOUT like the entries, so anything tied to a token
+(entries, and process memos such as api.grading's answer keys) sees
+another worker's writes within that time. Each namespace covers a group of
+api models and has a version token; an entry's key embeds the tokens of
+the namespaces it depends on. Invalidating a namespace replaces its token
+(after commit), which orphans every entry built from the old data without
+having to find or delete them; orphans age out by timeout or LRU.
+
+Model saves and deletes invalidate their namespace through
+api.signals.invalidate_cached_responses. Bulk writes that bypass signals
+(upserts, raw SQL, queryset updates) call invalidate() themselves.
+
+Viewsets opt in with CachedResponseMixin (list/retrieve) or decorate extra
+GET actions with @cached_response(...). Responses are only cached when
+is_shared(): from a process-private cache a worker would keep serving
+responses that another worker's write made stale. Hits and misses are
+counted per namespace and exported on /api/metrics/.
+"""
+import hashlib
+import threading
+import uuid
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from . import replicas
+from .models import (
+    User, Module, Lesson, Question, Answer, UserProgress, TestResult,
+    AIAgent, AIAgentQuestion, AIAgentQuestionOption,
+    UserStats, DepartmentStats, ModuleStats, LeaderboardEntry
+)
+
+NAMESPACES = {
+    'content': [Module, Lesson, Question, Answer],
+    'users': [User],
+    'progress': [UserProgress],
+    'results': [TestResult],
+    'agents': [AIAgent],
+    'agent_questions': [AIAgentQuestion, AIAgentQuestionOption],
+    'analytics': [UserStats, DepartmentStats],
+    'module_analytics': [ModuleStats],
+    'leaderboards': [LeaderboardEntry],
+}
+
+# Backends whose entries are private to one process
+LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+_model_namespaces = {model: name for name, models in NAMESPACES.items() for model in models}
+
+_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+
+
+def _cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def is_shared():
+    """Whether every worker process sees the same API cache (and version tokens)"""
+    alias = getattr(settings, 'API_CACHE_ALIAS', 'default')
+    return settings.CACHES[alias]['BACKEND'] not in LOCAL_BACKENDS
+
+
+def _token_timeout():
+    # Private tokens never see other workers' bumps; expiring them bounds how long that lasts
+    return None if is_shared() else getattr(settings, 'API_CACHE_TIMEOUT', 300)
+
+
+def _version_key(namespace):
+    return f'api:ns:{namespace}'
+
+
+def namespace_for(model):
+    """Namespace of an api model, or None for models that are not cached"""
+    return _model_namespaces.get(model)
+
+
+def versions(namespaces):
+    """Current version token of each namespace (one cache round trip)"""
+    cache = _cache()
+    keys = [_version_key(name) for name in namespaces]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            token = uuid.uuid4().hex
+            cache.add(key, token, _token_timeout())
+            # A DummyCache keeps nothing: every lookup then misses and builds
+            found[key] = cache.get(key) or token
+    return [found[key] for key in keys]
+
+
+def make_key(namespaces, key):
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+    return f"api:{'+'.join(namespaces)}:{'.'.join(versions(namespaces))}:{digest}"
+
+
+def invalidate(*namespaces):
+    """Start new versions of the namespaces once the current transaction commits"""
+    def bump():
+        _cache().set_many({_version_key(name): uuid.uuid4().hex for name in namespaces}, _token_timeout())
+    transaction.on_commit(bump)
+
+
+def get_or_build(namespaces, key, build, timeout=None):
+    """Cached value for key under namespaces, or build() it and store it"""
+    namespaces = tuple(namespaces)
+    cache_key = make_key(namespaces, key)
+    value = _cache().get(cache_key)
+    label = '+'.join(namespaces)
+    if value is not None:
+        with _lock:
+            _hits[label] += 1
+        return value
+    with _lock:
+        _misses[label] += 1
+    # From the primary: a lagging replica would store stale data under the new version
+    with replicas.use_primary():
+        value = build()
+    if value is not None:
+        if timeout is None:
+            timeout = getattr(settings, 'API_CACHE_TIMEOUT', 300)
+        _cache().set(cache_key, value, timeout)
+    return value
+
+
+def stats():
+    """{namespace: {'hits': n, 'misses': n}} for this process"""
+    with _lock:
+        return {
+            label: {'hits': _hits[label], 'misses': _misses[label]}
+            for label in sorted(set(_hits) | set(_misses))
+        }
+
+
+def respond(view, namespaces, handler, request, *args, **kwargs):
+    """
+    Serve a GET view action from the shared cache. The key covers the action,
+    the full path with query string and the negotiated renderer; only 200
+    responses are stored (their data, rendered again on every hit).
+    """
+    if request.method != 'GET' or not is_shared():
+        return handler(request, *args, **kwargs)
+    renderer = getattr(getattr(request, 'accepted_renderer', None), 'format', '')
+    key = f'{view.basename}:{view.action}:{renderer}:{request.get_full_path()}'
+
+    def build():
+        response = handler(request, *args, **kwargs)
+        build.response = response
+        return response.data if response.status_code == 200 else None
+
+    build.response = None
+    data = get_or_build(namespaces, key, build)
+    return build.response if build.response is not None else Response(data)
+
+
+def cached_response(*namespaces, timeout=None):
+    """Decorator for viewset GET actions whose output depends on `namespaces`"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            return respond(self, namespaces, lambda *a, **kw: method(self, *a, **kw), request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class CachedResponseMixin:
+    """
+    Cache list and retrieve responses of a viewset. Set cache_namespaces to
+    every namespace whose data the serializer reads.
+    """
+    cache_namespaces = ()
+
+    def list(self, request, *args, **kwargs):
+        return respond(self, self.cache_namespaces, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return respond(self, self.cache_namespaces, super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,81 @@
+"""
+Precomputed module catalog snapshot.
+
+The catalog (active modules with their lessons, questions and answers) only
+changes when content is edited, so it is serialized once and kept in the
+cache configured by CATALOG_CACHE_ALIAS. The key embeds the version token of
+api.caching's 'content' namespace, which every committed content change
+replaces, so edits are seen by all workers sharing the API cache, and a
+snapshot built from pre-commit data lands under the old key where nobody
+reads it. Snapshots expire after CATALOG_CACHE_TIMEOUT, which also bounds
+how long a worker with its own in-process cache serves another worker's
+edit.
+"""
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import caching, queries, replicas
+from .models import Module
+from .serializers import ModuleSerializer
+
+CATALOG_CACHE_KEY = 'api:catalog:snapshot'
+
+
+def _cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def build_snapshot():
+    """Serialize all active modules and compute a content hash"""
+    modules = queries.modules(Module.objects.filter(is_active=True))
+    data = ModuleSerializer(modules, many=True).data
+    payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+    return {
+        'modules': json.loads(payload),
+        'hash': hashlib.sha256(payload.encode('utf-8')).hexdigest(),
+    }
+
+
+def snapshot_key():
+    """Cache key of the snapshot for the current content version"""
+    version, = caching.versions(['content'])
+    return f'{CATALOG_CACHE_KEY}:{version}'
+
+
+def get_snapshot():
+    """Return the cached catalog snapshot, building it on a miss"""
+    cache = _cache()
+    # The version is read before the data, so a build never outlives its key
+    key = snapshot_key()
+    snapshot = cache.get(key)
+    if snapshot is None:
+        with replicas.use_primary():
+            snapshot = build_snapshot()
+        cache.set(key, snapshot, getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300))
+    return snapshot
+
+
+async def aget_snapshot():
+    """Async variant of get_snapshot() for the ASGI read path"""
+    return await sync_to_async(get_snapshot)()
+
+
+def modules_for(snapshot, request):
+    """Snapshot modules, pruned to ?fields= when the request asks for it"""
+    modules = snapshot['modules']
+    if 'fields' in request.query_params:
+        fields = {name.strip() for name in request.query_params['fields'].split(',')}
+        modules = [{k: v for k, v in module.items() if k in fields} for module in modules]
+    return modules
+
+
+def etag_for(snapshot, request):
+    """ETag for one rendered view of the snapshot (page, query params)"""
+    key = f"{snapshot['hash']}:{request.query_params.urlencode()}"
+    return '"%s"' % hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
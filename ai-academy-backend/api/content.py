@@ -0,0 +1,255 @@
+"""
+Bulk import and export of course content (Module -> Lesson -> Question -> Answer).
+
+A content document is {'modules': [...]} in ContentModuleSerializer
+format, as JSON or YAML. Importing diffs the document against the stored
+rows and, in one transaction, bulk-deletes children missing from the
+document, bulk-creates new rows and bulk-updates only the rows (and only
+the columns) that changed. Modules that are not in the document are left
+alone. Content signals are muted while writing; the catalog and
+answer-key caches are invalidated, total_lessons of the learners of
+modules that gained or lost lessons recomputed and the bodies of new or
+rewritten lessons rendered, once at the end.
+"""
+import json
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+from . import caching, lesson_bodies, progress, signals
+from .models import Module, Lesson, Question, Answer
+from .serializers import ContentModuleSerializer
+
+FORMATS = ('json', 'yaml')
+
+FIELDS = {
+    Module: ['title', 'description', 'icon', 'duration', 'order', 'is_active'],
+    Lesson: ['title', 'content', 'video_url', 'video_title', 'video_channel', 'video_duration', 'order'],
+    Question: ['question_text', 'question_type', 'order'],
+    Answer: ['answer_text', 'is_correct', 'order'],
+}
+
+# Write order: parents before children
+MODELS = [Module, Lesson, Question, Answer]
+
+
+def _yaml():
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError('YAML support requires PyYAML (pip install PyYAML)')
+    return yaml
+
+
+def _plain(data):
+    """Serializer output (ReturnDict/OrderedDict) as plain dicts and lists for safe_dump"""
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_plain(value) for value in data]
+    return data
+
+
+def dumps(document, fmt='json'):
+    if fmt == 'yaml':
+        return _yaml().safe_dump(_plain(document), allow_unicode=True, sort_keys=False)
+    return json.dumps(document, ensure_ascii=False, indent=2) + '\n'
+
+
+def loads(text, fmt='json'):
+    """Parse a document; raises ValueError on malformed input"""
+    if fmt == 'yaml':
+        yaml = _yaml()
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise ValueError(f'Invalid YAML: {exc}')
+    return json.loads(text)
+
+
+def format_for(path):
+    """'yaml' for .yaml/.yml paths, else 'json'"""
+    return 'yaml' if path and path.lower().endswith(('.yaml', '.yml')) else 'json'
+
+
+class YAMLRenderer(BaseRenderer):
+    media_type = 'application/yaml'
+    format = 'yaml'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return dumps(data, 'yaml').encode('utf-8')
+
+
+class YAMLParser(BaseParser):
+    media_type = 'application/yaml'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read().decode('utf-8'), 'yaml')
+        except ValueError as exc:
+            raise ParseError(str(exc))
+
+
+def export_tree(module_ids=None):
+    """Content document for the given modules (all modules when None)"""
+    questions = Question.objects.prefetch_related('answers')
+    queryset = Module.objects.prefetch_related(
+        Prefetch('lessons', queryset=Lesson.objects.prefetch_related(Prefetch('questions', queryset=questions))),
+        Prefetch('questions', queryset=questions.filter(lesson__isnull=True), to_attr='final_questions'),
+    )
+    if module_ids is not None:
+        queryset = queryset.filter(id__in=module_ids)
+    return {'modules': ContentModuleSerializer(queryset, many=True).data}
+
+
+class Plan:
+    """Rows to create, update (grouped by changed columns) and delete, per model"""
+
+    def __init__(self):
+        self.create = {model: [] for model in MODELS}
+        self.update = {model: {} for model in MODELS}
+        self.delete = {model: [] for model in MODELS}
+        self.unchanged = Counter()
+
+    def sync(self, model, existing, key, data, **parents):
+        """Match one document item against existing[key]; returns the instance"""
+        attrs = {name: data.get(name, model._meta.get_field(name).get_default()) for name in FIELDS[model]}
+        instance = existing.pop(key, None)
+        if instance is None:
+            instance = model(**attrs, **parents)
+            self.create[model].append(instance)
+            return instance
+        changed = tuple(name for name in FIELDS[model] if getattr(instance, name) != attrs[name])
+        if changed:
+            for name in changed:
+                setattr(instance, name, attrs[name])
+            self.update[model].setdefault(changed, []).append(instance)
+        else:
+            self.unchanged[model] += 1
+        return instance
+
+    def drop(self, model, leftovers):
+        self.delete[model].extend(leftovers)
+
+    def stats(self):
+        return {
+            model._meta.db_table: {
+                'created': len(self.create[model]),
+                'updated': sum(len(rows) for rows in self.update[model].values()),
+                'deleted': len(self.delete[model]),
+                'unchanged': self.unchanged[model],
+            }
+            for model in MODELS
+        }
+
+    @property
+    def changed(self):
+        return any(self.create[m] or self.update[m] or self.delete[m] for m in MODELS)
+
+    def apply(self):
+        now = timezone.now()
+        for model in reversed(MODELS):
+            if self.delete[model]:
+                model.objects.filter(pk__in=[row.pk for row in self.delete[model]]).delete()
+        for model in MODELS:
+            if self.create[model]:
+                model.objects.bulk_create(self.create[model])
+            has_updated_at = any(field.name == 'updated_at' for field in model._meta.fields)
+            for fields, rows in self.update[model].items():
+                if has_updated_at:
+                    for row in rows:
+                        row.updated_at = now
+                    fields += ('updated_at',)
+                model.objects.bulk_update(rows, fields)
+
+
+def plan_import(modules):
+    """Diff validated module trees against the database (4 queries)"""
+    ids = [data['id'] for data in modules if data.get('id')]
+    titles = [data['title'] for data in modules if not data.get('id')]
+    stored = list(Module.objects.filter(Q(id__in=ids) | Q(title__in=titles)))
+    by_id = {module.id: module for module in stored}
+    # Title matches skip modules addressed by id; the oldest module wins a duplicate title
+    by_title = {}
+    for module in sorted(stored, key=lambda m: m.id, reverse=True):
+        if module.id not in ids:
+            by_title[module.title] = module
+
+    lessons = {(l.module_id, l.order): l for l in Lesson.objects.filter(module__in=stored)}
+    lesson_orders = {l.id: l.order for l in lessons.values()}
+    questions = {
+        (q.module_id, lesson_orders.get(q.lesson_id), q.order): q
+        for q in Question.objects.filter(module__in=stored)
+    }
+    answers = {
+        (a.question_id, a.order): a
+        for a in Answer.objects.filter(question__module__in=stored).select_related('question')
+    }
+
+    plan, imported = Plan(), set()
+    for data in modules:
+        if data.get('id'):
+            match = by_id.get(data['id'])
+            if match is None:
+                raise ValueError(f'Module {data["id"]} does not exist')
+        else:
+            match = by_title.pop(data['title'], None)
+        if match is not None:
+            imported.add(match.pk)
+        existing = {'module': match} if match else {}
+        module = plan.sync(Module, existing, 'module', data)
+
+        def sync_questions(items, lesson, lesson_order):
+            for question_data in items:
+                question = plan.sync(
+                    Question, questions, (module.pk, lesson_order, question_data.get('order', 0)),
+                    question_data, module=module, lesson=lesson,
+                )
+                for answer_data in question_data.get('answers', ()):
+                    plan.sync(
+                        Answer, answers, (question.pk, answer_data.get('order', 0)),
+                        answer_data, question=question,
+                    )
+
+        for lesson_data in data.get('lessons', ()):
+            lesson = plan.sync(Lesson, lessons, (module.pk, lesson_data.get('order', 0)), lesson_data, module=module)
+            sync_questions(lesson_data.get('questions', ()), lesson, lesson.order)
+        sync_questions(data.get('final_questions', ()), None, None)
+
+    # Children of imported modules that the document no longer mentions
+    plan.drop(Lesson, [l for (module_id, _), l in lessons.items() if module_id in imported])
+    plan.drop(Question, [q for (module_id, _, _), q in questions.items() if module_id in imported])
+    plan.drop(Answer, [a for a in answers.values() if a.question.module_id in imported])
+    return plan
+
+
+def import_tree(document, dry_run=False):
+    """
+    Validate and import a content document; returns per-table counts.
+    Raises rest_framework ValidationError for invalid documents and
+    ValueError for references to missing modules.
+    """
+    if not isinstance(document, dict) or not isinstance(document.get('modules'), list):
+        raise ValueError("A content document is an object with a 'modules' list")
+    serializer = ContentModuleSerializer(data=document['modules'], many=True)
+    serializer.is_valid(raise_exception=True)
+
+    with transaction.atomic():
+        plan = plan_import(serializer.validated_data)
+        if plan.changed and not dry_run:
+            with signals.content_invalidation_muted():
+                plan.apply()
+            caching.invalidate('content')
+            progress.sync_total_lessons(
+                {lesson.module_id for lesson in plan.create[Lesson] + plan.delete[Lesson]}
+            )
+            lesson_bodies.store(plan.create[Lesson] + [
+                lesson for fields, rows in plan.update[Lesson].items() if 'content' in fields for lesson in rows
+            ])
+    return plan.stats()
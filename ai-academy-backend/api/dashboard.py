@@ -0,0 +1,79 @@
+"""
+Student home screen in one response (GET /api/me/dashboard/).
+
+Replaces the client fan-out over /api/modules/, /api/progress/by_user/,
+/api/test-results/by_user/ and /api/ai-agents/by_user/. The catalog comes
+from the cached snapshot (api.catalog); the user's own data costs three
+queries, the first of which also yields a version of everything the
+dashboard shows. A conditional GET whose ETag still matches is answered
+after that single query.
+"""
+import hashlib
+
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum
+
+from .models import User, UserProgress, TestResult
+from .serializers import UserSerializer
+
+USER_FIELDS = [
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'department', 'role', 'time_spent', 'last_activity',
+]
+
+PROGRESS_FIELDS = ['module', 'started', 'viewed_lessons', 'completed_lessons', 'total_lessons', 'updated_at']
+
+RESULT_FIELDS = ['module', 'score', 'best_score', 'passed', 'attempts', 'completed_at']
+
+VERSION_FIELDS = [
+    'updated_at', 'time_spent', 'last_activity', 'ai_agent_id',
+    'progress_count', 'progress_updated', 'results_count', 'results_updated', 'results_total',
+]
+
+
+def _aggregate(queryset, **aggregate):
+    (name, expression), = aggregate.items()
+    return Subquery(queryset.order_by().values('user').annotate(**{name: expression}).values(name)[:1])
+
+
+def load_user(user_id):
+    """User with its AI agent and version annotations, or None (one query)"""
+    progress = UserProgress.objects.filter(user=OuterRef('pk'))
+    results = TestResult.objects.filter(user=OuterRef('pk'), lesson__isnull=True)
+    return (
+        User.objects.filter(pk=user_id)
+        .select_related('ai_agent')
+        .annotate(
+            ai_agent_id=F('ai_agent__id'),
+            progress_count=_aggregate(progress, n=Count('id')),
+            progress_updated=_aggregate(progress, last=Max('updated_at')),
+            results_count=_aggregate(results, n=Count('id')),
+            results_updated=_aggregate(results, last=Max('completed_at')),
+            results_total=_aggregate(results, total=Sum(F('score') + F('best_score') + F('attempts'))),
+        )
+        .first()
+    )
+
+
+def etag_for(user, snapshot, request):
+    """Changes with the catalog, any dashboard data of the user, or the query string"""
+    version = ':'.join(str(getattr(user, name)) for name in VERSION_FIELDS)
+    key = f"{snapshot['hash']}:{user.pk}:{version}:{request.query_params.urlencode()}"
+    return '"%s"' % hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def build(user, modules):
+    """Dashboard payload (two queries: progress and module-final results)"""
+    agent = getattr(user, 'ai_agent', None)
+    progress = UserProgress.objects.filter(user=user).order_by('module_id')
+    results = TestResult.objects.filter(user=user, lesson__isnull=True).order_by('module_id')
+    return {
+        'user': UserSerializer(user, fields=USER_FIELDS).data,
+        'modules': modules,
+        'progress': [dict(zip(PROGRESS_FIELDS, row)) for row in progress.values_list(*PROGRESS_FIELDS)],
+        'results': [dict(zip(RESULT_FIELDS, row)) for row in results.values_list(*RESULT_FIELDS)],
+        'ai_agent': {
+            'configured': agent is not None,
+            'id': agent.id if agent else None,
+            'created_at': agent.created_at if agent else None,
+        },
+    }
@@ -0,0 +1,163 @@
+"""
+Streaming CSV / NDJSON export of test results and progress.
+
+Rows are read with .values_list().iterator(chunk_size=...) and written to a
+StreamingHttpResponse as they arrive, so memory stays flat whatever the row
+count. Columns and their formatting come from the existing DRF serializers'
+field objects, resolved once per export rather than once per row.
+
+Exports are staff only (IsAdminUser, session or basic auth). ?format= picks
+the export format, so the views opt out of DRF's renderer negotiation.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.permissions import IsAdminUser
+from rest_framework.relations import RelatedField
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+
+from .models import TestResult, UserProgress
+from .serializers import TestResultSerializer, UserProgressSerializer
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class Echo:
+    """File-like object whose write() returns the value, for csv.writer"""
+    def write(self, value):
+        return value
+
+
+def columns_for(serializer_class):
+    """(name, values() path, formatter) for every readable serializer field"""
+    columns = []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        formatter = None if isinstance(field, RelatedField) else field.to_representation
+        columns.append((name, field.source.replace('.', '__'), formatter))
+    return columns
+
+
+def iter_rows(queryset, columns):
+    chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+    formatters = [formatter for _, _, formatter in columns]
+    values = queryset.order_by('id').values_list(*[path for _, path, _ in columns])
+    for row in values.iterator(chunk_size=chunk_size):
+        yield [
+            value if value is None or formatter is None else formatter(value)
+            for value, formatter in zip(row, formatters)
+        ]
+
+
+def stream_csv(names, rows):
+    writer = csv.writer(Echo())
+    yield '\ufeff'  # BOM so Excel opens Cyrillic text correctly
+    yield writer.writerow(names)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(names, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(names, row)), ensure_ascii=False) + '\n'
+
+
+def _filter(request, queryset, date_field):
+    """Apply ?department=, ?module= and ?date_from=/?date_to= filters"""
+    params = request.GET
+    if params.get('department'):
+        queryset = queryset.filter(user__department=params['department'])
+    if params.get('module'):
+        queryset = queryset.filter(module_id=params['module'])
+    for param, lookup in (('date_from', 'gte'), ('date_to', 'lte')):
+        raw = params.get(param)
+        if not raw:
+            continue
+        try:
+            value = parse_date(raw)
+        except ValueError:
+            value = None
+        if value is not None:
+            lookup = f'date__{lookup}'
+        else:
+            value = parse_datetime(raw)
+            if value is None:
+                raise ValueError(f'{param} must be an ISO date or datetime')
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value)
+        queryset = queryset.filter(**{f'{date_field}__{lookup}': value})
+    return queryset
+
+
+def _export(request, queryset, serializer_class, date_field, filename):
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in FORMATS:
+        return JsonResponse({'error': f'format must be one of: {", ".join(FORMATS)}'}, status=400)
+    if request.GET.get('module') and not request.GET['module'].isdigit():
+        return JsonResponse({'error': 'module must be an integer id'}, status=400)
+    try:
+        queryset = _filter(request, queryset, date_field)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    columns = columns_for(serializer_class)
+    names = [name for name, _, _ in columns]
+    rows = iter_rows(queryset, columns)
+    stream = stream_csv(names, rows) if export_format == 'csv' else stream_ndjson(names, rows)
+    response = StreamingHttpResponse(stream, content_type=FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+class ExportNegotiation(BaseContentNegotiation):
+    """Always the first renderer: ?format= is the export format, not a renderer"""
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class ExportView(APIView):
+    """Streams `model` rows through `serializer_class` columns (staff only)"""
+    permission_classes = [IsAdminUser]
+    # Only DRF's own errors (401/403/405) go through a renderer
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = ExportNegotiation
+    model = None
+    serializer_class = None
+    date_field = None
+    filename = None
+
+    def get(self, request):
+        return _export(request, self.model.objects.all(), self.serializer_class, self.date_field, self.filename)
+
+
+class TestResultExportView(ExportView):
+    """GET /api/export/test-results/?format=csv|ndjson"""
+    model = TestResult
+    serializer_class = TestResultSerializer
+    date_field = 'completed_at'
+    filename = 'test_results'
+
+
+class ProgressExportView(ExportView):
+    """GET /api/export/progress/?format=csv|ndjson"""
+    model = UserProgress
+    serializer_class = UserProgressSerializer
+    date_field = 'updated_at'
+    filename = 'progress'
+
+
+export_test_results = TestResultExportView.as_view()
+export_progress = ProgressExportView.as_view()
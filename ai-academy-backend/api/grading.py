@@ -0,0 +1,119 @@
+"""
+Server-side quiz grading against precompiled answer keys.
+
+The answer key of a module (question type, valid answer ids and correct
+answer ids for every question) is compiled with two queries and grading a
+submission checks it in memory. Compiled keys are kept in process memory
+until the 'content' namespace version changes, which every committed
+Question or Answer edit causes. With a shared API cache (e.g. Redis) that
+reaches every worker at once; with the in-process default another
+worker's edit is picked up once this worker's version token expires
+(API_CACHE_TIMEOUT, see api.caching).
+"""
+from collections import namedtuple
+
+from django.conf import settings
+
+from . import caching
+from .models import Question, Answer
+
+QuestionKey = namedtuple('QuestionKey', ['lesson_id', 'question_type', 'answers', 'correct'])
+
+# module_id -> {question_id: QuestionKey}, valid for _version
+_keys = {}
+_version = None
+
+
+class GradingError(ValueError):
+    """Submission refers to questions or answers outside the graded test"""
+
+
+def compile_module(module_id):
+    """Build {question_id: QuestionKey} for one module"""
+    answers, correct = {}, {}
+    for question_id, answer_id, is_correct in (
+        Answer.objects.filter(question__module_id=module_id)
+        .values_list('question_id', 'id', 'is_correct')
+    ):
+        answers.setdefault(question_id, set()).add(answer_id)
+        if is_correct:
+            correct.setdefault(question_id, set()).add(answer_id)
+    return {
+        question_id: QuestionKey(
+            lesson_id, question_type,
+            frozenset(answers.get(question_id, ())),
+            frozenset(correct.get(question_id, ())),
+        )
+        for question_id, lesson_id, question_type in (
+            Question.objects.filter(module_id=module_id)
+            .values_list('id', 'lesson_id', 'question_type')
+        )
+    }
+
+
+def answer_key(module_id):
+    """Compiled answer key for a module, recompiled after content edits"""
+    global _version
+    # Read before compiling: a key compiled across an edit is dropped on the next call
+    version, = caching.versions(['content'])
+    if version != _version:
+        _keys.clear()
+        _version = version
+    if module_id not in _keys:
+        _keys[module_id] = compile_module(module_id)
+    return _keys[module_id]
+
+
+def questions_for(key, lesson_id):
+    """
+    Questions that make up a test: the lesson's questions for a lesson test;
+    for a module-final test the module's questions without a lesson, or all
+    of the module's questions when it has no such final-only questions.
+    """
+    if lesson_id is not None:
+        return {qid: q for qid, q in key.items() if q.lesson_id == lesson_id}
+    final = {qid: q for qid, q in key.items() if q.lesson_id is None}
+    return final or key
+
+
+def grade(module_id, lesson_id, submitted):
+    """
+    Score {question_id: [answer_id, ...]} against the compiled key.
+
+    A question counts as correct when the submitted set equals the correct
+    set (a single-choice question therefore needs exactly one answer).
+    Unanswered questions count as wrong.
+    """
+    questions = questions_for(answer_key(module_id), lesson_id)
+    if not questions:
+        raise GradingError('This test has no questions')
+
+    unknown = set(submitted) - set(questions)
+    if unknown:
+        raise GradingError(f'Questions not in this test: {sorted(unknown)}')
+
+    details = []
+    for question_id, key in questions.items():
+        chosen = set(submitted.get(question_id, ()))
+        if chosen - key.answers:
+            raise GradingError(f'Answers {sorted(chosen - key.answers)} do not belong to question {question_id}')
+        if key.question_type == 'single' and len(chosen) > 1:
+            is_correct = False
+        else:
+            is_correct = chosen == key.correct
+        details.append({
+            'question': question_id,
+            'correct': is_correct,
+            'correct_answers': sorted(key.correct),
+        })
+
+    correct_count = sum(1 for item in details if item['correct'])
+    # Round half up, as the frontend's Math.round() does
+    score = (correct_count * 200 + len(details)) // (2 * len(details))
+    return {
+        'score': score,
+        'passed': score >= getattr(settings, 'TEST_PASS_SCORE', 70),
+        'correct': correct_count,
+        'total': len(details),
+        'questions': details,
+    }
@@ -0,0 +1,14 @@
+"""
+Entry points of the password-hashing processes spawned by api.provisioning.
+
+A spawned process imports the module of its initializer before Django is
+set up, so this module must not import models (api.provisioning does).
+"""
+
+
+def init_worker():
+    """Set up Django in a fresh hashing process, which never uses the database"""
+    import django
+    django.setup()
+    from django.db import connections
+    connections.close_all()
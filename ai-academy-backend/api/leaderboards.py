@@ -0,0 +1,255 @@
+"""
+Leaderboards per module, per department and across the company.
+
+LeaderboardEntry keeps one compact row per (board, user): the sum of the
+user's module-final test scores on that board, the number of modules
+completed (UserProgress) and the number of final tests passed. A module
+board holds the user's result and completion in that module; the
+department and global boards add up all of the user's modules. Users rank
+by score, then completed modules, then passed tests; equal triples share a
+rank ("1224").
+
+Rows are kept in ranking order by the (board, -score, -completed, -passed,
+user) index, so a top-N read is one index descent plus N rows. When the API
+cache is Redis, every board is mirrored into a sorted set and the rank of a
+user is one ZCOUNT (logarithmic in the board size); otherwise, or until
+`python manage.py rebuild_leaderboards` has filled the sorted sets, it is a
+count of the index entries ahead of the user.
+
+Rows are refreshed by schedule() after every TestResult write (signals and
+api.results), for the users that wrote: only their rows are recomputed,
+from their own results and progress, and rows whose values did not change
+are not rewritten. Progress and profile edits do not re-rank anybody on
+their own; a user's completed modules and department are picked up with
+their next test result. `python manage.py rebuild_leaderboards` recomputes
+every board, for backfills or when ANALYTICS_LIVE_UPDATES is off.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+from django.db.models import Q
+
+from . import caching
+from .analytics import COMPLETED
+from .models import User, UserProgress, TestResult, LeaderboardEntry
+
+BATCH_SIZE = 1000
+
+GLOBAL = 'global'
+
+RANKING = ('-score', '-completed', '-passed', 'user_id')
+
+# Sorted-set scores pack (score, completed, passed) into one exact double
+# while completed and passed stay below this and score below 9 * 10**7
+COMPONENT = 10 ** 4
+
+# Set by rebuild() once every board's sorted set is complete
+READY_KEY = 'leaderboard:ready'
+
+
+def module_board(module_id):
+    return f'module:{module_id}'
+
+
+def department_board(department):
+    return f'department:{department}'
+
+
+def board_for(module_id=None, department=None):
+    """Board name for a module, a department or (neither) the global board"""
+    if module_id is not None:
+        return module_board(module_id)
+    if department is not None:
+        return department_board(department)
+    return GLOBAL
+
+
+def entries_for(user_ids):
+    """{(board, user id): (score, completed, passed)} computed from the users' final results and progress"""
+    departments = dict(User.objects.filter(id__in=user_ids).values_list('id', 'department'))
+    modules = {}
+    for user_id, module_id, score, passed in (
+        TestResult.objects.filter(user_id__in=departments, lesson__isnull=True)
+        .order_by().values_list('user_id', 'module_id', 'score', 'passed')
+    ):
+        modules[(user_id, module_id)] = (score, 0, int(passed))
+    for user_id, module_id in (
+        UserProgress.objects.filter(COMPLETED, user_id__in=departments)
+        .order_by().values_list('user_id', 'module_id')
+    ):
+        score, _, passed = modules.get((user_id, module_id), (0, 0, 0))
+        modules[(user_id, module_id)] = (score, 1, passed)
+
+    entries = {}
+    for (user_id, module_id), values in modules.items():
+        boards = [module_board(module_id), GLOBAL]
+        if departments[user_id]:
+            boards.append(department_board(departments[user_id]))
+        for board in boards:
+            total = entries.get((board, user_id), (0, 0, 0))
+            entries[(board, user_id)] = tuple(a + b for a, b in zip(total, values))
+    return entries
+
+
+def _packed(score, completed, passed):
+    return (score * COMPONENT + completed) * COMPONENT + passed
+
+
+def _redis():
+    """The API cache when it is Redis (boards are mirrored into sorted sets), else None"""
+    cache = caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+    return cache if isinstance(cache, RedisCache) else None
+
+
+def _sorted_set(cache, board):
+    return cache.make_key(f'leaderboard:{board}')
+
+
+def _index(written, removed):
+    """Mirror written {(board, user): values} and removed [(board, user)] rows into the sorted sets"""
+    cache = _redis()
+    if cache is None or not (written or removed) or not cache.get(READY_KEY):
+        return
+    pipeline = cache._cache.get_client(write=True).pipeline()
+    for board, user_id in removed:
+        pipeline.zrem(_sorted_set(cache, board), user_id)
+    for (board, user_id), values in written.items():
+        pipeline.zadd(_sorted_set(cache, board), {user_id: _packed(*values)})
+    pipeline.execute()
+
+
+def refresh_users(user_ids):
+    """Recompute the board rows of the given users; returns the number of rows written or deleted"""
+    user_ids = set(user_ids)
+    entries = entries_for(user_ids)
+    stored = {
+        (board, user_id): (pk, values)
+        for pk, board, user_id, *values in LeaderboardEntry.objects.filter(user_id__in=user_ids)
+        .values_list('id', 'board', 'user_id', 'score', 'completed', 'passed')
+    }
+    stale = {key: pk for key, (pk, _) in stored.items() if key not in entries}
+    written = {
+        key: values for key, values in entries.items()
+        if key not in stored or tuple(stored[key][1]) != values
+    }
+    if stale:
+        LeaderboardEntry.objects.filter(pk__in=stale.values()).delete()
+    LeaderboardEntry.objects.bulk_create(
+        [
+            LeaderboardEntry(board=board, user_id=user_id, score=score, completed=completed, passed=passed)
+            for (board, user_id), (score, completed, passed) in written.items()
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['board', 'user'],
+        update_fields=['score', 'completed', 'passed', 'updated_at'],
+    )
+    transaction.on_commit(lambda: _index(written, list(stale)))
+    return len(stale) + len(written)
+
+
+def refresh(user_ids):
+    with transaction.atomic():
+        refresh_users(user_ids)
+        # Rows are written with bulk upserts, which send no signals
+        caching.invalidate('leaderboards')
+
+
+def schedule(user_ids):
+    """Refresh the users' board rows once the current transaction commits"""
+    if not getattr(settings, 'ANALYTICS_LIVE_UPDATES', True):
+        return
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: refresh(user_ids))
+
+
+def top(board, limit):
+    """The first `limit` entries of a board with their rank set"""
+    entries = list(
+        LeaderboardEntry.objects.filter(board=board).select_related('user').order_by(*RANKING)[:limit]
+    )
+    rank, previous = 0, None
+    for position, entry in enumerate(entries, start=1):
+        if (entry.score, entry.completed, entry.passed) != previous:
+            rank, previous = position, (entry.score, entry.completed, entry.passed)
+        entry.rank = rank
+    return entries
+
+
+def _sorted_set_rank(board, entry):
+    """Rank from the board's sorted set, or None when there is none or it is behind the table"""
+    cache = _redis()
+    if cache is None:
+        return None
+    packed = _packed(entry.score, entry.completed, entry.passed)
+    key = _sorted_set(cache, board)
+    ready, score, ahead = (
+        cache._cache.get_client().pipeline()
+        .exists(cache.make_key(READY_KEY))
+        .zscore(key, entry.user_id)
+        .zcount(key, f'({packed}', '+inf')
+        .execute()
+    )
+    if not ready or score != packed:
+        return None
+    return ahead + 1
+
+
+def rank_of(board, user_id):
+    """A user's entry on a board with its rank set, or None when the user is not on it"""
+    entry = LeaderboardEntry.objects.filter(board=board, user_id=user_id).select_related('user').first()
+    if entry is None:
+        return None
+    entry.rank = _sorted_set_rank(board, entry)
+    if entry.rank is None:
+        ahead = LeaderboardEntry.objects.filter(board=board).filter(
+            Q(score__gt=entry.score)
+            | Q(score=entry.score, completed__gt=entry.completed)
+            | Q(score=entry.score, completed=entry.completed, passed__gt=entry.passed)
+        ).count()
+        entry.rank = ahead + 1
+    return entry
+
+
+def reindex():
+    """Refill every board's sorted set from the table (Redis only); returns the number of boards"""
+    cache = _redis()
+    if cache is None:
+        return 0
+    client = cache._cache.get_client(write=True)
+    boards = list(LeaderboardEntry.objects.order_by().values_list('board', flat=True).distinct())
+    for board in boards:
+        # Filled under a new key and swapped in, so readers never see a partial board
+        building = _sorted_set(cache, f'{board}:building')
+        client.delete(building)
+        rows = LeaderboardEntry.objects.filter(board=board).order_by('user_id').values_list(
+            'user_id', 'score', 'completed', 'passed'
+        )
+        count = rows.count()
+        for start in range(0, count, BATCH_SIZE):
+            client.zadd(building, {
+                user_id: _packed(*values) for user_id, *values in rows[start:start + BATCH_SIZE]
+            })
+        if count:
+            client.rename(building, _sorted_set(cache, board))
+        else:
+            client.delete(_sorted_set(cache, board))
+    cache.set(READY_KEY, True, None)
+    return len(boards)
+
+
+def rebuild():
+    """Recompute every board from the test results and progress; returns the number of entries"""
+    # Users with results, completed modules or rows to drop; boards stay readable meanwhile
+    user_ids = sorted(
+        set(TestResult.objects.filter(lesson__isnull=True).order_by().values_list('user_id', flat=True).distinct())
+        | set(UserProgress.objects.filter(COMPLETED).order_by().values_list('user_id', flat=True).distinct())
+        | set(LeaderboardEntry.objects.values_list('user_id', flat=True).distinct())
+    )
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        with transaction.atomic():
+            refresh_users(user_ids[start:start + BATCH_SIZE])
+    reindex()
+    caching.invalidate('leaderboards')
+    return LeaderboardEntry.objects.count()
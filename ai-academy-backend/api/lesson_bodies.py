@@ -0,0 +1,117 @@
+"""
+Lesson bodies, pre-rendered and pre-compressed (GET /api/lessons/{id}/body/).
+
+The catalog carries lesson metadata only; the lesson text is fetched one
+lesson at a time. Its JSON body is rendered when the lesson is saved and
+stored gzip- and brotli-compressed in a LessonBody row next to the lesson,
+so a request only picks the encoding the client accepts and copies bytes.
+Brotli needs the optional `brotli` package; without it only gzip is
+stored. Lessons written without signals (bulk inserts) get their body on
+first request, or from `python manage.py render_lesson_bodies`.
+"""
+import gzip
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+from .models import Lesson, LessonBody
+
+BATCH_SIZE = 500
+
+# Preferred first; identity is always acceptable
+ENCODINGS = [('br', 'brotli', '-br'), ('gzip', 'gzip', '-gz')]
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def render(lesson):
+    """Unsaved LessonBody for a lesson (needs id and content)"""
+    body = JSONRenderer().render({'id': lesson.pk, 'content': lesson.content})
+    brotli = _brotli()
+    return LessonBody(
+        lesson_id=lesson.pk,
+        digest=hashlib.sha256(body).hexdigest(),
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        brotli=brotli.compress(body, quality=11) if brotli else None,
+    )
+
+
+def store(lessons):
+    """Render and upsert the bodies of the given lessons"""
+    rows = [render(lesson) for lesson in lessons]
+    for start in range(0, len(rows), BATCH_SIZE):
+        LessonBody.objects.bulk_create(
+            rows[start:start + BATCH_SIZE],
+            update_conflicts=True,
+            unique_fields=['lesson'],
+            update_fields=['digest', 'gzip', 'brotli', 'updated_at'],
+        )
+    return len(rows)
+
+
+def get(lesson_id):
+    """Stored body of a lesson, rendering it on first use; None for unknown lessons"""
+    body = LessonBody.objects.filter(pk=lesson_id).first()
+    if body is None:
+        lesson = Lesson.objects.filter(pk=lesson_id).only('id', 'content').first()
+        if lesson is None:
+            return None
+        store([lesson])
+        body = LessonBody.objects.get(pk=lesson_id)
+    return body
+
+
+def backfill():
+    """Render bodies for lessons that have none; returns the number rendered"""
+    missing = Lesson.objects.filter(body__isnull=True).only('id', 'content').order_by('id')
+    return store(missing.iterator(chunk_size=BATCH_SIZE))
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0)"""
+    accepted, refused = set(), set()
+    for item in header.split(','):
+        name, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        (accepted if quality > 0 else refused).add(name.lower())
+    if '*' in accepted:
+        accepted |= {coding for coding, _, _ in ENCODINGS} - refused
+    return accepted
+
+
+def respond(request, body):
+    """Response in the best accepted encoding, with a per-encoding strong ETag"""
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for coding, field, suffix in ENCODINGS:
+        data = getattr(body, field)
+        if coding in accepted and data is not None:
+            data = bytes(data)
+            break
+    else:
+        coding, suffix = None, ''
+        data = gzip.decompress(bytes(body.gzip))
+
+    etag = f'"{body.digest[:32]}{suffix}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(data, content_type='application/json')
+        if coding:
+            response['Content-Encoding'] = coding
+    response['ETag'] = etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from api.activity import buffer as activity_buffer
+from api.benchmark import dataset, runner, scenarios
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset in a throwaway test database, benchmark every router '
+        'endpoint and fail on regressions against the stored baseline'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in dataset.DEFAULT_SIZES.items():
+            per = '' if name in ('users', 'modules') else ' per parent'
+            parser.add_argument(f'--{name}', type=int, default=default, help=f'Rows of {name}{per} (default {default})')
+        parser.add_argument('--requests', type=int, default=100, help='Timed requests per endpoint')
+        parser.add_argument('--endpoint', action='append', help='Limit to some endpoints (e.g. users.list)')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+        parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed latency/throughput drift (0.5 = 50%%)')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the test database between runs')
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in dataset.DEFAULT_SIZES}
+        # DEBUG off: no query logging outside the query-count capture
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            # Only 'default' is swapped for the test database; replicas would serve production rows.
+            # Heartbeats stay buffered until the end: a background flush would contend for SQLite's
+            # table locks with the timed requests
+            with override_settings(DATABASE_REPLICAS=[], ACTIVITY_FLUSH_INTERVAL=24 * 3600):
+                results = self.run(sizes, options)
+        finally:
+            activity_buffer.flush()
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        path = Path(options['baseline'])
+        current = {'vendor': connection.vendor, 'dataset': sizes, 'endpoints': results}
+        if options['save_baseline']:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(current, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {path}'))
+            return
+        if not path.exists():
+            self.stdout.write(f'No baseline at {path}; run with --save-baseline to create one.')
+            return
+
+        baseline = json.loads(path.read_text())
+        timings = baseline.get('vendor') == current['vendor'] and baseline.get('dataset') == sizes
+        if not timings:
+            self.stdout.write('Baseline was taken on another database or dataset size; comparing query counts only.')
+        regressions = runner.compare(results, baseline.get('endpoints', {}), options['tolerance'], timings)
+        if regressions:
+            for line in regressions:
+                self.stderr.write(line)
+            raise CommandError(f'{len(regressions)} performance regressions against {path}')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {path}'))
+
+    def run(self, sizes, options):
+        self.stdout.write(f'Seeding {connection.vendor} test database: {sizes}')
+        counts = dataset.seed(**sizes)
+        self.stdout.write(f'Rows: {counts}')
+
+        endpoints = scenarios.build(scenarios.sample_ids())
+        unknown = set(options['endpoint'] or ()) - set(endpoints)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+        if options['endpoint']:
+            endpoints = {name: endpoints[name] for name in options['endpoint']}
+
+        self.stdout.write(
+            f'{"endpoint":<32} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"queries":>8}'
+        )
+        client, results = Client(), {}
+        for name, scenario in endpoints.items():
+            result = results[name] = runner.measure(client, scenario, options['requests'])
+            self.stdout.write(
+                f'{name:<32} {result["rps"]:>9.1f} {result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+                f'{result["p99_ms"]:>8.2f} {result["queries"]:>8}'
+            )
+        return results
+
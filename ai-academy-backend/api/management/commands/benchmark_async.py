@@ -0,0 +1,107 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from api.benchmark import dataset, scenarios
+
+# (sync DRF endpoint, async ASGI endpoint)
+ENDPOINTS = {
+    'modules': ('/api/modules/', '/api/async/modules/'),
+    'lessons': ('/api/lessons/by_module/?module_id={module_id}', '/api/async/lessons/by_module/?module_id={module_id}'),
+    'questions': ('/api/questions/by_module/?module_id={module_id}', '/api/async/questions/by_module/?module_id={module_id}'),
+    'progress': ('/api/progress/by_user/?user_id={user_id}', '/api/async/progress/by_user/?user_id={user_id}'),
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset in a throwaway test database and compare throughput and '
+        'latency of the sync (WSGI/DRF) and async (ASGI) read endpoints, with caching disabled'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in dataset.DEFAULT_SIZES.items():
+            per = '' if name in ('users', 'modules') else ' per parent'
+            parser.add_argument(f'--{name}', type=int, default=default, help=f'Rows of {name}{per} (default {default})')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and mode')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at once')
+        parser.add_argument('--endpoint', action='append', choices=sorted(ENDPOINTS), help='Limit to some endpoints')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the test database between runs')
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in dataset.DEFAULT_SIZES}
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        # The sync lesson and question views answer from the response cache, their async twins
+        # have none: without caches both modes run the same queries and serializers
+        no_caches = {alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in settings.CACHES}
+        try:
+            with override_settings(DATABASE_REPLICAS=[], CACHES=no_caches):
+                self.stdout.write(f'Seeding {connection.vendor} test database: {sizes}')
+                dataset.seed(**sizes)
+                self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+    def run(self, options):
+        ids = scenarios.sample_ids()
+        params = {'module_id': ids['module_id'], 'user_id': ids['user_id']}
+        total, concurrency = options['requests'], options['concurrency']
+
+        self.stdout.write(
+            f'{connection.vendor}, caching disabled: {total} requests per run, concurrency {concurrency}\n'
+            f'{"endpoint":<10} {"mode":<6} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8}'
+        )
+        for name in options['endpoint'] or sorted(ENDPOINTS):
+            sync_url, async_url = (url.format(**params) for url in ENDPOINTS[name])
+            for mode, runner, url in (('sync', self.run_sync, sync_url), ('async', self.run_async, async_url)):
+                elapsed, latencies = runner(url, total, concurrency)
+                self.stdout.write(
+                    f'{name:<10} {mode:<6} {total / elapsed:>9.1f} '
+                    f'{percentile(latencies, 50) * 1000:>8.2f} {percentile(latencies, 99) * 1000:>8.2f}'
+                )
+
+    def run_sync(self, url, total, concurrency):
+        """Thread pool of WSGI test clients, like a threaded sync worker"""
+        def one(_):
+            start = time.perf_counter()
+            response = Client().get(url)
+            assert response.status_code == 200, response.status_code
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(one, range(total)))
+        return time.perf_counter() - start, latencies
+
+    def run_async(self, url, total, concurrency):
+        """One event loop driving the ASGI handler, like an async worker"""
+        async def main():
+            client = AsyncClient()
+            gate = asyncio.Semaphore(concurrency)
+
+            async def one():
+                async with gate:
+                    start = time.perf_counter()
+                    response = await client.get(url)
+                    assert response.status_code == 200, response.status_code
+                    return time.perf_counter() - start
+
+            return await asyncio.gather(*(one() for _ in range(total)))
+
+        start = time.perf_counter()
+        latencies = asyncio.run(main())
+        return time.perf_counter() - start, latencies
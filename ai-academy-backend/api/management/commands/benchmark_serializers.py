@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api import compiled
+from api.benchmark import dataset
+from api.benchmark import serializers as serializer_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and compare the compiled read-only serializers '
+        'with the regular DRF serializers (byte-identical output, time per render)'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in dataset.DEFAULT_SIZES.items():
+            per = '' if name in ('users', 'modules') else ' per parent'
+            parser.add_argument(f'--{name}', type=int, default=default, help=f'Rows of {name}{per} (default {default})')
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per serializer and path')
+        parser.add_argument(
+            '--target', action='append', choices=list(serializer_benchmark.TARGETS),
+            help='Limit to some serializers',
+        )
+        parser.add_argument('--keepdb', action='store_true', help='Keep the test database between runs')
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in dataset.DEFAULT_SIZES}
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            self.stdout.write(f'Seeding {connection.vendor} test database: {sizes}')
+            dataset.seed(**sizes)
+            results = serializer_benchmark.run(options['repeat'], options['target'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        encoder = 'orjson' if compiled._orjson() else 'json (orjson not installed)'
+        self.stdout.write(f'Compiled path renders with {encoder}')
+        self.stdout.write(
+            f'{"serializer":<20} {"rows":>7} {"bytes":>10} {"drf ms":>9} {"compiled ms":>12} {"speedup":>8}  identical'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<20} {result["rows"]:>7} {result["bytes"]:>10} {result["regular_ms"]:>9.2f} '
+                f'{result["compiled_ms"]:>12.2f} {result["speedup"]:>7}x  {result["identical"]}'
+            )
+        different = [name for name, result in results.items() if not result['identical']]
+        if different:
+            raise CommandError(f'Compiled output differs from the serializer for: {", ".join(different)}')
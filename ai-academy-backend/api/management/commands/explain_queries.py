@@ -0,0 +1,99 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from api.models import (
+    User, Module, Lesson, Question, Answer, UserProgress, TestResult, UserStats, LeaderboardEntry
+)
+
+# Canonical queries of the viewsets, keyed by label. Each builds a queryset
+# from sample ids so the plans match what the endpoints send.
+QUERIES = {
+    'users.list': lambda p: User.objects.order_by('-created_at', '-id')[:20],
+    'modules.catalog': lambda p: Module.objects.filter(is_active=True),
+    'lessons.by_module': lambda p: Lesson.objects.filter(module_id=p['module_id']),
+    'questions.by_module': lambda p: Question.objects.filter(module_id=p['module_id']),
+    'answers.prefetch': lambda p: Answer.objects.filter(question_id__in=p['question_ids']),
+    'progress.by_user': lambda p: UserProgress.objects.filter(user_id=p['user_id']),
+    'progress.export': lambda p: UserProgress.objects.filter(updated_at__gte=p['since']),
+    'results.list': lambda p: TestResult.objects.order_by('-completed_at', '-id')[:20],
+    'results.by_user': lambda p: TestResult.objects.filter(user_id=p['user_id']),
+    'results.final': lambda p: TestResult.objects.filter(
+        user_id=p['user_id'], module_id=p['module_id'], lesson__isnull=True
+    ),
+    'results.module_finals': lambda p: (
+        TestResult.objects.filter(module_id__in=[p['module_id']], lesson__isnull=True)
+        .order_by().values('module_id').annotate(results=Count('id'))
+    ),
+    'stats.by_department': lambda p: UserStats.objects.filter(department=p['department']),
+    'leaderboards.top': lambda p: (
+        LeaderboardEntry.objects.filter(board='global').order_by('-score', '-completed', '-passed', 'user_id')[:10]
+    ),
+    'leaderboards.ahead': lambda p: LeaderboardEntry.objects.filter(board='global').filter(
+        Q(score__gt=50) | Q(score=50, completed__gt=1) | Q(score=50, completed=1, passed__gt=0)
+    ),
+}
+
+# Full-table scans in EXPLAIN output, per backend
+SEQ_SCAN = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (?!TABLE \w+ USING)(?:TABLE )?(\w+)\b(?! USING)'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the viewsets' canonical queries and flag sequential "
+        'scans; exits with an error when any query scans a whole table'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--query', action='append', choices=sorted(QUERIES), help='Limit to some queries')
+        parser.add_argument(
+            '--planner-costs', action='store_true',
+            help='PostgreSQL: keep seq scans enabled. By default they are disabled so that '
+                 'small tables do not hide a missing index.',
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'Unsupported database backend: {connection.vendor}')
+
+        params = self.sample_params()
+        flagged = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql' and not options['planner_costs']:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for label in options['query'] or QUERIES:
+                plan = QUERIES[label](params).explain()
+                tables = pattern.findall(plan)
+                if tables:
+                    flagged.append(label)
+                    self.stdout.write(self.style.WARNING(f'{label}: sequential scan on {", ".join(tables)}'))
+                else:
+                    self.stdout.write(f'{label}: ok')
+                if options['verbosity'] > 1 or tables:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+        if flagged:
+            raise CommandError(f'{len(flagged)} queries use sequential scans: {", ".join(flagged)}')
+        self.stdout.write(self.style.SUCCESS('All queries use indexes.'))
+
+    def sample_params(self):
+        """Real ids when the tables have rows, placeholders otherwise"""
+        module_id = Module.objects.order_by('id').values_list('id', flat=True).first() or 1
+        return {
+            'user_id': User.objects.order_by('id').values_list('id', flat=True).first() or 1,
+            'module_id': module_id,
+            'question_ids': list(
+                Question.objects.filter(module_id=module_id).values_list('id', flat=True)[:20]
+            ) or [1],
+            'department': User.objects.values_list('department', flat=True).first() or 'Общий',
+            'since': timezone.now() - timedelta(days=30),
+        }
@@ -0,0 +1,25 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from api import content
+
+
+class Command(BaseCommand):
+    help = 'Export modules with their lessons, questions and answers as JSON or YAML'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', type=int, action='append', help='Module id to export (default: all)')
+        parser.add_argument('--format', choices=content.FORMATS, help='Default: from the output file extension, else json')
+        parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or content.format_for(options['output'])
+        text = content.dumps(content.export_tree(options['module']), fmt)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.stderr.write(self.style.SUCCESS(f'Exported to {options["output"]}'))
+        else:
+            sys.stdout.write(text)
+
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from api import content
+
+
+class Command(BaseCommand):
+    help = (
+        'Import modules with their lessons, questions and answers from a JSON or YAML '
+        'file, writing only the rows that differ from the database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Content document (.json, .yaml or .yml)')
+        parser.add_argument('--format', choices=content.FORMATS, help='Default: from the file extension')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without writing them')
+
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8') as f:
+            text = f.read()
+        try:
+            stats = content.import_tree(
+                content.loads(text, options['format'] or content.format_for(options['path'])),
+                dry_run=options['dry_run'],
+            )
+        except ValidationError as exc:
+            raise CommandError(f'Invalid content document: {exc.detail}')
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for table, counts in stats.items():
+            self.stdout.write(
+                '{table:<10} {created} created, {updated} updated, {deleted} deleted, {unchanged} unchanged'.format(
+                    table=table, **counts
+                )
+            )
+        self.stdout.write(self.style.SUCCESS('Dry run, nothing written.' if options['dry_run'] else 'Import complete.'))
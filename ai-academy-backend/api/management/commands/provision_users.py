@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import provisioning
+
+
+class Command(BaseCommand):
+    help = (
+        'Create users from a CSV or JSON roster: validate every row, hash passwords '
+        'on a process pool and insert the valid rows in one transaction'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Roster file (.csv with a header row, or .json)')
+        parser.add_argument('--format', choices=provisioning.FORMATS, help='Default: from the file extension')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the roster without creating users')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: PROVISIONING_HASH_WORKERS)')
+
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8-sig') as f:
+            text = f.read()
+        try:
+            roster = provisioning.loads(text, options['format'] or provisioning.format_for(options['path']))
+            results = provisioning.provision(roster, dry_run=options['dry_run'], workers=options['workers'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        failed = [outcome for outcome in results if outcome['status'] == 'error']
+        for outcome in failed:
+            for field, messages in outcome['errors'].items():
+                self.stderr.write(f'row {outcome["index"] + 1}: {field}: {" ".join(map(str, messages))}')
+        ok = len(results) - len(failed)
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Dry run: {ok} valid, {len(failed)} invalid, nothing written.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{ok} users created, {len(failed)} rows skipped.'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api import analytics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the user, department and module analytics rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--modules', action='store_true',
+            help='Only recompute the module rollups (writes do not refresh them; run this periodically)',
+        )
+
+    def handle(self, *args, **options):
+        if options['modules']:
+            modules = analytics.rebuild_modules()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt module analytics: {modules} modules'))
+            return
+        counts = analytics.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            'Rebuilt analytics: {users} users, {departments} departments, {modules} modules'.format(**counts)
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Recompute the global, department and module leaderboards from the test results and progress'
+
+    def handle(self, *args, **options):
+        entries = leaderboards.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt leaderboards: {entries} entries'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api import lesson_bodies
+from api.models import Lesson
+
+
+class Command(BaseCommand):
+    help = 'Pre-render and compress lesson bodies (only lessons without one, unless --all)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-render every lesson body')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            lessons = Lesson.objects.only('id', 'content').order_by('id').iterator(chunk_size=lesson_bodies.BATCH_SIZE)
+            count = lesson_bodies.store(lessons)
+        else:
+            count = lesson_bodies.backfill()
+        self.stdout.write(self.style.SUCCESS(f'{count} lesson bodies rendered.'))
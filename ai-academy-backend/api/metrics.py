@@ -0,0 +1,269 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+MetricsMiddleware records, per resolved route name and viewset action:
+a latency histogram, database query count and time, serializer time,
+response size, and requests whose queries repeat one SQL shape more than
+METRICS_N_PLUS_ONE_THRESHOLD times (N+1 patterns, also logged with the
+offending statement).
+
+Database time is measured by an execute wrapper installed once per
+connection (see signals.instrument_connection); it costs one context
+variable lookup per query and also sees queries that async views run in
+worker threads. Serializer time is measured by DynamicFieldsMixin around
+top-level to_representation calls.
+
+Metrics live in process memory: one fixed-size series per (route, action,
+method), capped at METRICS_MAX_SERIES. GET /api/metrics/ exposes them to
+staff users (Prometheus scrapes with basic auth as a staff account). With
+several workers each process reports its own counters.
+"""
+import bisect
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Collapses IN (...) / VALUES lists so queries differing only in list length share a shape
+_PARAM_LIST = re.compile(r'\((?:%s, )+%s\)')
+_SELECT_LIST = re.compile(r'^SELECT .*? FROM ')
+
+_current = ContextVar('api_metrics_request', default=None)
+
+
+class RequestRecord:
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'serializing', 'shapes')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.shapes = Counter()
+
+
+class Series:
+    __slots__ = ('buckets', 'count', 'duration', 'queries', 'db_time', 'serializer_time', 'bytes', 'n_plus_one')
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.bytes = 0
+        self.n_plus_one = 0
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, labels, duration, record, size, n_plus_one):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                if len(self._series) >= getattr(settings, 'METRICS_MAX_SERIES', 1000):
+                    labels = ('<other>', '', labels[2])
+                series = self._series.setdefault(labels, Series())
+            series.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+            series.count += 1
+            series.duration += duration
+            series.queries += record.queries
+            series.db_time += record.db_time
+            series.serializer_time += record.serializer_time
+            series.bytes += size
+            series.n_plus_one += n_plus_one
+
+    def snapshot(self):
+        with self._lock:
+            return sorted((labels, _copy(series)) for labels, series in self._series.items())
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _copy(series):
+    copy = Series()
+    for name in Series.__slots__:
+        value = getattr(series, name)
+        setattr(copy, name, list(value) if isinstance(value, list) else value)
+    return copy
+
+
+registry = Registry()
+
+
+def _execute(execute, sql, params, many, context):
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.db_time += time.perf_counter() - start
+        record.queries += 1
+        record.shapes[_PARAM_LIST.sub('(%s...)', sql)] += 1
+
+
+def instrument(connection):
+    """Install the query timer on a database connection (idempotent)"""
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _execute)
+
+
+@contextmanager
+def serializing():
+    """Time the outermost serialization of the current request"""
+    record = _current.get()
+    if record is None or record.serializing:
+        yield
+        return
+    record.serializing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record.serializer_time += time.perf_counter() - start
+        record.serializing = False
+
+
+def _labels(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return ('<unmatched>', '', request.method)
+    actions = getattr(match.func, 'actions', None) or {}
+    return (match.view_name or match.route, actions.get(request.method.lower(), ''), request.method)
+
+
+def _response_size(response):
+    if response.streaming:
+        return 0
+    return len(response.content)
+
+
+def _finish(request, response, record, start):
+    duration = time.perf_counter() - start
+    threshold = getattr(settings, 'METRICS_N_PLUS_ONE_THRESHOLD', 10)
+    repeated = [(shape, n) for shape, n in record.shapes.items() if n > threshold]
+    labels = _labels(request)
+    for shape, n in repeated:
+        logger.warning('N+1 query on %s %s (%s): %d x %s', labels[2], request.path, labels[0], n, _SELECT_LIST.sub('SELECT ... FROM ', shape)[:300])
+    registry.observe(labels, duration, record, _response_size(response), 1 if repeated else 0)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        record = RequestRecord()
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        _finish(request, response, record, start)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        record = RequestRecord()
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        _finish(request, response, record, start)
+        return response
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render():
+    """All series in Prometheus text exposition format (version 0.0.4)"""
+    snapshot = registry.snapshot()
+    lines = []
+
+    def family(name, kind, help_text, rows):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(rows)
+
+    def label_text(labels, **extra):
+        route, action, method = labels
+        pairs = [('route', route), ('action', action), ('method', method), *extra.items()]
+        return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+    histogram = []
+    for labels, series in snapshot:
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, '+Inf'), series.buckets):
+            cumulative += count
+            histogram.append(f'api_request_duration_seconds_bucket{label_text(labels, le=bound)} {cumulative}')
+        histogram.append(f'api_request_duration_seconds_sum{label_text(labels)} {series.duration:.6f}')
+        histogram.append(f'api_request_duration_seconds_count{label_text(labels)} {series.count}')
+    family('api_request_duration_seconds', 'histogram', 'Request latency.', histogram)
+
+    for name, attr, help_text, fmt in (
+        ('api_db_queries_total', 'queries', 'Database queries executed.', '{}'),
+        ('api_db_duration_seconds_total', 'db_time', 'Time spent in database queries.', '{:.6f}'),
+        ('api_serializer_duration_seconds_total', 'serializer_time', 'Time spent serializing.', '{:.6f}'),
+        ('api_response_bytes_total', 'bytes', 'Response body bytes (streaming responses excluded).', '{}'),
+        ('api_n_plus_one_requests_total', 'n_plus_one', 'Requests repeating one SQL shape past the threshold.', '{}'),
+    ):
+        family(name, 'counter', help_text, [
+            f'{name}{label_text(labels)} {fmt.format(getattr(series, attr))}' for labels, series in snapshot
+        ])
+
+    from .caching import stats as cache_stats
+    cache = cache_stats()
+    for name, attr, help_text in (
+        ('api_cache_hits_total', 'hits', 'Response cache hits.'),
+        ('api_cache_misses_total', 'misses', 'Response cache misses.'),
+    ):
+        family(name, 'counter', help_text, [
+            f'{name}{{namespace="{_escape(namespace)}"}} {counts[attr]}' for namespace, counts in cache.items()
+        ])
+    return '\n'.join(lines) + '\n'
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """GET /api/metrics/ - Prometheus scrape endpoint (staff only: scrape with basic auth)"""
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
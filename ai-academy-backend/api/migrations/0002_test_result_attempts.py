@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testresult',
+            name='attempts',
+            field=models.IntegerField(default=1, help_text='Number of submissions folded into this row'),
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='best_score',
+            field=models.IntegerField(default=0, help_text='Highest score across all attempts'),
+        ),
+        migrations.AddConstraint(
+            model_name='testresult',
+            constraint=models.UniqueConstraint(condition=models.Q(('lesson__isnull', True)), fields=('user', 'module'), name='test_results_final_user_module_uniq'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentStats',
+            fields=[
+                ('results_count', models.IntegerField(default=0, help_text='Module-final test results')),
+                ('score_sum', models.IntegerField(default=0)),
+                ('passed_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('department', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('users_count', models.IntegerField(default=0)),
+                ('modules_completed', models.IntegerField(default=0)),
+                ('time_spent', models.IntegerField(default=0, help_text='Total time spent in minutes')),
+            ],
+            options={
+                'db_table': 'analytics_department_stats',
+                'ordering': ['department'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ModuleStats',
+            fields=[
+                ('results_count', models.IntegerField(default=0, help_text='Module-final test results')),
+                ('score_sum', models.IntegerField(default=0)),
+                ('passed_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('module', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.module')),
+                ('learners_started', models.IntegerField(default=0)),
+                ('learners_completed', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'analytics_module_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('results_count', models.IntegerField(default=0, help_text='Module-final test results')),
+                ('score_sum', models.IntegerField(default=0)),
+                ('passed_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('department', models.CharField(db_index=True, max_length=100)),
+                ('modules_started', models.IntegerField(default=0)),
+                ('modules_completed', models.IntegerField(default=0)),
+                ('time_spent', models.IntegerField(default=0, help_text='Total time spent in minutes')),
+            ],
+            options={
+                'db_table': 'analytics_user_stats',
+            },
+        ),
+    ]
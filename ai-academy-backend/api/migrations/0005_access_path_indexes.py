@@ -0,0 +1,64 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='answer',
+            name='question',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='api.question'),
+        ),
+        migrations.AlterField(
+            model_name='lesson',
+            name='module',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='lessons', to='api.module'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='module',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='questions', to='api.module'),
+        ),
+        migrations.AlterField(
+            model_name='testresult',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='test_results', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='userprogress',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='progress', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'order', 'id'], name='answers_question_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='module',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='modules_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['module', 'order', 'id'], name='questions_module_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(fields=['user', '-completed_at', '-id'], name='test_results_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(condition=models.Q(('lesson__isnull', True)), fields=['module', '-completed_at'], name='test_results_final_module_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['updated_at'], name='user_progress_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_lesson_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonBody',
+            fields=[
+                ('lesson', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='api.lesson')),
+                ('digest', models.CharField(help_text='SHA-256 of the uncompressed body', max_length=64)),
+                ('gzip', models.BinaryField()),
+                ('brotli', models.BinaryField(blank=True, help_text='Empty when the brotli package is not installed', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'lesson_bodies',
+            },
+        ),
+    ]
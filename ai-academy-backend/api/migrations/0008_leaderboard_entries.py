@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_lesson_bodies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(help_text="'global', 'module:<id>' or 'department:<name>'", max_length=120)),
+                ('score', models.IntegerField(default=0, help_text='Sum of module-final test scores on this board')),
+                ('passed', models.IntegerField(default=0, help_text='Module-final tests passed on this board')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'leaderboard_entries',
+                'indexes': [models.Index(fields=['board', '-score', '-passed', 'user'], name='leaderboard_rank_idx')],
+                'unique_together': {('board', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_leaderboard_entries'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='leaderboardentry',
+            name='leaderboard_rank_idx',
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='completed',
+            field=models.IntegerField(default=0, help_text='Modules completed on this board'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['board', '-score', '-completed', '-passed', 'user'], name='leaderboard_rank_idx'),
+        ),
+    ]
@@ -20,6 +20,9 @@ class User(AbstractUser):
     class Meta:
         db_table = 'users'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='users_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.email})"
@@ -49,6 +52,12 @@ class Module(models.Model):
     class Meta:
         db_table = 'modules'
         ordering = ['order', 'id']
+        indexes = [
+            # Student catalog: active modules in display order
+            models.Index(
+                fields=['order', 'id'], condition=models.Q(is_active=True), name='modules_active_order_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -56,7 +65,8 @@ class Module(models.Model):
 
 class Lesson(models.Model):
     """Lessons within modules"""
-    module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='lessons')
+    # Indexed by the (module, order) unique constraint
+    module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='lessons', db_index=False)
     title = models.CharField(max_length=200)
     content = models.TextField()
     video_url = models.URLField(blank=True, null=True)
@@ -76,9 +86,24 @@ class Lesson(models.Model):
         return f"{self.module.title} - {self.title}"
 
 
+class LessonBody(models.Model):
+    """Pre-rendered, pre-compressed lesson body served by /api/lessons/{id}/body/"""
+    lesson = models.OneToOneField(Lesson, on_delete=models.CASCADE, primary_key=True, related_name='body')
+    digest = models.CharField(max_length=64, help_text='SHA-256 of the uncompressed body')
+    gzip = models.BinaryField()
+    brotli = models.BinaryField(null=True, blank=True, help_text='Empty when the brotli package is not installed')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'lesson_bodies'
+
+    def __str__(self):
+        return f"Body of lesson {self.lesson_id}"
+
+
 class Question(models.Model):
     """Test questions for modules"""
-    module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='questions')
+    module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='questions', db_index=False)
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name='questions', null=True, blank=True)
     question_text = models.TextField()
     question_type = models.CharField(
@@ -93,6 +118,9 @@ class Question(models.Model):
     class Meta:
         db_table = 'questions'
         ordering = ['order', 'id']
+        indexes = [
+            models.Index(fields=['module', 'order', 'id'], name='questions_module_order_idx'),
+        ]
 
     def __str__(self):
         return f"Question {self.order + 1} - {self.module.title}"
@@ -100,7 +128,7 @@ class Question(models.Model):
 
 class Answer(models.Model):
     """Answer options for questions"""
-    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers', db_index=False)
     answer_text = models.CharField(max_length=500)
     is_correct = models.BooleanField(default=False)
     order = models.IntegerField(default=0)
@@ -108,6 +136,9 @@ class Answer(models.Model):
     class Meta:
         db_table = 'answers'
         ordering = ['order', 'id']
+        indexes = [
+            models.Index(fields=['question', 'order', 'id'], name='answers_question_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.question.question_text[:50]} - {self.answer_text[:30]}"
@@ -115,7 +146,8 @@ class Answer(models.Model):
 
 class UserProgress(models.Model):
     """Track user progress through modules"""
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress')
+    # Indexed by the (user, module) unique constraint
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress', db_index=False)
     module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='user_progress')
     started = models.BooleanField(default=False)
     viewed_lessons = models.IntegerField(default=0)
@@ -126,23 +158,63 @@ class UserProgress(models.Model):
     class Meta:
         db_table = 'user_progress'
         unique_together = ['user', 'module']
+        indexes = [
+            # Export date-range filters
+            models.Index(fields=['updated_at'], name='user_progress_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.module.title}"
 
 
+class LessonProgress(models.Model):
+    """A user's view and completion of one lesson; feeds the UserProgress counters"""
+    # Indexed by the (user, lesson) unique constraint
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lesson_progress', db_index=False)
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name='user_progress')
+    viewed_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'lesson_progress'
+        unique_together = ['user', 'lesson']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.lesson.title}"
+
+
 class TestResult(models.Model):
     """Test results for users"""
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='test_results')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='test_results', db_index=False)
     module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='test_results')
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name='test_results', null=True, blank=True)
     score = models.IntegerField(validators=[MinValueValidator(0), MaxValueValidator(100)])
     passed = models.BooleanField(default=False)
+    attempts = models.IntegerField(default=1, help_text='Number of submissions folded into this row')
+    best_score = models.IntegerField(default=0, help_text='Highest score across all attempts')
     completed_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'test_results'
         ordering = ['-completed_at']
+        indexes = [
+            models.Index(fields=['-completed_at', '-id'], name='test_results_completed_idx'),
+            # by_user: a user's results, newest first
+            models.Index(fields=['user', '-completed_at', '-id'], name='test_results_user_recent_idx'),
+            # Module analytics over module-final results
+            models.Index(
+                fields=['module', '-completed_at'], condition=models.Q(lesson__isnull=True),
+                name='test_results_final_module_idx',
+            ),
+        ]
+        constraints = [
+            # One module-final result (lesson IS NULL) per user and module
+            models.UniqueConstraint(
+                fields=['user', 'module'],
+                condition=models.Q(lesson__isnull=True),
+                name='test_results_final_user_module_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.module.title} - {self.score}%"
@@ -196,3 +268,86 @@ class AIAgentQuestionOption(models.Model):
 
     def __str__(self):
         return f"{self.question.question_id} - {self.option_text}"
+
+
+class ScoreRollup(models.Model):
+    """Score counters shared by the analytics rollup tables"""
+    results_count = models.IntegerField(default=0, help_text='Module-final test results')
+    score_sum = models.IntegerField(default=0)
+    passed_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def average_score(self):
+        return round(self.score_sum / self.results_count, 2) if self.results_count else None
+
+    @property
+    def pass_rate(self):
+        return round(self.passed_count / self.results_count, 4) if self.results_count else None
+
+
+class UserStats(ScoreRollup):
+    """Per-user analytics rollup (maintained by api.analytics)"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    department = models.CharField(max_length=100, db_index=True)
+    modules_started = models.IntegerField(default=0)
+    modules_completed = models.IntegerField(default=0)
+    time_spent = models.IntegerField(default=0, help_text='Total time spent in minutes')
+
+    class Meta:
+        db_table = 'analytics_user_stats'
+
+    def __str__(self):
+        return f"Stats for user {self.user_id}"
+
+
+class DepartmentStats(ScoreRollup):
+    """Per-department analytics rollup (maintained by api.analytics)"""
+    department = models.CharField(max_length=100, primary_key=True)
+    users_count = models.IntegerField(default=0)
+    modules_completed = models.IntegerField(default=0)
+    time_spent = models.IntegerField(default=0, help_text='Total time spent in minutes')
+
+    class Meta:
+        db_table = 'analytics_department_stats'
+        ordering = ['department']
+
+    def __str__(self):
+        return f"Stats for {self.department}"
+
+
+class ModuleStats(ScoreRollup):
+    """Per-module analytics rollup (maintained by api.analytics)"""
+    module = models.OneToOneField(Module, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    learners_started = models.IntegerField(default=0)
+    learners_completed = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'analytics_module_stats'
+
+    def __str__(self):
+        return f"Stats for module {self.module_id}"
+
+
+class LeaderboardEntry(models.Model):
+    """A user's standing on one leaderboard (maintained by api.leaderboards)"""
+    board = models.CharField(max_length=120, help_text="'global', 'module:<id>' or 'department:<name>'")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    score = models.IntegerField(default=0, help_text='Sum of module-final test scores on this board')
+    passed = models.IntegerField(default=0, help_text='Module-final tests passed on this board')
+    completed = models.IntegerField(default=0, help_text='Modules completed on this board')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'leaderboard_entries'
+        unique_together = ['board', 'user']
+        indexes = [
+            # Top N and rank counts: one range of the board in ranking order
+            models.Index(fields=['board', '-score', '-completed', '-passed', 'user'], name='leaderboard_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.board} - {self.user_id}"
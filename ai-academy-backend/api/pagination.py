@@ -0,0 +1,53 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.settings import api_settings
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination: every page is an indexed range scan with no
+    OFFSET and no COUNT(*), so deep pages cost the same as the first one.
+
+    Passing ?page=N switches back to the classic page-number response
+    (count/next/previous/results) used by the admin dashboard.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_number_query_param = 'page'
+
+    def use_page_numbers(self, request):
+        return self.page_number_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_page_numbers(request):
+            self.page_numbers = PageNumberPagination()
+            page = self.page_numbers.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.page_numbers.display_page_controls
+            return page
+        self.page_numbers = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.page_numbers is not None:
+            return self.page_numbers.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.page_numbers is not None:
+            return self.page_numbers.to_html()
+        return super().to_html()
+
+
+class UserPagination(KeysetPagination):
+    # Backed by the users_created_idx index
+    ordering = ('-created_at', '-id')
+
+
+class TestResultPagination(KeysetPagination):
+    # Backed by the test_results_completed_idx index
+    ordering = ('-completed_at', '-id')
+
+
+class SearchPagination(PageNumberPagination):
+    """Pages over an already ranked and bounded list of search hits"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,167 @@
+"""
+Bulk maintenance of UserProgress rows.
+
+Besides client-posted counters (bulk_upsert), the counters are kept up to
+date server-side: record_lesson_event() stores a LessonProgress row per
+viewed lesson and bumps viewed_lessons/completed_lessons with F()
+expressions, and lesson inserts and deletes recompute total_lessons for
+every learner of the module in one UPDATE (api.signals).
+"""
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import analytics, caching
+from .models import User, Module, Lesson, LessonProgress, UserProgress
+from .serializers import ProgressDeltaSerializer
+
+PROGRESS_FIELDS = ['started', 'viewed_lessons', 'completed_lessons', 'total_lessons']
+
+
+def bulk_upsert(items):
+    """
+    Validate and upsert a batch of progress deltas.
+
+    Valid items are written with one INSERT ... ON CONFLICT (user, module)
+    DO UPDATE per distinct set of supplied fields (normally exactly one).
+    Returns one outcome dict per input item, in input order.
+    """
+    outcomes = [None] * len(items)
+    merged = {}
+    for index, item in enumerate(items):
+        serializer = ProgressDeltaSerializer(data=item)
+        if not serializer.is_valid():
+            outcomes[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+            continue
+        data = serializer.validated_data
+        key = (data['user_id'], data['module_id'])
+        # Later items for the same pair override earlier ones
+        entry = merged.setdefault(key, {'indexes': [], 'values': {}})
+        entry['indexes'].append(index)
+        entry['values'].update({f: data[f] for f in PROGRESS_FIELDS if f in data})
+
+    user_ids = {user_id for user_id, _ in merged}
+    module_ids = {module_id for _, module_id in merged}
+    known_users = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+    known_modules = set(Module.objects.filter(id__in=module_ids).values_list('id', flat=True))
+    for key in list(merged):
+        user_id, module_id = key
+        if user_id in known_users and module_id in known_modules:
+            continue
+        errors = {}
+        if user_id not in known_users:
+            errors['user_id'] = ['User not found']
+        if module_id not in known_modules:
+            errors['module_id'] = ['Module not found']
+        for index in merged.pop(key)['indexes']:
+            outcomes[index] = {'index': index, 'status': 'error', 'errors': errors}
+
+    existing = set(
+        UserProgress.objects.filter(user_id__in=user_ids, module_id__in=module_ids)
+        .values_list('user_id', 'module_id')
+    )
+
+    groups = {}
+    for key, entry in merged.items():
+        fields = tuple(f for f in PROGRESS_FIELDS if f in entry['values'])
+        groups.setdefault(fields, []).append(
+            UserProgress(user_id=key[0], module_id=key[1], **entry['values'])
+        )
+
+    with transaction.atomic():
+        for fields, rows in groups.items():
+            UserProgress.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['user', 'module'],
+                update_fields=list(fields) + ['updated_at'],
+            )
+        # bulk_create does not send post_save
+        caching.invalidate('progress')
+        analytics.schedule(user_ids=[user_id for user_id, _ in merged])
+
+    for key, entry in merged.items():
+        result = 'updated' if key in existing else 'created'
+        for index in entry['indexes']:
+            outcomes[index] = {
+                'index': index, 'status': result,
+                'user_id': key[0], 'module_id': key[1],
+            }
+    return outcomes
+
+
+def record_lesson_event(user_id, lesson_id, completed=False):
+    """
+    Record that a user viewed (or completed) a lesson and return the
+    module's UserProgress row. Each lesson is counted once per user, so
+    repeated events leave the counters alone. Raises ValueError for an
+    unknown user or lesson.
+    """
+    module_id = Lesson.objects.filter(pk=lesson_id).values_list('module_id', flat=True).first()
+    if module_id is None:
+        raise ValueError('Lesson not found')
+    if not User.objects.filter(pk=user_id).exists():
+        raise ValueError('User not found')
+
+    now = timezone.now()
+    with transaction.atomic():
+        event, viewed = LessonProgress.objects.get_or_create(
+            user_id=user_id, lesson_id=lesson_id,
+            defaults={'completed_at': now if completed else None},
+        )
+        completions = int(viewed and completed)
+        if completed and not viewed:
+            # Conditional update: concurrent completions count once
+            completions = LessonProgress.objects.filter(
+                pk=event.pk, completed_at__isnull=True,
+            ).update(completed_at=now)
+
+        progress, _ = UserProgress.objects.get_or_create(
+            user_id=user_id, module_id=module_id,
+            defaults={'started': True, 'total_lessons': lambda: Lesson.objects.filter(module_id=module_id).count()},
+        )
+        if viewed or completions or not progress.started:
+            UserProgress.objects.filter(pk=progress.pk).update(
+                started=True,
+                viewed_lessons=F('viewed_lessons') + int(viewed),
+                completed_lessons=F('completed_lessons') + completions,
+                updated_at=now,
+            )
+            # Queryset updates send no signals
+            caching.invalidate('progress')
+            analytics.schedule(user_ids=[user_id])
+    return UserProgress.objects.select_related('user', 'module').get(pk=progress.pk)
+
+
+def sync_total_lessons(module_ids):
+    """Recompute total_lessons of every progress row of the modules in one UPDATE"""
+    module_ids = set(module_ids)
+    if not module_ids:
+        return 0
+    lessons = (
+        Lesson.objects.filter(module=OuterRef('module')).order_by()
+        .values('module').annotate(n=Count('id')).values('n')
+    )
+    rows = UserProgress.objects.filter(module_id__in=module_ids)
+    user_ids = set(rows.values_list('user_id', flat=True))
+    if not user_ids:
+        return 0
+    updated = rows.update(total_lessons=Coalesce(Subquery(lessons), Value(0)), updated_at=timezone.now())
+    caching.invalidate('progress')
+    analytics.schedule(user_ids=user_ids)
+    return updated
+
+
+def retract_lesson(lesson):
+    """Take a lesson that is about to be deleted out of its learners' counters (two UPDATEs)"""
+    events = LessonProgress.objects.filter(lesson=lesson)
+    rows = UserProgress.objects.filter(module_id=lesson.module_id)
+    viewed = rows.filter(user_id__in=events.values('user_id'), viewed_lessons__gt=0).update(
+        viewed_lessons=F('viewed_lessons') - 1,
+    )
+    completed = rows.filter(
+        user_id__in=events.filter(completed_at__isnull=False).values('user_id'), completed_lessons__gt=0,
+    ).update(completed_lessons=F('completed_lessons') - 1)
+    if viewed or completed:
+        caching.invalidate('progress')
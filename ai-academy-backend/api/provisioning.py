@@ -0,0 +1,154 @@
+"""
+Bulk employee provisioning from a CSV or JSON roster.
+
+A roster is a list of user rows (username, email, first_name, last_name,
+department, role, password). All rows are validated up front: field
+validation per row, then duplicate usernames and emails are found within
+the roster and against the database in two queries. Passwords of the
+valid rows are hashed in parallel on a pool of spawned processes (PBKDF2
+is CPU-bound, and every user needs its own salt even for the default
+password), and the users are inserted with bulk_create in one transaction.
+"""
+import csv
+import io
+import json
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from . import analytics, caching, hashing
+from .models import User
+from .serializers import ProvisionUserSerializer
+
+FORMATS = ('csv', 'json')
+
+DEFAULT_PASSWORD = 'password123'
+
+# Below this many passwords a process pool costs more than it saves
+PARALLEL_MIN_ROWS = 50
+
+
+def loads(text, fmt='json'):
+    """Roster rows from CSV (header row) or JSON (list or {'users': [...]}); raises ValueError"""
+    if fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(text))
+        return [{key.strip(): value.strip() for key, value in row.items() if key and value} for row in reader]
+    document = json.loads(text)
+    if isinstance(document, dict):
+        document = document.get('users')
+    if not isinstance(document, list):
+        raise ValueError("A roster is a list of users or an object with a 'users' list")
+    return document
+
+
+def format_for(path):
+    """'csv' for .csv paths, else 'json'"""
+    return 'csv' if path and path.lower().endswith('.csv') else 'json'
+
+
+class CSVParser(BaseParser):
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read().decode('utf-8-sig'), 'csv')
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise ParseError(f'Invalid CSV: {exc}')
+
+
+def _cpu_count():
+    """CPUs this process may run on (container-aware where the OS tells)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def hash_passwords(passwords, workers=None):
+    """make_password() for every password, spread over `workers` processes"""
+    if workers is None:
+        workers = getattr(settings, 'PROVISIONING_HASH_WORKERS', None) or _cpu_count()
+    if workers <= 1 or len(passwords) < PARALLEL_MIN_ROWS:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    # Spawned, not forked: a fork of a request-serving worker would inherit its
+    # threads (activity flusher), locks and open database connections
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=hashing.init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def _duplicates(rows, field, stored):
+    """{row index: message} for rows whose `field` repeats in the roster or exists already"""
+    counts = Counter(data[field] for data in rows.values())
+    errors = {}
+    for index, data in rows.items():
+        if data[field] in stored:
+            errors[index] = f'A user with this {field} already exists.'
+        elif counts[data[field]] > 1:
+            errors[index] = f'Duplicate {field} in the roster.'
+    return errors
+
+
+def validate(roster):
+    """(valid rows by index, errors by index) without writing anything"""
+    valid, errors = {}, {}
+    for index, item in enumerate(roster):
+        serializer = ProvisionUserSerializer(data=item)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+
+    for field in ('username', 'email'):
+        values = {data[field] for data in valid.values()}
+        stored = set(User.objects.filter(**{f'{field}__in': values}).values_list(field, flat=True))
+        for index, message in _duplicates(valid, field, stored).items():
+            errors.setdefault(index, {})[field] = [message]
+    for index in errors:
+        valid.pop(index, None)
+    return valid, errors
+
+
+def provision(roster, dry_run=False, workers=None):
+    """
+    Validate a roster and create its valid rows; returns one outcome dict
+    per row, in roster order. Raises ValueError when a concurrent write
+    claims a username or email between validation and insert.
+    """
+    valid, errors = validate(roster)
+    created = {}
+    if valid and not dry_run:
+        indexes = list(valid)
+        hashes = hash_passwords([valid[index].get('password') or DEFAULT_PASSWORD for index in indexes], workers)
+        users = []
+        for index, password in zip(indexes, hashes):
+            data = {key: value for key, value in valid[index].items() if key != 'password'}
+            users.append(User(password=password, **data))
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users, batch_size=1000)
+                # bulk_create sends no post_save
+                caching.invalidate('users')
+                analytics.schedule(user_ids=[user.pk for user in users])
+        except IntegrityError:
+            raise ValueError('A username or email was taken while provisioning; nothing was created, retry')
+        created = dict(zip(indexes, users))
+
+    outcomes = []
+    for index in range(len(roster)):
+        if index in errors:
+            outcomes.append({'index': index, 'status': 'error', 'errors': errors[index]})
+        elif index in created:
+            user = created[index]
+            outcomes.append({'index': index, 'status': 'created', 'id': user.pk, 'username': user.username})
+        else:
+            outcomes.append({'index': index, 'status': 'valid', 'username': valid[index]['username']})
+    return outcomes
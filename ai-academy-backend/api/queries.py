@@ -0,0 +1,51 @@
+"""
+Query planning for the content viewsets.
+
+Each function returns a queryset that already carries every join, prefetch
+and annotation its serializer reads, so list and retrieve actions run in a
+fixed number of queries regardless of how many modules, lessons or
+questions are returned.
+"""
+from django.db.models import Count, Prefetch
+
+from .models import Module, Lesson, Question
+
+
+def questions(queryset=None):
+    """Questions with their answers (QuestionSerializer)"""
+    if queryset is None:
+        queryset = Question.objects.all()
+    return queryset.prefetch_related('answers')
+
+
+def lessons(queryset=None):
+    """Lessons with nested questions and answers (LessonSerializer)"""
+    if queryset is None:
+        queryset = Lesson.objects.all()
+    return queryset.prefetch_related(
+        Prefetch('questions', queryset=questions())
+    )
+
+
+def modules(queryset=None):
+    """Modules with lesson_count, lesson metadata and questions (ModuleSerializer)"""
+    if queryset is None:
+        queryset = Module.objects.all()
+    return queryset.annotate(
+        lesson_count=Count('lessons')
+    ).prefetch_related(
+        Prefetch('lessons', queryset=Lesson.objects.defer('content')),
+        Prefetch('questions', queryset=questions()),
+    )
+
+
+def expanded(queryset, serializer_class, request):
+    """Add the joins/prefetches for the expansions this request will render"""
+    expandable = getattr(serializer_class.Meta, 'expandable_fields', {})
+    for name in serializer_class.requested_expansions(request):
+        spec = expandable[name]
+        if 'select' in spec:
+            queryset = queryset.select_related(spec['select'])
+        if 'prefetch' in spec:
+            queryset = queryset.prefetch_related(spec['prefetch'])
+    return queryset
@@ -0,0 +1,53 @@
+"""
+Pre-rendered AI agent questionnaire (GET /api/ai-agent-questions/questionnaire/).
+
+The questionnaire only changes through the admin, so it is kept as one
+immutable JSON body together with a content hash (the version). The body
+is tied to the 'agent_questions' namespace token of api.caching: saving or
+deleting an AIAgentQuestion or AIAgentQuestionOption replaces the token
+after commit (api.signals.invalidate_cached_responses).
+
+When the API cache is shared by all workers (caching.is_shared()), every
+process keeps the body in memory and renders it again on the next request
+after the token changes. An in-process cache never sees the tokens other
+workers replace, so the body is then stored as a regular cache entry and
+is at most API_CACHE_TIMEOUT seconds behind an edit made elsewhere.
+
+The versioned URL (?v=<version>) never changes content and is served as
+immutable; the plain URL is revalidated with the version as its ETag.
+"""
+import hashlib
+import threading
+
+from rest_framework.renderers import JSONRenderer
+
+from . import caching, replicas
+from .models import AIAgentQuestion
+from .serializers import AIAgentQuestionSerializer
+
+NAMESPACE = 'agent_questions'
+
+_lock = threading.Lock()
+_snapshot = (None, None, None)  # (namespace token, body, version)
+
+
+def render():
+    """(body, version) rendered from the database (two queries)"""
+    questions = AIAgentQuestion.objects.prefetch_related('options')
+    body = JSONRenderer().render(AIAgentQuestionSerializer(questions, many=True).data)
+    return body, hashlib.sha256(body).hexdigest()[:16]
+
+
+def get():
+    """(body, version) of the current questionnaire, rendered at most once per edit"""
+    global _snapshot
+    if not caching.is_shared():
+        return caching.get_or_build([NAMESPACE], 'questionnaire', render)
+    token, = caching.versions([NAMESPACE])
+    if _snapshot[0] != token:
+        with _lock:
+            if _snapshot[0] != token:
+                with replicas.use_primary():
+                    _snapshot = (token, *render())
+    _, body, version = _snapshot
+    return body, version
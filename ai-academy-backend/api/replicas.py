@@ -0,0 +1,157 @@
+"""
+Read replicas with read-your-writes stickiness.
+
+DATABASE_REPLICAS lists the DATABASES aliases that replicate 'default'.
+ReplicaMiddleware picks one of them for each GET/HEAD/OPTIONS request to
+an api view, and ReplicaRouter sends that request's reads there. Writes,
+unsafe requests, other apps (admin), management commands and background
+threads always use the primary. Without replicas the middleware removes
+itself and the router defers to Django's defaults.
+
+A request that writes reads from the primary from then on, and pins its
+client to the primary for REPLICA_PIN_SECONDS: the pin lives in the shared
+cache (API_CACHE_ALIAS) under the authenticated user, else the client
+address and user agent. So a POST /api/progress/update_or_create/
+followed by GET /api/progress/by_user/ sees its own write even while the
+replica lags.
+
+Shared cache entries (api.caching, the questionnaire and catalog
+snapshots) are built from the primary (use_primary()): they are stored
+under the namespace version that the write just started, and a lagging
+replica would keep them stale for every client until the next write.
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+PIN_PREFIX = 'api:db_pin:'
+
+_current = ContextVar('api_replica_request', default=None)
+
+
+class RequestState:
+    def __init__(self):
+        self.replica = None  # alias this request reads from; None = primary
+        self.wrote = False
+
+
+def replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def _pins():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block"""
+    state = _current.get()
+    if state is None or state.replica is None:
+        yield
+        return
+    replica, state.replica = state.replica, None
+    try:
+        yield
+    finally:
+        if not state.wrote:
+            state.replica = replica
+
+
+def client_id(request):
+    """Cache key of the client's pin: the authenticated user, else address and user agent"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'{PIN_PREFIX}user:{user.pk}'
+    header = getattr(settings, 'REPLICA_CLIENT_IP_HEADER', None)
+    address = request.META.get(header, '').split(',')[0].strip() if header else ''
+    address = address or request.META.get('REMOTE_ADDR', '')
+    agent = hashlib.sha1(request.META.get('HTTP_USER_AGENT', '').encode('utf-8')).hexdigest()[:12]
+    return f'{PIN_PREFIX}{address}:{agent}'
+
+
+def _is_api_view(view_func):
+    view = getattr(view_func, 'cls', view_func)
+    return view.__module__.split('.')[0] == __name__.split('.')[0]
+
+
+class ReplicaRouter:
+    """Reads of replica-routed requests go to their replica, all writes to the primary"""
+
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        if state is None:
+            return None
+        return state.replica or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            state.wrote = True
+            state.replica = None
+        # Instances read from a replica must still be saved to the primary
+        return DEFAULT_DB_ALIAS if replicas() else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.replicas = replicas()
+        if not self.replicas:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        state = RequestState()
+        token = _current.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._pin(request, state)
+        return response
+
+    async def __acall__(self, request):
+        state = RequestState()
+        token = _current.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._pin(request, state)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _current.get()
+        if state is None or request.method not in SAFE_METHODS or not _is_api_view(view_func):
+            return None
+        # Resolved while reads still go to the primary (a session lookup may run here)
+        if _pins().get(client_id(request)) is None:
+            state.replica = random.choice(self.replicas)
+        return None
+
+    def _pin(self, request, state):
+        if state.wrote:
+            _pins().set(client_id(request), True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
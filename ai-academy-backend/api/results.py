@@ -0,0 +1,106 @@
+"""
+Atomic recording of module-final test results.
+
+A module-final result is a TestResult with lesson IS NULL; the partial
+unique constraint on (user, module) keeps at most one such row. Submissions
+are folded into that row with a single INSERT ... ON CONFLICT DO UPDATE, so
+concurrent submissions can neither duplicate nor lose the row.
+
+TEST_RESULT_MODE controls what score/passed/completed_at hold:
+- 'latest': the most recent attempt (the historical behaviour)
+- 'best': the highest-scoring attempt
+In both modes attempts and best_score are accumulated.
+"""
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from . import analytics, caching, leaderboards
+from .models import TestResult
+
+UPSERT_VENDORS = ('postgresql', 'sqlite')
+
+
+def _upsert_sql(mode):
+    qn = connection.ops.quote_name
+    table = qn(TestResult._meta.db_table)
+    if mode == 'best':
+        def pick(column):
+            return (
+                f'{qn(column)} = CASE WHEN excluded.{qn("score")} >= {table}.{qn("best_score")} '
+                f'THEN excluded.{qn(column)} ELSE {table}.{qn(column)} END'
+            )
+    else:
+        def pick(column):
+            return f'{qn(column)} = excluded.{qn(column)}'
+
+    assignments = [
+        pick('score'),
+        pick('passed'),
+        pick('completed_at'),
+        f'{qn("attempts")} = {table}.{qn("attempts")} + 1',
+        f'{qn("best_score")} = CASE WHEN excluded.{qn("score")} > {table}.{qn("best_score")} '
+        f'THEN excluded.{qn("score")} ELSE {table}.{qn("best_score")} END',
+    ]
+    # Assignments are evaluated against the pre-update row, so the order above is safe
+    return (
+        f'INSERT INTO {table} ({qn("user_id")}, {qn("module_id")}, {qn("lesson_id")}, '
+        f'{qn("score")}, {qn("passed")}, {qn("attempts")}, {qn("best_score")}, {qn("completed_at")}) '
+        f'VALUES (%s, %s, NULL, %s, %s, 1, %s, %s) '
+        f'ON CONFLICT ({qn("user_id")}, {qn("module_id")}) WHERE {qn("lesson_id")} IS NULL '
+        f'DO UPDATE SET {", ".join(assignments)}'
+    )
+
+
+def _locked_final(user_id, module_id):
+    return (
+        TestResult.objects.select_for_update()
+        .filter(user_id=user_id, module_id=module_id, lesson__isnull=True)
+        .first()
+    )
+
+
+def _record_locked(user_id, module_id, score, passed, completed_at, mode):
+    """Fallback for backends without partial-index upsert support"""
+    with transaction.atomic():
+        result = _locked_final(user_id, module_id)
+        if result is None:
+            try:
+                # Savepoint: a concurrent first submission may insert the row before us
+                with transaction.atomic():
+                    TestResult.objects.create(
+                        user_id=user_id, module_id=module_id, score=score,
+                        passed=passed, best_score=score,
+                    )
+                return
+            except IntegrityError:
+                result = _locked_final(user_id, module_id)
+        if mode != 'best' or score >= result.best_score:
+            result.score = score
+            result.passed = passed
+            result.completed_at = completed_at
+        result.attempts += 1
+        result.best_score = max(result.best_score, score)
+        result.save()
+
+
+def record_final(user_id, module_id, score, passed, mode=None):
+    """Fold one module-final submission into the summary row and return it"""
+    mode = mode or getattr(settings, 'TEST_RESULT_MODE', 'latest')
+    completed_at = timezone.now()
+    if connection.vendor in UPSERT_VENDORS:
+        with connection.cursor() as cursor:
+            cursor.execute(_upsert_sql(mode), [
+                user_id, module_id, score, passed, score,
+                connection.ops.adapt_datetimefield_value(completed_at),
+            ])
+        # The raw upsert bypasses model signals
+        caching.invalidate('results')
+        analytics.schedule(user_ids=[user_id])
+        leaderboards.schedule([user_id])
+    else:
+        _record_locked(user_id, module_id, score, passed, completed_at, mode)
+
+    return TestResult.objects.select_related('user', 'module', 'lesson').get(
+        user_id=user_id, module_id=module_id, lesson__isnull=True
+    )
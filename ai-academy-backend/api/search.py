@@ -0,0 +1,138 @@
+"""
+Indexed, ranked user search.
+
+Every backend matches word prefixes: each query word must start a word of
+one of the searchable columns, so "ann" finds "Anna" but not "Joanna".
+PostgreSQL uses a pg_trgm GIN index over the searchable columns, matches
+one word-start regex per query word (each one an index condition) and
+ranks by word_similarity(); SQLite uses an FTS5 table kept in sync with
+`users` by triggers, matches "word"* prefix queries and ranks by bm25.
+Both indexes are created by install(), which runs after `migrate`. Other
+backends (or a database where the index could not be created) fall back
+to a bounded scan with the same word-start regex.
+"""
+import logging
+import re
+
+from django.db import DatabaseError, connections
+from django.db.models import Q
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ['username', 'email', 'department', 'first_name', 'last_name']
+FTS_TABLE = 'users_search'
+TRGM_INDEX = 'users_search_trgm_idx'
+
+# alias -> 'trigram' | 'fts5' | 'scan'
+_backends = {}
+
+
+def _document(qn):
+    """SQL expression the trigram index is built on and queries must match"""
+    return "lower(%s)" % " || ' ' || ".join(qn(column) for column in SEARCH_COLUMNS)
+
+
+def terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+def install(using='default'):
+    """Create the search index for the given database if it supports one"""
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    table = qn(User._meta.db_table)
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {qn(TRGM_INDEX)} ON {table} '
+                    f'USING gin (({_document(qn)}) gin_trgm_ops)'
+                )
+            elif connection.vendor == 'sqlite':
+                columns = ', '.join(SEARCH_COLUMNS)
+                new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+                old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                    f"{columns}, content={table}, content_rowid='id', tokenize='unicode61')"
+                )
+                cursor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN '
+                    f'INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END'
+                )
+                cursor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN '
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+                )
+                cursor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {table} BEGIN '
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+                    f'INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END'
+                )
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    except DatabaseError:
+        logger.warning('User search index unavailable on %r, falling back to scans', using, exc_info=True)
+    _backends.pop(using, None)
+
+
+def backend(using='default'):
+    """Detect (once per database alias) which search strategy is available"""
+    if using not in _backends:
+        connection = connections[using]
+        name = 'scan'
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                if cursor.fetchone() is not None:
+                    name = 'trigram'
+            elif connection.vendor == 'sqlite':
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [FTS_TABLE])
+                if cursor.fetchone() is not None:
+                    name = 'fts5'
+        _backends[using] = name
+    return _backends[using]
+
+
+def _prefix_pattern(word):
+    """Regex matching `word` at the start of a word"""
+    return r'(^|\W)' + re.escape(word)
+
+
+def search_user_ids(query, limit, using='default'):
+    """Return up to `limit` matching user ids, best match first"""
+    words = terms(query)
+    if not words:
+        return []
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    strategy = backend(using)
+
+    if strategy == 'fts5':
+        match = ' '.join(f'"{word}"*' for word in words)
+        sql = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s'
+        params = [match, limit]
+    elif strategy == 'trigram':
+        document = _document(qn)
+        conditions = ' AND '.join(f'{document} ~ %s' for _ in words)
+        sql = (
+            f'SELECT {qn("id")} FROM {qn(User._meta.db_table)} '
+            f'WHERE {conditions} '
+            f'ORDER BY word_similarity(%s, {document}) DESC, {qn("id")} LIMIT %s'
+        )
+        params = [*(_prefix_pattern(word) for word in words), ' '.join(words), limit]
+    else:
+        condition = Q()
+        for word in words:
+            pattern = _prefix_pattern(word)
+            condition &= Q(*[Q(**{f'{column}__iregex': pattern}) for column in SEARCH_COLUMNS], _connector=Q.OR)
+        return list(
+            User.objects.using(using).filter(condition)
+            .order_by('username').values_list('id', flat=True)[:limit]
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
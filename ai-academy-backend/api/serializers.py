@@ -1,11 +1,97 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from . import metrics
 from .models import (
     User, Module, Lesson, Question, Answer,
-    UserProgress, TestResult, AIAgent, AIAgentQuestion, AIAgentQuestionOption
+    UserProgress, TestResult, AIAgent, AIAgentQuestion, AIAgentQuestionOption,
+    UserStats, DepartmentStats, ModuleStats, LeaderboardEntry
 )
 
 
-class UserSerializer(serializers.ModelSerializer):
+def _split(value):
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def _sparse_fields(request):
+    """?fields= of a read request; writes always validate and save every field"""
+    if request.method in SAFE_METHODS and 'fields' in request.query_params:
+        return _split(request.query_params['fields'])
+    return None
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets and on-demand expansions for a top-level serializer.
+
+    - ?fields=id,username returns only the listed fields (GET/HEAD/OPTIONS
+      only: on writes it would drop fields from validation and save())
+    - ?expand=progress,ai_agent adds fields from Meta.expandable_fields;
+      without ?expand, Meta.default_expand (if any) is used
+
+    Each expandable field is {'serializer': <class name in this module>,
+    'many': bool, 'prefetch' or 'select': lookup}; api.queries.expanded()
+    applies the lookups for exactly the expansions that will be rendered.
+    Nested serializers are untouched because they carry no request context.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is not None:
+            if fields is None:
+                fields = _sparse_fields(request)
+            if expand is None:
+                expand = self.requested_expansions(request)
+
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name, spec in expandable.items():
+            if name in (expand or ()) and (not fields or name in fields):
+                serializer_class = globals()[spec['serializer']]
+                self.fields[name] = serializer_class(many=spec.get('many', False), read_only=True)
+
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        with metrics.serializing():
+            return super().to_representation(instance)
+
+    @classmethod
+    def requested_expansions(cls, request):
+        """Expandable field names that a request will actually render"""
+        expandable = getattr(cls.Meta, 'expandable_fields', {})
+        if 'expand' in request.query_params:
+            expand = _split(request.query_params['expand'])
+        else:
+            expand = set(getattr(cls.Meta, 'default_expand', ()))
+        fields = _sparse_fields(request)
+        if fields is not None:
+            expand &= fields
+        return {name for name in expand if name in expandable}
+
+
+USER_EXPANDABLE_FIELDS = {
+    'progress': {
+        'serializer': 'UserProgressSerializer', 'many': True,
+        'prefetch': Prefetch('progress', queryset=UserProgress.objects.select_related('module')),
+    },
+    'test_results': {
+        'serializer': 'TestResultSerializer', 'many': True,
+        'prefetch': Prefetch('test_results', queryset=TestResult.objects.select_related('module', 'lesson')),
+    },
+    'ai_agent': {
+        'serializer': 'AIAgentSerializer',
+        'select': 'ai_agent',
+    },
+}
+
+
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
 
     class Meta:
@@ -16,6 +102,7 @@ class UserSerializer(serializers.ModelSerializer):
             'created_at', 'password'
         ]
         read_only_fields = ['id', 'created_at', 'last_activity']
+        expandable_fields = USER_EXPANDABLE_FIELDS
 
     def create(self, validated_data):
         password = validated_data.pop('password', None)
@@ -37,21 +124,22 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class AnswerSerializer(serializers.ModelSerializer):
+class AnswerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # is_correct is not exposed: tests are graded server-side (api.grading)
     class Meta:
         model = Answer
-        fields = ['id', 'answer_text', 'is_correct', 'order']
+        fields = ['id', 'answer_text', 'order']
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     answers = AnswerSerializer(many=True, read_only=True)
 
     class Meta:
         model = Question
-        fields = ['id', 'question_text', 'question_type', 'order', 'answers']
+        fields = ['id', 'lesson', 'question_text', 'question_type', 'order', 'answers']
 
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     questions = QuestionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -62,8 +150,16 @@ class LessonSerializer(serializers.ModelSerializer):
         ]
 
 
-class ModuleSerializer(serializers.ModelSerializer):
-    lessons = LessonSerializer(many=True, read_only=True)
+class LessonSummarySerializer(serializers.ModelSerializer):
+    """Lesson metadata for the catalog; the text comes from /api/lessons/{id}/body/
+    and the questions from the module's questions (grouped by their lesson id)"""
+    class Meta:
+        model = Lesson
+        fields = ['id', 'title', 'video_url', 'video_title', 'video_channel', 'video_duration', 'order']
+
+
+class ModuleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    lessons = LessonSummarySerializer(many=True, read_only=True)
     questions = QuestionSerializer(many=True, read_only=True)
     lesson_count = serializers.SerializerMethodField()
 
@@ -75,10 +171,13 @@ class ModuleSerializer(serializers.ModelSerializer):
         ]
 
     def get_lesson_count(self, obj):
+        # Annotated by api.queries.modules(); fall back for bare instances
+        if hasattr(obj, 'lesson_count'):
+            return obj.lesson_count
         return obj.lessons.count()
 
 
-class UserProgressSerializer(serializers.ModelSerializer):
+class UserProgressSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     module_title = serializers.CharField(source='module.title', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
 
@@ -91,7 +190,7 @@ class UserProgressSerializer(serializers.ModelSerializer):
         ]
 
 
-class TestResultSerializer(serializers.ModelSerializer):
+class TestResultSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     module_title = serializers.CharField(source='module.title', read_only=True)
     lesson_title = serializers.CharField(source='lesson.title', read_only=True, allow_null=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
@@ -100,11 +199,13 @@ class TestResultSerializer(serializers.ModelSerializer):
         model = TestResult
         fields = [
             'id', 'user', 'user_name', 'module', 'module_title',
-            'lesson', 'lesson_title', 'score', 'passed', 'completed_at'
+            'lesson', 'lesson_title', 'score', 'passed', 'attempts',
+            'best_score', 'completed_at'
         ]
+        read_only_fields = ['attempts', 'best_score']
 
 
-class AIAgentSerializer(serializers.ModelSerializer):
+class AIAgentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.username', read_only=True)
 
     class Meta:
@@ -117,13 +218,13 @@ class AIAgentSerializer(serializers.ModelSerializer):
         ]
 
 
-class AIAgentQuestionOptionSerializer(serializers.ModelSerializer):
+class AIAgentQuestionOptionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AIAgentQuestionOption
         fields = ['id', 'option_text', 'order']
 
 
-class AIAgentQuestionSerializer(serializers.ModelSerializer):
+class AIAgentQuestionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     options = AIAgentQuestionOptionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -131,16 +232,183 @@ class AIAgentQuestionSerializer(serializers.ModelSerializer):
         fields = ['id', 'question_id', 'question_text', 'order', 'options']
 
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class UserDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Detailed serializer with all user data including progress and test results"""
-    progress = UserProgressSerializer(many=True, read_only=True)
-    test_results = TestResultSerializer(many=True, read_only=True)
-    ai_agent = AIAgentSerializer(read_only=True)
 
     class Meta:
         model = User
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name',
             'department', 'role', 'time_spent', 'last_activity',
-            'created_at', 'progress', 'test_results', 'ai_agent'
+            'created_at'
+        ]
+        expandable_fields = USER_EXPANDABLE_FIELDS
+        default_expand = ['progress', 'test_results', 'ai_agent']
+
+
+class ProgressDeltaSerializer(serializers.Serializer):
+    """One item of a bulk progress upsert; omitted counters are left untouched"""
+    user_id = serializers.IntegerField()
+    module_id = serializers.IntegerField()
+    started = serializers.BooleanField(required=False)
+    viewed_lessons = serializers.IntegerField(required=False, min_value=0)
+    completed_lessons = serializers.IntegerField(required=False, min_value=0)
+    total_lessons = serializers.IntegerField(required=False, min_value=0)
+
+
+class UserStatsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    average_score = serializers.FloatField(read_only=True)
+    pass_rate = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = UserStats
+        fields = [
+            'user', 'department', 'results_count', 'passed_count',
+            'average_score', 'pass_rate', 'modules_started',
+            'modules_completed', 'time_spent', 'updated_at'
+        ]
+
+
+class DepartmentStatsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    average_score = serializers.FloatField(read_only=True)
+    pass_rate = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = DepartmentStats
+        fields = [
+            'department', 'users_count', 'results_count', 'passed_count',
+            'average_score', 'pass_rate', 'modules_completed',
+            'time_spent', 'updated_at'
+        ]
+
+
+class ModuleStatsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    module_title = serializers.CharField(source='module.title', read_only=True)
+    average_score = serializers.FloatField(read_only=True)
+    pass_rate = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ModuleStats
+        fields = [
+            'module', 'module_title', 'results_count', 'passed_count',
+            'average_score', 'pass_rate', 'learners_started',
+            'learners_completed', 'updated_at'
+        ]
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    rank = serializers.IntegerField(read_only=True)
+    user_name = serializers.CharField(source='user.username', read_only=True)
+    full_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    department = serializers.CharField(source='user.department', read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['rank', 'user', 'user_name', 'full_name', 'department', 'score', 'completed', 'passed', 'updated_at']
+
+
+class TestSubmissionSerializer(serializers.Serializer):
+    """Answers chosen in a test: {"answers": {"<question_id>": [<answer_id>, ...]}}"""
+    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    module = serializers.PrimaryKeyRelatedField(queryset=Module.objects.all())
+    lesson = serializers.PrimaryKeyRelatedField(queryset=Lesson.objects.all(), required=False, allow_null=True)
+    answers = serializers.DictField(child=serializers.ListField(child=serializers.IntegerField()))
+
+    def validate_answers(self, value):
+        try:
+            return {int(question_id): answer_ids for question_id, answer_ids in value.items()}
+        except ValueError:
+            raise serializers.ValidationError('Keys must be question ids')
+
+    def validate(self, attrs):
+        lesson = attrs.get('lesson')
+        if lesson is not None and lesson.module_id != attrs['module'].pk:
+            raise serializers.ValidationError({'lesson': 'Lesson does not belong to this module'})
+        return attrs
+
+
+class ProvisionUserSerializer(serializers.ModelSerializer):
+    """One roster row; uniqueness is checked for the whole roster at once (api.provisioning)"""
+    password = serializers.CharField(write_only=True, required=False, allow_blank=True)
+
+    class Meta:
+        model = User
+        fields = ['username', 'email', 'first_name', 'last_name', 'department', 'role', 'password']
+        extra_kwargs = {
+            'username': {'validators': [User.username_validator]},
+            'email': {'validators': []},
+        }
+
+
+class LessonEventSerializer(serializers.Serializer):
+    """A lesson view or completion reported by the client"""
+    user_id = serializers.IntegerField()
+    lesson_id = serializers.IntegerField()
+    event = serializers.ChoiceField(choices=['view', 'complete'], default='view')
+
+
+class HeartbeatSerializer(serializers.Serializer):
+    """Minutes of activity reported by the client since its last heartbeat"""
+    minutes = serializers.IntegerField(min_value=0, max_value=60, default=1)
+
+
+def _unique_orders(items, name):
+    orders = [item.get('order', 0) for item in items]
+    duplicates = sorted({order for order in orders if orders.count(order) > 1})
+    if duplicates:
+        raise serializers.ValidationError(f'duplicate {name} order values: {duplicates}')
+    return items
+
+
+class ContentAnswerSerializer(serializers.ModelSerializer):
+    """Answer in a content import/export document (includes is_correct)"""
+    class Meta:
+        model = Answer
+        fields = ['answer_text', 'is_correct', 'order']
+
+
+class ContentQuestionSerializer(serializers.ModelSerializer):
+    answers = ContentAnswerSerializer(many=True, required=False)
+
+    class Meta:
+        model = Question
+        fields = ['question_text', 'question_type', 'order', 'answers']
+
+    def validate_answers(self, value):
+        return _unique_orders(value, 'answer')
+
+
+class ContentLessonSerializer(serializers.ModelSerializer):
+    questions = ContentQuestionSerializer(many=True, required=False)
+
+    class Meta:
+        model = Lesson
+        fields = [
+            'title', 'content', 'video_url', 'video_title',
+            'video_channel', 'video_duration', 'order', 'questions'
         ]
+
+    def validate_questions(self, value):
+        return _unique_orders(value, 'question')
+
+
+class ContentModuleSerializer(serializers.ModelSerializer):
+    """
+    One module tree of a content document. Lessons, questions and answers
+    are identified by their order among siblings; the module by id, or by
+    title when no id is given. `questions` holds the module-final questions
+    (those without a lesson).
+    """
+    id = serializers.IntegerField(required=False)
+    lessons = ContentLessonSerializer(many=True, required=False)
+    questions = ContentQuestionSerializer(many=True, required=False, source='final_questions')
+
+    class Meta:
+        model = Module
+        fields = ['id', 'title', 'description', 'icon', 'duration', 'order', 'is_active', 'lessons', 'questions']
+
+    def validate_lessons(self, value):
+        return _unique_orders(value, 'lesson')
+
+    def validate_questions(self, value):
+        return _unique_orders(value, 'question')
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, post_migrate
+from django.dispatch import receiver
+from . import analytics, caching, leaderboards, lesson_bodies, metrics, progress, search
+from .models import User, Lesson, UserProgress, TestResult
+
+_content_muted = ContextVar('content_invalidation_muted', default=False)
+
+
+@contextmanager
+def content_invalidation_muted():
+    """Skip per-row content cache invalidation; the caller invalidates once afterwards"""
+    token = _content_muted.set(True)
+    try:
+        yield
+    finally:
+        _content_muted.reset(token)
+
+
+@receiver(pre_save, sender=Lesson)
+def remember_lesson_module(sender, instance, raw=False, **kwargs):
+    """Note the stored module of an edited lesson, to catch moves between modules"""
+    if instance.pk and not raw:
+        instance._stored_module_id = (
+            Lesson.objects.filter(pk=instance.pk).values_list('module_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Lesson)
+def sync_total_lessons_on_save(sender, instance, created, raw=False, **kwargs):
+    """Recompute total_lessons for modules that gained (or, on a move, lost) a lesson"""
+    stored = getattr(instance, '_stored_module_id', None)
+    if raw or _content_muted.get() or not (created or stored not in (None, instance.module_id)):
+        return
+    progress.sync_total_lessons({instance.module_id, stored} - {None})
+
+
+@receiver(post_delete, sender=Lesson)
+def sync_total_lessons_on_delete(sender, instance, **kwargs):
+    if not _content_muted.get():
+        progress.sync_total_lessons([instance.module_id])
+
+
+@receiver(post_save, sender=Lesson)
+def render_lesson_body(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Pre-render and compress the lesson body served by /api/lessons/{id}/body/"""
+    if not raw and (update_fields is None or 'content' in update_fields):
+        lesson_bodies.store([instance])
+
+
+@receiver(pre_delete, sender=Lesson)
+def retract_lesson_progress(sender, instance, **kwargs):
+    """Drop a deleted lesson's views and completions from the learners' counters"""
+    progress.retract_lesson(instance)
+
+
+@receiver(post_migrate)
+def install_search_index(sender, using='default', **kwargs):
+    """(Re)create the user search index once the api tables exist"""
+    if sender.name == 'api':
+        search.install(using)
+
+
+@receiver([post_save, post_delete], sender=UserProgress)
+@receiver([post_save, post_delete], sender=TestResult)
+def refresh_learning_analytics(sender, instance, **kwargs):
+    """Refresh the rollups of the user a progress or result row belongs to"""
+    analytics.schedule(user_ids=[instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=TestResult)
+def refresh_leaderboards(sender, instance, **kwargs):
+    """Re-rank the user whose test result changed"""
+    leaderboards.schedule([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+def refresh_user_analytics(sender, instance, raw=False, **kwargs):
+    if not raw:
+        analytics.schedule(user_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=User)
+def retract_user_analytics(sender, instance, **kwargs):
+    """Read the user's rollup before it is cascaded away, to subtract it from the department"""
+    analytics.retract_user(instance.pk)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """Time every query for the per-endpoint metrics"""
+    metrics.instrument(connection)
+
+
+@receiver([post_save, post_delete])
+def invalidate_cached_responses(sender, **kwargs):
+    """Start a new cache version for the namespace of any saved/deleted api model"""
+    namespace = caching.namespace_for(sender)
+    if namespace is not None and not (namespace == 'content' and _content_muted.get()):
+        caching.invalidate(namespace)
@@ -0,0 +1,193 @@
+"""
+In-memory stand-in for a Redis server, for tests of the shared-cache paths.
+
+FakeRedisCache is Django's RedisCache whose client talks to a FakeRedis
+object instead of a connection pool, so the redis package and a running
+server are not needed. Caches with the same LOCATION share one FakeRedis,
+as all workers share one Redis in production.
+"""
+import threading
+import time
+
+from django.core.cache.backends.redis import RedisCache, RedisCacheClient, RedisSerializer
+
+_servers = {}
+
+
+def server(location):
+    """The FakeRedis behind every cache configured with this LOCATION"""
+    return _servers.setdefault(location, FakeRedis())
+
+
+class FakeRedis:
+    """The commands RedisCacheClient sends, with Redis' value encoding and expiry"""
+
+    def __init__(self):
+        self._data = {}  # key -> (bytes, or {member: score} for a sorted set, expires at or None)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode('utf-8')
+
+    def _get(self, key):
+        value, expires = self._data.get(key, (None, None))
+        if expires is not None and expires <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+    def _expires(self, seconds):
+        return None if seconds is None else time.time() + seconds
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def mget(self, keys):
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._get(key) is not None:
+                return None
+            self._data[key] = (self._encode(value), self._expires(ex))
+            return True
+
+    def mset(self, mapping):
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (self._encode(value), None)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            found = [key for key in keys if self._get(key) is not None]
+            for key in found:
+                del self._data[key]
+            return len(found)
+
+    def exists(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._get(key) is not None)
+
+    def expire(self, key, seconds):
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                return False
+            self._data[key] = (value, self._expires(seconds))
+            return True
+
+    def persist(self, key):
+        return self.expire(key, None)
+
+    def ttl(self, key):
+        """Seconds left, -1 for a key without expiry, -2 for a missing key"""
+        with self._lock:
+            if self._get(key) is None:
+                return -2
+            expires = self._data[key][1]
+            return -1 if expires is None else int(expires - time.time())
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value = int(self._get(key) or 0) + amount
+            self._data[key] = (self._encode(value), self._data.get(key, (None, None))[1])
+            return value
+
+    def rename(self, key, new_key):
+        with self._lock:
+            if self._get(key) is None:
+                raise KeyError('no such key')
+            self._data[new_key] = self._data.pop(key)
+            return True
+
+    def _sorted_set(self, key):
+        members = self._get(key)
+        if members is None:
+            members = {}
+            self._data[key] = (members, None)
+        return members
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            members = self._sorted_set(key)
+            added = sum(1 for member in mapping if self._encode(member) not in members)
+            members.update({self._encode(member): float(score) for member, score in mapping.items()})
+            return added
+
+    def zrem(self, key, *members):
+        with self._lock:
+            stored = self._sorted_set(key)
+            removed = sum(1 for member in members if stored.pop(self._encode(member), None) is not None)
+            if not stored:
+                del self._data[key]
+            return removed
+
+    def zscore(self, key, member):
+        with self._lock:
+            return (self._get(key) or {}).get(self._encode(member))
+
+    def zcount(self, key, low, high):
+        """Members scored within [low, high]; '(' makes a bound exclusive, as in Redis"""
+        def bound(value):
+            value = str(value)
+            return value.startswith('('), float(value.lstrip('('))
+
+        (low_open, low), (high_open, high) = bound(low), bound(high)
+        with self._lock:
+            return sum(
+                1 for score in (self._get(key) or {}).values()
+                if (low < score if low_open else low <= score) and (score < high if high_open else score <= high)
+            )
+
+    def keys(self):
+        with self._lock:
+            return [key for key in list(self._data) if self._get(key) is not None]
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+            return True
+
+    def pipeline(self):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    """Queues commands until execute(), like redis.client.Pipeline"""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        commands, self._commands = self._commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class FakeRedisCacheClient(RedisCacheClient):
+    def __init__(self, servers, **options):
+        self._servers = servers
+        self._serializer = RedisSerializer()
+
+    def get_client(self, key=None, *, write=False):
+        return server(self._servers[0])
+
+
+class FakeRedisCache(RedisCache):
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self._class = FakeRedisCacheClient
@@ -0,0 +1,45 @@
+import importlib.util
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import activity
+from api.models import User
+
+
+def gunicorn_config():
+    path = Path(settings.BASE_DIR) / 'gunicorn.conf.py'
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# No flusher thread: the tests decide when the buffer is written
+@override_settings(ACTIVITY_FLUSH_INTERVAL=3600)
+@mock.patch.object(activity.ActivityBuffer, '_ensure_flusher')
+class ActivityBufferTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='ivan', email='ivan@example.com', time_spent=10)
+
+    def time_spent(self):
+        return User.objects.values_list('time_spent', flat=True).get(pk=self.user.pk)
+
+    def test_buffered_minutes_reach_the_user_on_flush(self, ensure_flusher):
+        buffer = activity.ActivityBuffer()
+        buffer.add(self.user.pk, 5)
+        buffer.add(self.user.pk, 3)
+        self.assertEqual(self.time_spent(), 10)
+
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(self.time_spent(), 18)
+        self.assertEqual(User.objects.get(pk=self.user.pk).last_activity, timezone.localdate())
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_gunicorn_worker_exit_flushes_the_buffer(self, ensure_flusher):
+        activity.buffer.add(self.user.pk, 4)
+        gunicorn_config().worker_exit(mock.Mock(), mock.Mock())
+        self.assertEqual(self.time_spent(), 14)
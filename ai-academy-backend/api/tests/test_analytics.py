@@ -0,0 +1,67 @@
+from django.test import TestCase
+
+from api import analytics, results
+from api.models import DepartmentStats, Module, ModuleStats, User, UserProgress, UserStats
+
+DEPARTMENT_FIELDS = ['users_count', 'results_count', 'score_sum', 'passed_count', 'modules_completed', 'time_spent']
+
+
+def departments():
+    return {row.pop('department'): row for row in DepartmentStats.objects.values('department', *DEPARTMENT_FIELDS)}
+
+
+class IncrementalAnalyticsTests(TestCase):
+    def setUp(self):
+        self.module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.anna = User.objects.create(username='anna', email='anna@example.com', department='IT', time_spent=30)
+            self.boris = User.objects.create(username='boris', email='boris@example.com', department='IT')
+
+    def submit(self, user, score):
+        with self.captureOnCommitCallbacks(execute=True):
+            results.record_final(user.id, self.module.id, score, score >= 70)
+
+    def assertMatchesRebuild(self):
+        incremental = departments()
+        analytics.rebuild()
+        self.assertEqual(incremental, departments())
+
+    def test_writes_move_the_department_totals(self):
+        self.submit(self.anna, 90)
+        self.submit(self.boris, 60)
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProgress.objects.create(
+                user=self.anna, module=self.module, started=True, total_lessons=2, completed_lessons=2,
+            )
+        stats = UserStats.objects.get(user=self.anna)
+        self.assertEqual((stats.average_score, stats.modules_completed, stats.time_spent), (90, 1, 30))
+        self.assertEqual(departments()['IT'], {
+            'users_count': 2, 'results_count': 2, 'score_sum': 150, 'passed_count': 1,
+            'modules_completed': 1, 'time_spent': 30,
+        })
+        self.assertMatchesRebuild()
+
+    def test_department_change_moves_the_user(self):
+        self.submit(self.anna, 90)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.anna.department = 'Sales'
+            self.anna.save()
+        self.assertEqual(departments()['Sales']['score_sum'], 90)
+        self.assertEqual(departments()['IT']['users_count'], 1)
+        self.assertMatchesRebuild()
+
+    def test_deleting_the_last_user_drops_the_department(self):
+        self.submit(self.anna, 90)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.anna.department = 'Sales'
+            self.anna.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.anna.delete()
+        self.assertNotIn('Sales', departments())
+        self.assertMatchesRebuild()
+
+    def test_module_rollups_wait_for_the_periodic_rebuild(self):
+        self.submit(self.anna, 90)
+        self.assertFalse(ModuleStats.objects.exists())
+        self.assertEqual(analytics.rebuild_modules(), 1)
+        self.assertEqual(ModuleStats.objects.get(module=self.module).average_score, 90)
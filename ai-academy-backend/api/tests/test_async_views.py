@@ -0,0 +1,36 @@
+from django.core.cache import caches
+from django.test import TestCase
+
+from api.models import UserProgress, User
+from api.tests.test_queries import create_module
+
+
+class AsyncEndpointTests(TestCase):
+    """The async endpoints return the same bytes as their DRF counterparts"""
+
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        self.module = create_module(1)
+        self.user = User.objects.create(username='ivan', email='ivan@example.com')
+        UserProgress.objects.create(user=self.user, module=self.module, started=True, viewed_lessons=2)
+
+    async def assertSameResponse(self, path, query):
+        sync_response = await self.async_client.get(f'/api/{path}{query}')
+        async_response = await self.async_client.get(f'/api/async/{path}{query}')
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+
+    async def test_same_responses(self):
+        module_id, user_id = self.module.id, self.user.id
+        for path, query in [
+            ('modules/', ''),
+            ('lessons/by_module/', f'?module_id={module_id}'),
+            ('questions/by_module/', f'?module_id={module_id}'),
+            ('questions/by_module/', f'?module_id={module_id}&fields=id,answers'),
+            ('progress/by_user/', f'?user_id={user_id}'),
+            ('progress/by_user/', f'?user_id={user_id}&fields=id,module_title'),
+            ('progress/by_user/', ''),
+        ]:
+            with self.subTest(path=path, query=query):
+                await self.assertSameResponse(path, query)
@@ -0,0 +1,83 @@
+from django.test import TestCase, override_settings
+
+from api import caching
+from api.models import Lesson, Module, User
+from api.tests import fake_redis
+from api.tests.utils import process_caches, redis_caches
+
+REDIS = 'redis://fake-redis:6379/0'
+
+
+def label_stats(label):
+    return caching.stats().get(label, {'hits': 0, 'misses': 0})
+
+
+@override_settings(CACHES=redis_caches(REDIS))
+class SharedResponseCacheTests(TestCase):
+    def setUp(self):
+        self.redis = fake_redis.server(REDIS)
+        self.redis.flushdb()
+        self.module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+        self.lesson = Lesson.objects.create(module=self.module, title='First', content='Text')
+
+    def lessons(self):
+        response = self.client.get(f'/api/lessons/by_module/?module_id={self.module.id}')
+        self.assertEqual(response.status_code, 200)
+        return [lesson['title'] for lesson in response.json()]
+
+    def rename(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lesson.title = title
+            self.lesson.save()
+
+    def test_entries_are_namespaced_and_versioned(self):
+        self.lessons()
+        token, = caching.versions(['content'])
+        keys = self.redis.keys()
+        self.assertIn('istudy:1:api:ns:content', keys)
+        entries = [key for key in keys if key.startswith(f'istudy:1:api:content:{token}:')]
+        self.assertEqual(len(entries), 1)
+        # Tokens in a shared cache never expire; the entries do
+        self.assertEqual(self.redis.ttl('istudy:1:api:ns:content'), -1)
+        self.assertGreater(self.redis.ttl(entries[0]), 0)
+
+    def test_hits_are_served_without_queries(self):
+        before = label_stats('content')
+        self.assertEqual(self.lessons(), ['First'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.lessons(), ['First'])
+        after = label_stats('content')
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    def test_model_signal_bumps_only_its_namespace(self):
+        self.lessons()
+        content, users = caching.versions(['content', 'users'])
+        self.rename('Renamed')
+        self.assertNotEqual(caching.versions(['content']), [content])
+        self.assertEqual(caching.versions(['users']), [users])
+        self.assertEqual(self.lessons(), ['Renamed'])
+
+    def test_bump_waits_for_commit(self):
+        token = caching.versions(['users'])
+        with self.captureOnCommitCallbacks() as callbacks:
+            User.objects.create(username='ivan', email='ivan@example.com')
+            self.assertEqual(caching.versions(['users']), token)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(caching.versions(['users']), token)
+
+
+@override_settings(CACHES=process_caches('responses'))
+class ProcessCacheTests(TestCase):
+    def setUp(self):
+        self.module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+
+    def test_responses_are_not_cached(self):
+        before = caching.stats()
+        url = f'/api/lessons/by_module/?module_id={self.module.id}'
+        self.client.get(url)
+        # Another worker's write would not reach this process' entries, so every request reads the database
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(caching.stats(), before)
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase
+
+from api import catalog
+from api.models import Answer, Lesson, Module, Question
+
+
+def titles(snapshot):
+    return [module['title'] for module in snapshot['modules']]
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        self.module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+
+    def rename(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.module.title = title
+            self.module.save()
+
+    def test_snapshot_is_cached(self):
+        catalog.get_snapshot()
+        with self.assertNumQueries(0):
+            self.assertEqual(titles(catalog.get_snapshot()), ['Intro'])
+
+    def test_content_change_starts_a_new_snapshot(self):
+        self.assertEqual(titles(catalog.get_snapshot()), ['Intro'])
+        self.rename('Basics')
+        self.assertEqual(titles(catalog.get_snapshot()), ['Basics'])
+
+    def test_build_that_races_a_commit_is_not_served(self):
+        build_snapshot = catalog.build_snapshot
+
+        def racing_build():
+            # An edit commits between this reader's version lookup and its cache write
+            snapshot = build_snapshot()
+            self.rename('Basics')
+            return snapshot
+
+        catalog.build_snapshot = racing_build
+        try:
+            self.assertEqual(titles(catalog.get_snapshot()), ['Intro'])
+        finally:
+            catalog.build_snapshot = build_snapshot
+        self.assertEqual(titles(catalog.get_snapshot()), ['Basics'])
+
+    def test_snapshot_expires(self):
+        cache = caches['default']
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            catalog.get_snapshot()
+        key, _, timeout = cache_set.call_args.args
+        self.assertEqual(key, catalog.snapshot_key())
+        self.assertIsNotNone(timeout)
+
+    def test_lesson_questions_are_grouped_by_lesson_id(self):
+        lesson = Lesson.objects.create(module=self.module, title='First', content='Text')
+        quiz = Question.objects.create(module=self.module, lesson=lesson, question_text='Lesson?')
+        final = Question.objects.create(module=self.module, question_text='Final?')
+        Answer.objects.create(question=quiz, answer_text='Yes', is_correct=True)
+
+        module, = catalog.get_snapshot()['modules']
+        self.assertEqual([item['id'] for item in module['lessons']], [lesson.id])
+        self.assertNotIn('content', module['lessons'][0])
+        questions = {item['id']: item for item in module['questions']}
+        self.assertEqual(questions[quiz.id]['lesson'], lesson.id)
+        self.assertIsNone(questions[final.id]['lesson'])
+        self.assertEqual([answer['answer_text'] for answer in questions[quiz.id]['answers']], ['Yes'])
+        self.assertNotIn('is_correct', questions[quiz.id]['answers'][0])
@@ -0,0 +1,87 @@
+import copy
+
+from django.test import TestCase
+
+from api import content
+from api.models import Answer, Lesson, Module, Question, User
+from api.tests.test_queries import create_module
+
+TABLES = ['modules', 'lessons', 'questions', 'answers']
+
+
+class ContentRoundTripTests(TestCase):
+    def setUp(self):
+        self.module = create_module(1, lessons=2, questions=2, answers=3)
+        Module.objects.filter(pk=self.module.pk).update(icon='Brain')
+        final = Question.objects.create(module=self.module, question_text='Итоговый вопрос', order=0)
+        Answer.objects.create(question=final, answer_text='Да', is_correct=True, order=0)
+        self.client.force_login(User.objects.create(username='admin', email='admin@example.com', is_staff=True))
+
+    def export(self, fmt='json'):
+        response = self.client.get(f'/api/content/export/?format={fmt}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def import_document(self, document, query=''):
+        response = self.client.post(f'/api/content/import/{query}', document, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['tables']
+
+    def changes(self, tables):
+        """Non-zero created/updated/deleted counts per table"""
+        return {
+            table: {key: n for key, n in tables[table].items() if key != 'unchanged' and n} for table in TABLES
+        }
+
+    def test_reimporting_an_export_changes_nothing(self):
+        document = self.export().json()
+        self.assertEqual(len(document['modules'][0]['questions']), 1)
+        tables = self.import_document(document)
+        self.assertEqual(self.changes(tables), {table: {} for table in TABLES})
+        self.assertEqual(tables['answers']['unchanged'], 2 * 2 * 3 + 1)
+        self.assertEqual(self.export().json(), document)
+
+    def test_yaml_export_round_trips(self):
+        document = self.export().json()
+        response = self.export('yaml')
+        self.assertEqual(response['Content-Type'], 'application/yaml; charset=utf-8')
+        self.assertIn('Итоговый вопрос', response.content.decode())
+        self.assertEqual(content.loads(response.content.decode(), 'yaml'), document)
+        response = self.client.post(
+            '/api/content/import/', content.dumps(document, 'yaml'), content_type='application/yaml'
+        )
+        self.assertEqual(self.changes(response.json()['tables']), {table: {} for table in TABLES})
+
+    def test_edits_write_only_the_changed_rows(self):
+        document = self.export().json()
+        edited = copy.deepcopy(document)
+        module = edited['modules'][0]
+        module['lessons'][0]['title'] = 'Renamed'
+        del module['lessons'][1]['questions'][0]['answers'][2]
+        module['lessons'].append({'title': 'New', 'content': 'Text', 'order': 5})
+
+        dry_run = self.import_document(edited, '?dry_run=1')
+        self.assertEqual(self.export().json(), document)
+        tables = self.import_document(edited)
+        self.assertEqual(tables, dry_run)
+        self.assertEqual(self.changes(tables), {
+            'modules': {}, 'lessons': {'created': 1, 'updated': 1}, 'questions': {}, 'answers': {'deleted': 1},
+        })
+        exported = self.export().json()['modules'][0]
+        self.assertEqual([lesson['title'] for lesson in exported['lessons']], ['Renamed', 'Lesson 1', 'New'])
+        self.assertEqual(len(exported['lessons'][1]['questions'][0]['answers']), 2)
+
+    def test_modules_without_id_match_by_title(self):
+        document = self.export().json()
+        del document['modules'][0]['id']
+        document['modules'].append({'title': 'Second', 'description': 'About', 'icon': 'Cpu', 'duration': 10})
+        tables = self.import_document(document)
+        self.assertEqual(self.changes(tables)['modules'], {'created': 1})
+        self.assertEqual(Module.objects.count(), 2)
+        self.assertEqual(Lesson.objects.filter(module=self.module).count(), 2)
+
+    def test_unknown_module_id_is_rejected(self):
+        document = {'modules': [{'id': 999, 'title': 'Ghost', 'description': 'About', 'duration': 10}]}
+        response = self.client.post('/api/content/import/', document, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Module 999 does not exist'})
@@ -0,0 +1,67 @@
+import csv
+import json
+
+from django.test import TestCase, override_settings
+
+from api import results
+from api.models import Module, TestResult, User, UserProgress
+from api.serializers import TestResultSerializer, UserProgressSerializer
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.module = Module.objects.create(title='Введение', description='About', icon='book', duration=30)
+        self.anna = User.objects.create(username='anna', email='anna@example.com', department='IT')
+        self.boris = User.objects.create(username='boris', email='boris@example.com', department='Sales')
+        for user, score in ((self.anna, 90), (self.boris, 40)):
+            results.record_final(user.id, self.module.id, score, score >= 70)
+            UserProgress.objects.create(user=user, module=self.module, started=True, total_lessons=2)
+
+    def export(self, url):
+        self.client.force_login(self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def serialized(self, serializer_class, queryset):
+        return json.loads(json.dumps(serializer_class(queryset.order_by('id'), many=True).data))
+
+    def test_exports_are_staff_only(self):
+        for url in ('/api/export/test-results/', '/api/export/progress/'):
+            self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.anna)
+        self.assertEqual(self.client.get('/api/export/progress/?format=ndjson').status_code, 403)
+
+    def test_format_selects_the_export_not_a_renderer(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/api/export/progress/?format=ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        response = self.client.get('/api/export/progress/?format=xml')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('format must be one of', response.json()['error'])
+
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    def test_csv_columns_match_the_serializer(self):
+        content = self.export('/api/export/test-results/?format=csv')
+        self.assertTrue(content.startswith('\ufeff'))
+        header, *rows = csv.reader(content[1:].splitlines())
+        expected = self.serialized(TestResultSerializer, TestResult.objects.all())
+        self.assertEqual(header, list(expected[0]))
+        self.assertEqual([row[header.index('user_name')] for row in rows], ['anna', 'boris'])
+        self.assertEqual([row[header.index('module_title')] for row in rows], ['Введение'] * 2)
+        self.assertEqual([row[header.index('score')] for row in rows], ['90', '40'])
+
+    def test_ndjson_rows_match_the_serializer(self):
+        content = self.export('/api/export/progress/?format=ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(rows, self.serialized(UserProgressSerializer, UserProgress.objects.all()))
+
+    def test_filters(self):
+        content = self.export('/api/export/test-results/?format=ndjson&department=Sales')
+        self.assertEqual([json.loads(line)['user_name'] for line in content.splitlines()], ['boris'])
+        self.assertEqual(self.export('/api/export/progress/?format=ndjson&date_from=2100-01-01'), '')
+        self.assertEqual(self.client.get('/api/export/progress/?date_to=tomorrow').status_code, 400)
+        self.assertEqual(self.client.get('/api/export/progress/?module=x').status_code, 400)
@@ -0,0 +1,79 @@
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from api import grading
+from api.models import Module, Question, Answer
+from api.tests.utils import process_caches, shared_caches
+
+
+class AnswerKeyTests(TestCase):
+    def setUp(self):
+        module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+        self.module_id = module.id
+        self.question = Question.objects.create(module=module, question_text='Pick one')
+        self.first = Answer.objects.create(question=self.question, answer_text='First', is_correct=True, order=0)
+        self.second = Answer.objects.create(question=self.question, answer_text='Second', order=1)
+        self.memos = {}
+
+    @contextmanager
+    def worker(self, name, caches):
+        """Run as worker process `name`: its own answer-key memo and the given caches"""
+        saved = grading._keys, grading._version
+        grading._keys, grading._version = self.memos.get(name, ({}, None))
+        try:
+            with override_settings(CACHES=caches):
+                yield
+        finally:
+            self.memos[name] = grading._keys, grading._version
+            grading._keys, grading._version = saved
+
+    def submit_second(self):
+        return grading.grade(self.module_id, None, {self.question.id: [self.second.id]})['score']
+
+    def make_second_correct(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.is_correct = False
+            self.first.save()
+            self.second.is_correct = True
+            self.second.save()
+
+    def test_shared_cache_edit_reaches_other_workers(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = shared_caches(location)
+            with self.worker('reader', caches):
+                self.assertEqual(self.submit_second(), 0)
+                self.assertIn(self.module_id, grading._keys)
+            with self.worker('editor', caches):
+                self.make_second_correct()
+            with self.worker('reader', caches):
+                self.assertEqual(self.submit_second(), 100)
+
+    def test_shared_cache_keys_are_reused(self):
+        with tempfile.TemporaryDirectory() as location, self.worker('reader', shared_caches(location)):
+            self.submit_second()
+            with self.assertNumQueries(0):
+                self.submit_second()
+
+    def test_in_process_cache_keys_are_reused(self):
+        with self.worker('reader', process_caches('reader')):
+            self.submit_second()
+            with self.assertNumQueries(0):
+                self.submit_second()
+
+    def test_in_process_cache_edit_reaches_other_workers_once_tokens_expire(self):
+        with self.worker('reader', process_caches('reader')):
+            self.assertEqual(self.submit_second(), 0)
+        with self.worker('editor', process_caches('editor')):
+            self.make_second_correct()
+        # The editor's version bump never reaches the reader's cache...
+        with self.worker('reader', process_caches('reader')):
+            self.assertEqual(self.submit_second(), 0)
+        # ...but the reader's token expires with its cache entries
+        later = time.time() + settings.API_CACHE_TIMEOUT + 1
+        with self.worker('reader', process_caches('reader')), mock.patch('time.time', return_value=later):
+            self.assertEqual(self.submit_second(), 100)
@@ -0,0 +1,94 @@
+from django.test import TestCase, override_settings
+
+from api import leaderboards, results
+from api.models import LeaderboardEntry, Module, User, UserProgress
+from api.tests import fake_redis
+from api.tests.utils import redis_caches
+
+REDIS = 'redis://fake-redis:6379/1'
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+        self.users = [
+            User.objects.create(username=name, email=f'{name}@example.com', department='IT')
+            for name in ('anna', 'boris', 'vera', 'gleb')
+        ]
+
+    def submit(self, user, score):
+        with self.captureOnCommitCallbacks(execute=True):
+            results.record_final(user.id, self.module.id, score, score >= 70)
+
+    def complete(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProgress.objects.create(
+                user=user, module=self.module, started=True, total_lessons=3, completed_lessons=3,
+            )
+
+    def standings(self, board=leaderboards.GLOBAL):
+        return [(entry.user.username, entry.rank) for entry in leaderboards.top(board, 10)]
+
+    def test_ties_share_a_rank(self):
+        for user, score in zip(self.users, (90, 80, 80, 70)):
+            self.submit(user, score)
+        self.assertEqual(self.standings(), [('anna', 1), ('boris', 2), ('vera', 2), ('gleb', 4)])
+        self.assertEqual(
+            [leaderboards.rank_of(leaderboards.GLOBAL, user.id).rank for user in self.users], [1, 2, 2, 4]
+        )
+
+    def test_top_is_limited_and_kept_per_board(self):
+        for user, score in zip(self.users, (90, 80, 60, 70)):
+            self.submit(user, score)
+        self.assertEqual([entry.user.username for entry in leaderboards.top(leaderboards.GLOBAL, 2)], ['anna', 'boris'])
+        for board in (leaderboards.module_board(self.module.id), leaderboards.department_board('IT')):
+            self.assertEqual(self.standings(board), [('anna', 1), ('boris', 2), ('gleb', 3), ('vera', 4)])
+
+    def test_completion_breaks_score_ties(self):
+        anna, boris = self.users[:2]
+        self.submit(anna, 80)
+        self.submit(boris, 80)
+        self.complete(boris)
+        # Progress writes do not re-rank; the next result picks the completion up
+        self.assertEqual(self.standings(), [('anna', 1), ('boris', 1)])
+        self.submit(self.users[2], 50)
+        self.submit(boris, 80)
+        self.assertEqual(self.standings(), [('boris', 1), ('anna', 2), ('vera', 3)])
+        self.assertEqual(LeaderboardEntry.objects.get(board='global', user=boris).completed, 1)
+
+    def test_rebuild_recomputes_every_board(self):
+        for user, score in zip(self.users, (90, 80, 80, 70)):
+            self.submit(user, score)
+        self.complete(self.users[3])
+        expected = self.standings()
+        LeaderboardEntry.objects.all().delete()
+        self.assertEqual(leaderboards.rebuild(), 12)
+        self.assertEqual(self.standings(), expected)
+        self.assertEqual(LeaderboardEntry.objects.get(board='global', user=self.users[3]).completed, 1)
+
+    def test_user_without_results_has_no_rank(self):
+        self.assertIsNone(leaderboards.rank_of(leaderboards.GLOBAL, self.users[0].id))
+
+
+@override_settings(CACHES=redis_caches(REDIS))
+class SortedSetRankTests(LeaderboardTests):
+    def setUp(self):
+        fake_redis.server(REDIS).flushdb()
+        super().setUp()
+
+    def test_rank_comes_from_the_sorted_set_after_rebuild(self):
+        for user, score in zip(self.users, (90, 80, 80, 70)):
+            self.submit(user, score)
+        # Not filled yet: the rank is counted in the table
+        with self.assertNumQueries(2):
+            self.assertEqual(leaderboards.rank_of(leaderboards.GLOBAL, self.users[3].id).rank, 4)
+
+        leaderboards.rebuild()
+        with self.assertNumQueries(1):
+            self.assertEqual(leaderboards.rank_of(leaderboards.GLOBAL, self.users[3].id).rank, 4)
+
+        # Later writes keep the sorted sets in step
+        self.submit(self.users[3], 85)
+        with self.assertNumQueries(2):
+            self.assertEqual(leaderboards.rank_of(leaderboards.GLOBAL, self.users[3].id).rank, 2)
+            self.assertEqual(leaderboards.rank_of(leaderboards.GLOBAL, self.users[1].id).rank, 3)
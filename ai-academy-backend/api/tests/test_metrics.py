@@ -0,0 +1,76 @@
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from api import metrics
+from api.models import Module, User
+
+
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        metrics.registry.reset()
+        for alias in caches:
+            caches[alias].clear()
+        self.users = [
+            User.objects.create(username=f'user{number}', email=f'user{number}@example.com') for number in range(4)
+        ]
+
+    def series(self, labels):
+        return dict(metrics.registry.snapshot())[labels]
+
+    def call(self, view):
+        """Run view through the middleware as an unrouted request"""
+        return metrics.MetricsMiddleware(lambda request: view())(RequestFactory().get('/loop/'))
+
+    def test_requests_are_recorded_per_route_and_action(self):
+        Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+        response = self.client.get('/api/modules/')
+        series = self.series(('module-list', 'list', 'GET'))
+        self.assertEqual(series.count, 1)
+        self.assertEqual(sum(series.buckets), 1)
+        self.assertGreater(series.queries, 0)
+        self.assertGreater(series.serializer_time, 0)
+        self.assertEqual(series.bytes, len(response.content))
+        self.assertEqual(series.n_plus_one, 0)
+
+        self.client.get('/api/modules/')
+        self.assertEqual(self.series(('module-list', 'list', 'GET')).count, 2)
+        text = metrics.render()
+        self.assertIn('api_request_duration_seconds_count{route="module-list",action="list",method="GET"} 2', text)
+        self.assertIn('api_n_plus_one_requests_total{route="module-list",action="list",method="GET"} 0', text)
+
+    @override_settings(METRICS_N_PLUS_ONE_THRESHOLD=3)
+    def test_repeated_query_shape_is_flagged(self):
+        def loop():
+            for user in self.users:
+                User.objects.filter(pk=user.pk).exists()
+            return HttpResponse()
+
+        with self.assertLogs('api.metrics', 'WARNING') as logs:
+            self.call(loop)
+        self.assertIn('N+1 query on GET /loop/', logs.output[0])
+        series = self.series(('<unmatched>', '', 'GET'))
+        self.assertEqual((series.queries, series.n_plus_one), (4, 1))
+
+    @override_settings(METRICS_N_PLUS_ONE_THRESHOLD=2)
+    def test_in_lists_of_any_length_share_a_shape(self):
+        def batches():
+            for size in range(2, 5):
+                list(User.objects.filter(pk__in=[user.pk for user in self.users[:size]]))
+            return HttpResponse()
+
+        with self.assertLogs('api.metrics', 'WARNING'):
+            self.call(batches)
+        self.assertEqual(self.series(('<unmatched>', '', 'GET')).n_plus_one, 1)
+
+
+class MetricsEndpointTests(TestCase):
+    def test_anonymous_scrape_is_refused(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+    def test_staff_can_scrape(self):
+        admin = User.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.client.force_login(admin)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
@@ -0,0 +1,48 @@
+from unittest import mock
+
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APITestCase
+
+from api.models import User
+from api.pagination import UserPagination
+
+
+@mock.patch.object(PageNumberPagination, 'page_size', 2)
+@mock.patch.object(UserPagination, 'page_size', 2)
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create(username=f'user{number}', email=f'user{number}@example.com')
+            for number in range(5)
+        ]
+
+    def walk(self, url):
+        """Usernames of every page from url on, following the next links"""
+        names = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            names += [user['username'] for user in response.data['results']]
+            url = response.data['next']
+        return names
+
+    def test_cursor_pages_cover_every_row_once(self):
+        # Equal timestamps: the id tie-breaker keeps the order total
+        User.objects.update(created_at=timezone.now())
+        self.assertEqual(self.walk('/api/users/'), [f'user{number}' for number in range(4, -1, -1)])
+
+    def test_cursor_is_stable_when_rows_are_added(self):
+        first = self.client.get('/api/users/').data
+        self.assertNotIn('count', first)
+        self.assertEqual([user['username'] for user in first['results']], ['user4', 'user3'])
+        User.objects.create(username='newcomer', email='newcomer@example.com')
+        self.assertEqual(self.walk(first['next']), ['user2', 'user1', 'user0'])
+
+    def test_page_parameter_falls_back_to_page_numbers(self):
+        response = self.client.get('/api/users/?page=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([user['username'] for user in response.data['results']], ['user2', 'user1'])
+        self.assertIn('page=3', response.data['next'])
+        self.assertTrue(response.data['previous'].endswith('/api/users/'))
@@ -0,0 +1,128 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from api.models import Lesson, LessonProgress, Module, User, UserProgress
+
+BULK_URL = '/api/progress/bulk_update_or_create/'
+EVENT_URL = '/api/progress/lesson_event/'
+
+
+class BulkProgressUpsertTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='anna', email='anna@example.com')
+        self.modules = [
+            Module.objects.create(title=f'Module {number}', description='About', duration=30, order=number)
+            for number in range(2)
+        ]
+
+    def upsert(self, items):
+        response = self.client.post(BULK_URL, {'items': items}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def progress(self, module):
+        return UserProgress.objects.values('started', 'viewed_lessons', 'completed_lessons', 'total_lessons').get(
+            user=self.user, module=module
+        )
+
+    def test_creates_and_updates_in_one_batch(self):
+        UserProgress.objects.create(user=self.user, module=self.modules[0], started=True, total_lessons=4)
+        results = self.upsert([
+            {'user_id': self.user.id, 'module_id': self.modules[0].id, 'viewed_lessons': 2},
+            {'user_id': self.user.id, 'module_id': self.modules[1].id, 'started': True, 'total_lessons': 3},
+        ])
+        self.assertEqual([result['status'] for result in results], ['updated', 'created'])
+        # Omitted counters are left untouched
+        self.assertEqual(self.progress(self.modules[0]), {
+            'started': True, 'viewed_lessons': 2, 'completed_lessons': 0, 'total_lessons': 4,
+        })
+        self.assertEqual(self.progress(self.modules[1])['total_lessons'], 3)
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        users = [User.objects.create(username=f'user{n}', email=f'user{n}@example.com') for n in range(10)]
+        items = [
+            {'user_id': user.id, 'module_id': module.id, 'viewed_lessons': 1}
+            for user in users for module in self.modules
+        ]
+        # users, modules, existing rows, then one upsert inside a savepoint
+        with self.assertNumQueries(6):
+            self.upsert(items)
+        self.assertEqual(UserProgress.objects.count(), 20)
+
+    def test_later_items_for_a_pair_win(self):
+        module_id = self.modules[0].id
+        results = self.upsert([
+            {'user_id': self.user.id, 'module_id': module_id, 'viewed_lessons': 1, 'started': True},
+            {'user_id': self.user.id, 'module_id': module_id, 'viewed_lessons': 3},
+        ])
+        self.assertEqual([result['status'] for result in results], ['created', 'created'])
+        self.assertEqual(self.progress(self.modules[0])['viewed_lessons'], 3)
+        self.assertTrue(self.progress(self.modules[0])['started'])
+
+    def test_invalid_items_are_reported_in_place(self):
+        results = self.upsert([
+            {'user_id': self.user.id, 'module_id': 999},
+            {'user_id': self.user.id, 'module_id': self.modules[0].id, 'viewed_lessons': -1},
+            {'user_id': self.user.id, 'module_id': self.modules[1].id, 'viewed_lessons': 1},
+        ])
+        self.assertEqual([result['index'] for result in results], [0, 1, 2])
+        self.assertEqual(results[0]['errors'], {'module_id': ['Module not found']})
+        self.assertIn('viewed_lessons', results[1]['errors'])
+        self.assertEqual(results[2]['status'], 'created')
+        self.assertEqual(UserProgress.objects.count(), 1)
+
+    @override_settings(PROGRESS_BULK_MAX_ITEMS=2)
+    def test_batch_size_is_limited(self):
+        item = {'user_id': self.user.id, 'module_id': self.modules[0].id}
+        response = self.client.post(BULK_URL, {'items': [item] * 3}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post(BULK_URL, {'items': []}, format='json').status_code, 400)
+
+
+class LessonEventTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='anna', email='anna@example.com')
+        self.module = Module.objects.create(title='Intro', description='About', duration=30)
+        self.lessons = [
+            Lesson.objects.create(module=self.module, title=f'Lesson {order}', content='Text', order=order)
+            for order in range(3)
+        ]
+
+    def event(self, lesson, event='view', status=200):
+        response = self.client.post(
+            EVENT_URL, {'user_id': self.user.id, 'lesson_id': lesson.id, 'event': event}, format='json'
+        )
+        self.assertEqual(response.status_code, status)
+        return response.json()
+
+    def counters(self, data):
+        return (data['started'], data['viewed_lessons'], data['completed_lessons'], data['total_lessons'])
+
+    def test_first_event_starts_the_module(self):
+        self.assertEqual(self.counters(self.event(self.lessons[0])), (True, 1, 0, 3))
+
+    def test_each_lesson_counts_once(self):
+        self.event(self.lessons[0])
+        self.event(self.lessons[0])
+        self.event(self.lessons[0], 'complete')
+        data = self.event(self.lessons[0], 'complete')
+        self.assertEqual(self.counters(data), (True, 1, 1, 3))
+        self.assertEqual(self.counters(self.event(self.lessons[1], 'complete')), (True, 2, 2, 3))
+        self.assertEqual(LessonProgress.objects.filter(user=self.user).count(), 2)
+
+    def test_deleting_a_lesson_takes_it_out_of_the_counters(self):
+        self.event(self.lessons[0], 'complete')
+        self.event(self.lessons[1])
+        self.lessons[0].delete()
+        progress = UserProgress.objects.get(user=self.user, module=self.module)
+        self.assertEqual(
+            (progress.viewed_lessons, progress.completed_lessons, progress.total_lessons), (1, 0, 2)
+        )
+
+    def test_unknown_lesson_or_user(self):
+        response = self.client.post(EVENT_URL, {'user_id': self.user.id, 'lesson_id': 999}, format='json')
+        self.assertEqual((response.status_code, response.json()), (404, {'error': 'Lesson not found'}))
+        response = self.client.post(EVENT_URL, {'user_id': 999, 'lesson_id': self.lessons[0].id}, format='json')
+        self.assertEqual((response.status_code, response.json()), (404, {'error': 'User not found'}))
+        self.event(self.lessons[0], 'skip', status=400)
+        self.assertFalse(UserProgress.objects.exists())
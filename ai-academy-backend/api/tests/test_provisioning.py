@@ -0,0 +1,32 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.test import TestCase
+
+from api import provisioning
+
+
+class ProvisioningTests(TestCase):
+    roster = [
+        {'username': 'anna', 'email': 'anna@example.com', 'password': 'Secret-1'},
+        {'username': 'boris', 'email': 'boris@example.com', 'password': 'Secret-2'},
+        {'username': 'vera', 'email': 'vera@example.com'},
+    ]
+
+    def test_provisioned_users_can_log_in(self):
+        # Hashed on a pool of two spawned processes
+        with mock.patch.object(provisioning, 'PARALLEL_MIN_ROWS', 2):
+            outcomes = provisioning.provision(self.roster, workers=2)
+        self.assertEqual([outcome['status'] for outcome in outcomes], ['created'] * 3)
+        self.assertIsNotNone(authenticate(username='anna', password='Secret-1'))
+        self.assertIsNotNone(authenticate(username='boris', password='Secret-2'))
+        self.assertIsNotNone(authenticate(username='vera', password=provisioning.DEFAULT_PASSWORD))
+        self.assertIsNone(authenticate(username='anna', password='Secret-2'))
+
+    def test_duplicates_and_dry_runs_write_nothing(self):
+        roster = self.roster[:1] + [{'username': 'anna', 'email': 'other@example.com'}]
+        outcomes = provisioning.provision(roster, dry_run=True)
+        self.assertEqual([outcome['status'] for outcome in outcomes], ['error', 'error'])
+        outcomes = provisioning.provision(self.roster[:1], dry_run=True)
+        self.assertEqual(outcomes, [{'index': 0, 'status': 'valid', 'username': 'anna'}])
+        self.assertIsNone(authenticate(username='anna', password='Secret-1'))
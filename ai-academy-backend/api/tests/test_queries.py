@@ -0,0 +1,93 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from rest_framework.test import APITestCase
+
+from api.management.commands import explain_queries
+from api.models import Module, Lesson, Question, Answer, User
+
+
+def create_module(number, lessons=3, questions=2, answers=3):
+    module = Module.objects.create(
+        title=f'Module {number}', description='About', icon='book', duration=30, order=number
+    )
+    for lesson_order in range(lessons):
+        lesson = Lesson.objects.create(module=module, title=f'Lesson {lesson_order}', content='Text', order=lesson_order)
+        for question_order in range(questions):
+            question = Question.objects.create(
+                module=module, lesson=lesson, question_text=f'Question {question_order}', order=question_order
+            )
+            Answer.objects.bulk_create(
+                Answer(question=question, answer_text=f'Answer {order}', is_correct=order == 0, order=order)
+                for order in range(answers)
+            )
+    return module
+
+
+class ContentQueryBudgetTests(APITestCase):
+    """List and retrieve actions of the content viewsets run a fixed number of queries"""
+
+    def setUp(self):
+        self.modules = [create_module(number) for number in range(2)]
+
+    def budgets(self):
+        """{url: queries}; paginated lists add a COUNT, the module list paginates its snapshot"""
+        module = self.modules[0]
+        lesson = module.lessons.first()
+        question = module.questions.first()
+        return {
+            # modules, lessons, questions, answers
+            '/api/modules/': 4,
+            f'/api/modules/{module.id}/': 4,
+            '/api/modules/all_with_inactive/': 4,
+            # lessons, questions, answers
+            '/api/lessons/': 4,
+            f'/api/lessons/{lesson.id}/': 3,
+            f'/api/lessons/by_module/?module_id={module.id}': 3,
+            # questions, answers
+            '/api/questions/': 3,
+            f'/api/questions/{question.id}/': 2,
+            f'/api/questions/by_module/?module_id={module.id}': 2,
+        }
+
+    def assertBudgets(self):
+        for url, queries in self.budgets().items():
+            with self.subTest(url=url):
+                for alias in caches:
+                    caches[alias].clear()
+                with self.assertNumQueries(queries):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_query_budget(self):
+        self.assertBudgets()
+
+    def test_query_budget_does_not_grow_with_content(self):
+        for number in range(2, 6):
+            create_module(number, lessons=5, questions=4)
+        self.assertBudgets()
+
+
+class ExplainQueriesTests(APITestCase):
+    """The viewsets' canonical queries are served by indexes"""
+
+    def explain(self, *args):
+        out = StringIO()
+        call_command('explain_queries', *args, stdout=out)
+        return out.getvalue()
+
+    def test_every_query_uses_an_index(self):
+        create_module(0)
+        User.objects.create(username='anna', email='anna@example.com', department='IT')
+        output = self.explain()
+        for label in explain_queries.QUERIES:
+            self.assertIn(f'{label}: ok', output)
+        self.assertIn('All queries use indexes.', output)
+
+    def test_sequential_scan_is_an_error(self):
+        queries = {'users.by_name': lambda p: User.objects.filter(first_name='Anna').order_by()}
+        with mock.patch.object(explain_queries, 'QUERIES', queries):
+            with self.assertRaisesMessage(CommandError, '1 queries use sequential scans: users.by_name'):
+                self.explain()
@@ -0,0 +1,64 @@
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from api import questionnaire
+from api.models import AIAgentQuestion
+from api.tests.utils import process_caches, shared_caches
+
+
+class QuestionnaireTests(TestCase):
+    def setUp(self):
+        self.question = AIAgentQuestion.objects.create(question_id=1, question_text='What do you do?')
+        self.snapshots = {}
+
+    @contextmanager
+    def worker(self, name, caches):
+        """Run as worker process `name`: its own in-memory snapshot and the given caches"""
+        saved = questionnaire._snapshot
+        questionnaire._snapshot = self.snapshots.get(name, (None, None, None))
+        try:
+            with override_settings(CACHES=caches):
+                yield
+        finally:
+            self.snapshots[name] = questionnaire._snapshot
+            questionnaire._snapshot = saved
+
+    def rename(self, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.question_text = text
+            self.question.save()
+
+    def test_shared_cache_edit_reaches_other_workers(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = shared_caches(location)
+            with self.worker('reader', caches):
+                body, version = questionnaire.get()
+                self.assertIn(b'What do you do?', body)
+                with self.assertNumQueries(0):
+                    self.assertEqual(questionnaire.get(), (body, version))
+            with self.worker('editor', caches):
+                self.rename('What is your role?')
+            with self.worker('reader', caches):
+                new_body, new_version = questionnaire.get()
+        self.assertIn(b'What is your role?', new_body)
+        self.assertNotEqual(new_version, version)
+
+    @override_settings(API_CACHE_TIMEOUT=60)
+    def test_in_process_cache_staleness_is_bounded(self):
+        with self.worker('reader', process_caches('reader')):
+            body, version = questionnaire.get()
+            self.assertEqual(questionnaire._snapshot, (None, None, None))
+        with self.worker('editor', process_caches('editor')):
+            self.rename('What is your role?')
+        with self.worker('reader', process_caches('reader')):
+            # The reader's cache never sees the editor's new token, only its entry expiring
+            self.assertEqual(questionnaire.get(), (body, version))
+            with mock.patch('django.core.cache.backends.locmem.time') as clock:
+                clock.time.return_value = time.time() + 61
+                new_body, new_version = questionnaire.get()
+        self.assertIn(b'What is your role?', new_body)
+        self.assertNotEqual(new_version, version)
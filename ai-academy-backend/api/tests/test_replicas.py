@@ -0,0 +1,92 @@
+from django.core.cache import caches
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Module, User, UserProgress
+
+REPLICA = 'replica1'
+
+
+def tables(queries):
+    return ' '.join(query['sql'] for query in queries)
+
+
+# Mirrors only share committed data, hence TransactionTestCase
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # A replica configured the way settings_prod configures DATABASE_REPLICA_URLS: a TEST
+        # MIRROR of 'default', here copied from the already created test database's settings.
+        # connections.settings is settings.DATABASES itself, so tearDownClass removes it again.
+        default = connections['default'].settings_dict
+        connections.settings[REPLICA] = {**default, 'TEST': {**default['TEST'], 'MIRROR': 'default'}}
+        # Set here rather than on the class: the runner checks the declared aliases up front
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            connections[REPLICA].close()
+            del connections[REPLICA]
+            del connections.settings[REPLICA]
+
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        self.user = User.objects.create(username='ivan', email='ivan@example.com')
+        self.module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+        UserProgress.objects.create(user=self.user, module=self.module, started=True)
+
+    def request(self, method, path, data=None, **extra):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(self.client, method)(path, data, content_type='application/json', **extra)
+        self.assertLess(response.status_code, 300, response.content)
+        return response, primary.captured_queries, replica.captured_queries
+
+    def by_user(self, **extra):
+        return self.request('get', f'/api/progress/by_user/?user_id={self.user.id}', **extra)
+
+    def update(self):
+        return self.request('post', '/api/progress/update_or_create/', {
+            'user_id': self.user.id, 'module_id': self.module.id, 'completed_lessons': 2,
+        })
+
+    def test_safe_reads_go_to_the_replica(self):
+        response, primary, replica = self.by_user()
+        self.assertEqual(len(response.json()), 1)
+        self.assertIn('user_progress', tables(replica))
+        self.assertNotIn('user_progress', tables(primary))
+
+    def test_writes_go_to_the_primary(self):
+        _, primary, replica = self.update()
+        self.assertIn('UPDATE', tables(primary))
+        self.assertEqual(replica, [])
+
+    def test_client_reads_its_writes_from_the_primary(self):
+        self.update()
+        response, primary, replica = self.by_user()
+        self.assertEqual(response.json()[0]['completed_lessons'], 2)
+        self.assertIn('user_progress', tables(primary))
+        self.assertEqual(replica, [])
+
+        # Other clients keep reading from the replica
+        _, primary, replica = self.by_user(REMOTE_ADDR='10.0.0.2')
+        self.assertIn('user_progress', tables(replica))
+        self.assertNotIn('user_progress', tables(primary))
+
+    def test_pin_expires(self):
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            self.update()
+        _, _, replica = self.by_user()
+        self.assertIn('user_progress', tables(replica))
+
+    def test_reads_outside_requests_use_the_primary(self):
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            self.assertEqual(UserProgress.objects.count(), 1)
+        self.assertEqual(replica.captured_queries, [])
@@ -0,0 +1,69 @@
+import threading
+from unittest import mock, skipIf
+
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from api import results
+from api.models import Module, TestResult, User
+
+
+def create_user_and_module():
+    user = User.objects.create(username='ivan', email='ivan@example.com')
+    module = Module.objects.create(title='Intro', description='About', icon='book', duration=30)
+    return user, module
+
+
+class RecordLockedTests(TestCase):
+    def setUp(self):
+        self.user, self.module = create_user_and_module()
+
+    def test_insert_race_is_retried_as_an_update(self):
+        existing = TestResult.objects.create(user=self.user, module=self.module, score=40, best_score=40)
+        # The row appears between the locking read and the insert
+        with mock.patch.object(results, '_locked_final', side_effect=[None, existing]):
+            results._record_locked(self.user.id, self.module.id, 90, True, timezone.now(), 'latest')
+        row = TestResult.objects.get(user=self.user, module=self.module, lesson__isnull=True)
+        self.assertEqual((row.score, row.passed, row.attempts, row.best_score), (90, True, 2, 90))
+
+
+@skipIf(connection.vendor == 'sqlite', 'SQLite serializes writers with database locks')
+class ConcurrentSubmissionTests(TransactionTestCase):
+    THREADS = 8
+
+    def setUp(self):
+        self.user, self.module = create_user_and_module()
+
+    def submit_in_parallel(self, record):
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def submit(score):
+            try:
+                barrier.wait()
+                record(self.user.id, self.module.id, score, score >= 70)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=submit, args=(score * 10,)) for score in range(1, self.THREADS + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        rows = TestResult.objects.filter(user=self.user, module=self.module, lesson__isnull=True)
+        self.assertEqual(rows.count(), 1)
+        self.assertEqual(rows.get().attempts, self.THREADS)
+        self.assertEqual(rows.get().best_score, self.THREADS * 10)
+
+    def test_upsert(self):
+        self.submit_in_parallel(results.record_final)
+
+    def test_locked_fallback(self):
+        def record(user_id, module_id, score, passed):
+            results._record_locked(user_id, module_id, score, passed, timezone.now(), 'latest')
+
+        self.submit_in_parallel(record)
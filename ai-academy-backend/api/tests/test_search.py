@@ -0,0 +1,44 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from api import search
+from api.models import User
+
+
+class PrefixSearchTests(TestCase):
+    def setUp(self):
+        self.anna = User.objects.create(
+            username='anna.k', email='anna@example.com', first_name='Anna', last_name='Karimova', department='Sales'
+        )
+        self.joanna = User.objects.create(
+            username='joanna', email='joanna@example.com', first_name='Joanna', last_name='Smith', department='Marketing'
+        )
+        self.ivan = User.objects.create(
+            username='ivan', email='ivan@example.com', first_name='Ivan', last_name='Petrov', department='IT Support'
+        )
+
+    def assertMatches(self, query, users):
+        self.assertEqual(set(search.search_user_ids(query, limit=10)), {user.id for user in users})
+
+    def assertPrefixSemantics(self):
+        self.assertMatches('ann', [self.anna])
+        self.assertMatches('jo', [self.joanna])
+        self.assertMatches('petr', [self.ivan])
+        self.assertMatches('supp', [self.ivan])
+        self.assertMatches('ivan it', [self.ivan])
+        self.assertMatches('trov', [])
+        self.assertMatches('example', [self.anna, self.joanna, self.ivan])
+
+    def test_index_matches_word_prefixes(self):
+        self.assertNotEqual(search.backend(), 'scan')
+        self.assertPrefixSemantics()
+
+    def test_scan_matches_word_prefixes(self):
+        with mock.patch.dict(search._backends, {'default': 'scan'}):
+            self.assertPrefixSemantics()
+
+    def test_endpoint(self):
+        response = self.client.get('/api/users/search/?q=ann')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([user['id'] for user in response.json()['results']], [self.anna.id])
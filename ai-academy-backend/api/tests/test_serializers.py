@@ -0,0 +1,76 @@
+import json
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from api import compiled
+from api.benchmark import dataset
+from api.benchmark import serializers as serializer_benchmark
+from api.models import Lesson, Module, TestResult, User
+from api.serializers import TestResultSerializer
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='ivan', email='ivan@example.com', department='IT')
+
+    def test_fields_prune_reads(self):
+        response = self.client.get(f'/api/users/{self.user.id}/?fields=id,username')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {'id', 'username'})
+
+    def test_fields_do_not_drop_written_fields(self):
+        response = self.client.patch(
+            f'/api/users/{self.user.id}/?fields=id', {'department': 'Sales', 'first_name': 'Ivan'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['department'], 'Sales')
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.department, self.user.first_name), ('Sales', 'Ivan'))
+
+
+class CompiledSerializerTests(APITestCase):
+    """Compiled plans render exactly what the DRF serializers render"""
+
+    def setUp(self):
+        dataset.seed(users=6, modules=2, lessons=2, questions=2, answers=3)
+        # A lesson result: lesson_title is set, unlike the module-final results
+        user, lesson = User.objects.first(), Lesson.objects.first()
+        TestResult.objects.create(user=user, module=lesson.module, lesson=lesson, score=55, passed=False)
+        self.user = user
+
+    def test_every_target_is_byte_identical(self):
+        for name, result in serializer_benchmark.run(repeat=1).items():
+            with self.subTest(serializer=name):
+                self.assertTrue(result['identical'])
+                self.assertGreater(result['rows'], 0)
+
+    def test_sparse_fieldsets_compile_to_the_same_fields(self):
+        plan = compiled.plan_for(TestResultSerializer, ['id', 'score', 'lesson_title'])
+        queryset = TestResult.objects.filter(user=self.user).order_by('id')
+        expected = [
+            {name: row[name] for name in ('id', 'score', 'lesson_title')}
+            for row in TestResultSerializer(queryset, many=True).data
+        ]
+        self.assertEqual(plan.rows(plan.queryset(queryset)), expected)
+
+    def test_list_endpoint_matches_the_regular_serializer(self):
+        response = self.client.get(f'/api/test-results/by_user/?user_id={self.user.id}')
+        self.assertEqual(response.status_code, 200)
+        queryset = TestResult.objects.filter(user=self.user).select_related('user', 'module', 'lesson')
+        self.assertEqual(response.content, JSONRenderer().render(TestResultSerializer(queryset, many=True).data))
+        self.assertIn('lesson_title', json.loads(response.content)[0])
+
+    def test_uncompilable_serializers_fall_back(self):
+        class ModuleSummary(serializers.ModelSerializer):
+            lesson_count = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Module
+                fields = ['id', 'lesson_count']
+
+            def get_lesson_count(self, module):
+                return module.lessons.count()
+
+        self.assertIsNone(compiled.plan_for(ModuleSummary))
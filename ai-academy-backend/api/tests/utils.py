@@ -0,0 +1,16 @@
+"""Cache configurations that stand in for separate worker processes"""
+
+
+def shared_caches(location):
+    """One cache every simulated worker sees, like Redis in production"""
+    return {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+
+
+def process_caches(worker):
+    """The in-process cache of one simulated worker"""
+    return {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'worker-{worker}'}}
+
+
+def redis_caches(location):
+    """A Redis cache every simulated worker sees (in memory, api.tests.fake_redis)"""
+    return {'default': {'BACKEND': 'api.tests.fake_redis.FakeRedisCache', 'LOCATION': location, 'KEY_PREFIX': 'istudy'}}
@@ -1,8 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
+from .export import export_test_results, export_progress
+from .metrics import metrics_view
 from .views import (
     UserViewSet, ModuleViewSet, LessonViewSet, QuestionViewSet,
-    UserProgressViewSet, TestResultViewSet, AIAgentViewSet, AIAgentQuestionViewSet
+    UserProgressViewSet, TestResultViewSet, AIAgentViewSet, AIAgentQuestionViewSet,
+    UserStatsViewSet, DepartmentStatsViewSet, ModuleStatsViewSet, LeaderboardViewSet, MeViewSet, ContentViewSet
 )
 
 router = DefaultRouter()
@@ -14,7 +18,20 @@ router.register(r'progress', UserProgressViewSet, basename='progress')
 router.register(r'test-results', TestResultViewSet, basename='testresult')
 router.register(r'ai-agents', AIAgentViewSet, basename='aiagent')
 router.register(r'ai-agent-questions', AIAgentQuestionViewSet, basename='aiagentquestion')
+router.register(r'analytics/users', UserStatsViewSet, basename='analytics-user')
+router.register(r'analytics/departments', DepartmentStatsViewSet, basename='analytics-department')
+router.register(r'analytics/modules', ModuleStatsViewSet, basename='analytics-module')
+router.register(r'leaderboards', LeaderboardViewSet, basename='leaderboard')
+router.register(r'me', MeViewSet, basename='me')
+router.register(r'content', ContentViewSet, basename='content')
 
 urlpatterns = [
+    path('export/test-results/', export_test_results, name='export-test-results'),
+    path('export/progress/', export_progress, name='export-progress'),
+    path('metrics/', metrics_view, name='metrics'),
+    path('async/modules/', async_views.modules, name='async-modules'),
+    path('async/lessons/by_module/', async_views.lessons_by_module, name='async-lessons-by-module'),
+    path('async/questions/by_module/', async_views.questions_by_module, name='async-questions-by-module'),
+    path('async/progress/by_user/', async_views.progress_by_user, name='async-progress-by-user'),
     path('', include(router.urls)),
 ]
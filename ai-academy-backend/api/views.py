@@ -1,15 +1,31 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
-from django.db.models import Q
+from django.http import HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.conf import settings
+from . import catalog, content, dashboard, grading, leaderboards, lesson_bodies, provisioning, queries, questionnaire
+from .caching import CachedResponseMixin, cached_response
+from .compiled import CompiledListMixin, FastJSONRenderer
+from .activity import buffer as activity_buffer
+from .pagination import UserPagination, TestResultPagination, SearchPagination
+from .progress import bulk_upsert, record_lesson_event
+from .results import record_final
+from .search import search_user_ids
 from .models import (
-    User, Module, Lesson, Question, Answer,
-    UserProgress, TestResult, AIAgent, AIAgentQuestion
+    User, Module,
+    UserProgress, TestResult, AIAgent, AIAgentQuestion,
+    UserStats, DepartmentStats, ModuleStats
 )
 from .serializers import (
     UserSerializer, UserDetailSerializer, ModuleSerializer, LessonSerializer,
-    QuestionSerializer, AnswerSerializer, UserProgressSerializer,
-    TestResultSerializer, AIAgentSerializer, AIAgentQuestionSerializer
+    QuestionSerializer, UserProgressSerializer,
+    TestResultSerializer, AIAgentSerializer, AIAgentQuestionSerializer, TestSubmissionSerializer,
+    HeartbeatSerializer, LessonEventSerializer,
+    UserStatsSerializer, DepartmentStatsSerializer, ModuleStatsSerializer, LeaderboardEntrySerializer
 )
 
 
@@ -17,63 +33,129 @@ class UserViewSet(viewsets.ModelViewSet):
     """
     ViewSet for User model
     Endpoints:
-    - GET /api/users/ - List all users
+    - GET /api/users/ - List all users (cursor pagination, ?page=N for page numbers)
     - POST /api/users/ - Create new user
     - GET /api/users/{id}/ - Get user detail
     - PUT /api/users/{id}/ - Update user
     - DELETE /api/users/{id}/ - Delete user
     - GET /api/users/{id}/detail/ - Get detailed user info with progress
+    - POST /api/users/{id}/heartbeat/ - Report activity (buffered time_spent/last_activity)
+    - POST /api/users/provision/ - Create users from a CSV/JSON roster (admin only)
+    Every response supports ?fields=a,b and ?expand=progress,test_results,ai_agent
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = UserPagination
 
     def get_serializer_class(self):
         if self.action == 'detail_with_progress':
             return UserDetailSerializer
         return UserSerializer
 
+    def get_queryset(self):
+        return queries.expanded(super().get_queryset(), self.get_serializer_class(), self.request)
+
     @action(detail=True, methods=['get'])
     def detail_with_progress(self, request, pk=None):
         """Get detailed user information including progress and test results"""
         user = self.get_object()
-        serializer = UserDetailSerializer(user)
+        serializer = self.get_serializer(user)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'])
+    def heartbeat(self, request, pk=None):
+        """Buffer an activity increment; written to the DB in batches"""
+        if not str(pk).isdigit():
+            return Response({'error': 'invalid user id'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = HeartbeatSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        activity_buffer.add(int(pk), serializer.validated_data['minutes'])
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+    @action(
+        detail=False, methods=['post'], permission_classes=[IsAdminUser],
+        parser_classes=[JSONParser, provisioning.CSVParser],
+    )
+    def provision(self, request):
+        """Validate a roster and bulk-create its users (?dry_run=1 validates only)"""
+        roster = request.data.get('users') if isinstance(request.data, dict) else request.data
+        if not isinstance(roster, list) or not roster:
+            return Response({'error': 'non-empty list of users required'}, status=status.HTTP_400_BAD_REQUEST)
+        max_rows = getattr(settings, 'PROVISIONING_MAX_ROWS', 10000)
+        if len(roster) > max_rows:
+            return Response({'error': f'at most {max_rows} users per request'}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        try:
+            results = provisioning.provision(roster, dry_run=dry_run)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+        created = sum(1 for outcome in results if outcome['status'] == 'created')
+        return Response(
+            {'created': created, 'dry_run': dry_run, 'results': results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Search users by name, email or department"""
-        query = request.query_params.get('q', '')
-        users = self.queryset.filter(
-            Q(username__icontains=query) |
-            Q(email__icontains=query) |
-            Q(department__icontains=query)
-        )
-        serializer = self.get_serializer(users, many=True)
-        return Response(serializer.data)
+        """Search users by name, email or department (ranked, prefix matching, paginated)"""
+        query = request.query_params.get('q', '').strip()
+        min_length = getattr(settings, 'USER_SEARCH_MIN_LENGTH', 2)
+        if len(query) < min_length:
+            return Response(
+                {'error': f'q must be at least {min_length} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        ids = search_user_ids(query, limit=getattr(settings, 'USER_SEARCH_MAX_RESULTS', 500))
+        paginator = SearchPagination()
+        page_ids = paginator.paginate_queryset(ids, request, view=self)
+        users = self.get_queryset().in_bulk(page_ids)
+        serializer = self.get_serializer([users[pk] for pk in page_ids if pk in users], many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class ModuleViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Module model
     Endpoints:
-    - GET /api/modules/ - List all modules
+    - GET /api/modules/ - List all modules (cached snapshot, ETag/304)
     - POST /api/modules/ - Create new module
     - GET /api/modules/{id}/ - Get module detail with lessons
     - PUT /api/modules/{id}/ - Update module
     - DELETE /api/modules/{id}/ - Delete module
     """
-    queryset = Module.objects.filter(is_active=True).prefetch_related('lessons', 'questions')
+    queryset = queries.modules(Module.objects.filter(is_active=True))
     serializer_class = ModuleSerializer
 
+    def list(self, request, *args, **kwargs):
+        """List active modules from the precomputed catalog snapshot"""
+        snapshot = catalog.get_snapshot()
+        etag = catalog.etag_for(snapshot, request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        modules = catalog.modules_for(snapshot, request)
+        page = self.paginate_queryset(modules)
+        if page is not None:
+            response = self.get_paginated_response(page)
+        else:
+            response = Response(modules)
+        response['ETag'] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
+
     @action(detail=False, methods=['get'])
     def all_with_inactive(self, request):
         """Get all modules including inactive ones"""
-        modules = Module.objects.all().prefetch_related('lessons', 'questions')
+        modules = queries.modules()
         serializer = self.get_serializer(modules, many=True)
         return Response(serializer.data)
 
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet for Lesson model
     Endpoints:
@@ -83,11 +165,22 @@ class LessonViewSet(viewsets.ModelViewSet):
     - PUT /api/lessons/{id}/ - Update lesson
     - DELETE /api/lessons/{id}/ - Delete lesson
     - GET /api/lessons/module/{module_id}/ - Get lessons by module
+    - GET /api/lessons/{id}/body/ - Lesson text, pre-compressed (gzip/br, strong ETag)
     """
-    queryset = Lesson.objects.all().select_related('module')
+    queryset = queries.lessons()
     serializer_class = LessonSerializer
+    cache_namespaces = ('content',)
+
+    @action(detail=True, methods=['get'])
+    def body(self, request, pk=None):
+        """Serve the stored lesson body in the best encoding the client accepts"""
+        body = lesson_bodies.get(pk) if str(pk).isdigit() else None
+        if body is None:
+            return Response({'error': 'Lesson not found'}, status=status.HTTP_404_NOT_FOUND)
+        return lesson_bodies.respond(request, body)
 
     @action(detail=False, methods=['get'])
+    @cached_response('content')
     def by_module(self, request):
         """Get lessons filtered by module ID"""
         module_id = request.query_params.get('module_id')
@@ -98,7 +191,7 @@ class LessonViewSet(viewsets.ModelViewSet):
         return Response({'error': 'module_id parameter required'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(CachedResponseMixin, CompiledListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Question model with answers
     Endpoints:
@@ -109,21 +202,22 @@ class QuestionViewSet(viewsets.ModelViewSet):
     - DELETE /api/questions/{id}/ - Delete question
     - GET /api/questions/module/{module_id}/ - Get questions by module
     """
-    queryset = Question.objects.all().prefetch_related('answers').select_related('module', 'lesson')
+    queryset = queries.questions()
     serializer_class = QuestionSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    cache_namespaces = ('content',)
 
     @action(detail=False, methods=['get'])
+    @cached_response('content')
     def by_module(self, request):
         """Get questions filtered by module ID"""
         module_id = request.query_params.get('module_id')
         if module_id:
-            questions = self.queryset.filter(module_id=module_id)
-            serializer = self.get_serializer(questions, many=True)
-            return Response(serializer.data)
+            return self.compiled_list(self.queryset.filter(module_id=module_id))
         return Response({'error': 'module_id parameter required'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserProgressViewSet(viewsets.ModelViewSet):
+class UserProgressViewSet(CompiledListMixin, viewsets.ModelViewSet):
     """
     ViewSet for UserProgress model
     Endpoints:
@@ -133,18 +227,19 @@ class UserProgressViewSet(viewsets.ModelViewSet):
     - PUT /api/progress/{id}/ - Update progress
     - DELETE /api/progress/{id}/ - Delete progress
     - GET /api/progress/user/{user_id}/ - Get progress by user
+    - POST /api/progress/bulk_update_or_create/ - Upsert a batch of progress deltas
+    - POST /api/progress/lesson_event/ - Record a lesson view/completion (counters kept server-side)
     """
     queryset = UserProgress.objects.all().select_related('user', 'module')
     serializer_class = UserProgressSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
     @action(detail=False, methods=['get'])
     def by_user(self, request):
         """Get progress filtered by user ID"""
         user_id = request.query_params.get('user_id')
         if user_id:
-            progress = self.queryset.filter(user_id=user_id)
-            serializer = self.get_serializer(progress, many=True)
-            return Response(serializer.data)
+            return self.compiled_list(self.queryset.filter(user_id=user_id))
         return Response({'error': 'user_id parameter required'}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=['post'])
@@ -176,44 +271,106 @@ class UserProgressViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(progress)
         return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
+    @action(detail=False, methods=['post'])
+    def bulk_update_or_create(self, request):
+        """Upsert many (user_id, module_id) progress rows in one statement"""
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'non-empty list of items required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_items = getattr(settings, 'PROGRESS_BULK_MAX_ITEMS', 500)
+        if len(items) > max_items:
+            return Response({'error': f'at most {max_items} items per request'}, status=status.HTTP_400_BAD_REQUEST)
 
-class TestResultViewSet(viewsets.ModelViewSet):
+        return Response({'results': bulk_upsert(items)})
+
+    @action(detail=False, methods=['post'])
+    def lesson_event(self, request):
+        """Record a lesson view or completion and return the updated module progress"""
+        serializer = LessonEventSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            progress = record_lesson_event(data['user_id'], data['lesson_id'], data['event'] == 'complete')
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(progress).data)
+
+
+class TestResultViewSet(CompiledListMixin, viewsets.ModelViewSet):
     """
     ViewSet for TestResult model
     Endpoints:
-    - GET /api/test-results/ - List all test results
-    - POST /api/test-results/ - Create new test result (replaces old one for same module)
+    - GET /api/test-results/ - List all test results (cursor pagination, ?page=N for page numbers)
+    - POST /api/test-results/ - Create new test result (upserts the module-final result)
     - GET /api/test-results/{id}/ - Get test result detail
     - PUT /api/test-results/{id}/ - Update test result
     - DELETE /api/test-results/{id}/ - Delete test result
     - GET /api/test-results/user/{user_id}/ - Get results by user
+    - POST /api/test-results/grade/ - Grade submitted answers server-side and save the result
     """
     queryset = TestResult.objects.all().select_related('user', 'module', 'lesson')
     serializer_class = TestResultSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = TestResultPagination
 
     def create(self, request, *args, **kwargs):
         """Create new test result, replacing any existing result for the same module"""
-        user_id = request.data.get('user')
-        module_id = request.data.get('module')
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if data.get('lesson') is not None:
+            # Результаты тестов уроков хранятся как отдельные записи
+            self.perform_create(serializer)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        # Итоговый тест модуля: одна запись на пару (user, module), один UPSERT
+        result = record_final(
+            user_id=data['user'].pk,
+            module_id=data['module'].pk,
+            score=data['score'],
+            passed=data.get('passed', False),
+        )
+        return Response(self.get_serializer(result).data, status=status.HTTP_201_CREATED)
 
-        if user_id and module_id:
-            # Удаляем предыдущий результат для этого модуля (если есть)
-            TestResult.objects.filter(
-                user_id=user_id,
-                module_id=module_id,
-                lesson__isnull=True  # Только результаты итогового теста модуля
-            ).delete()
+    def perform_create(self, serializer):
+        serializer.save(best_score=serializer.validated_data['score'])
 
-        return super().create(request, *args, **kwargs)
+    @action(detail=False, methods=['post'])
+    def grade(self, request):
+        """Grade submitted answer IDs against the answer key and save the result"""
+        submission = TestSubmissionSerializer(data=request.data)
+        submission.is_valid(raise_exception=True)
+        data = submission.validated_data
+        lesson = data.get('lesson')
+
+        try:
+            outcome = grading.grade(data['module'].pk, lesson.pk if lesson else None, data['answers'])
+        except grading.GradingError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if lesson is None:
+            result = record_final(
+                user_id=data['user'].pk,
+                module_id=data['module'].pk,
+                score=outcome['score'],
+                passed=outcome['passed'],
+            )
+        else:
+            result = TestResult.objects.create(
+                user=data['user'], module=data['module'], lesson=lesson,
+                score=outcome['score'], passed=outcome['passed'], best_score=outcome['score'],
+            )
+        outcome['result'] = self.get_serializer(result).data
+        return Response(outcome, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['get'])
     def by_user(self, request):
         """Get test results filtered by user ID"""
         user_id = request.query_params.get('user_id')
         if user_id:
-            results = self.queryset.filter(user_id=user_id)
-            serializer = self.get_serializer(results, many=True)
-            return Response(serializer.data)
+            return self.compiled_list(self.queryset.filter(user_id=user_id))
         return Response({'error': 'user_id parameter required'}, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -245,12 +402,201 @@ class AIAgentViewSet(viewsets.ModelViewSet):
         return Response({'error': 'user_id parameter required'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AIAgentQuestionViewSet(viewsets.ReadOnlyModelViewSet):
+class AIAgentQuestionViewSet(CachedResponseMixin, CompiledListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for AIAgentQuestion model (read-only)
     Endpoints:
     - GET /api/ai-agent-questions/ - List all questions with options
     - GET /api/ai-agent-questions/{id}/ - Get question detail
+    - GET /api/ai-agent-questions/questionnaire/ - Whole questionnaire, pre-rendered (?v= version, immutable)
     """
     queryset = AIAgentQuestion.objects.all().prefetch_related('options')
     serializer_class = AIAgentQuestionSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    cache_namespaces = ('agent_questions',)
+
+    @action(detail=False, methods=['get'])
+    def questionnaire(self, request):
+        """Serve the pre-rendered questionnaire with its version as ETag"""
+        body, version = questionnaire.get()
+        versioned = f'{request.path}?v={version}'
+        requested = request.query_params.get('v')
+        if requested is not None and requested != version:
+            response = HttpResponseRedirect(versioned)
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        etag = f'"{version}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Content-Location'] = versioned
+        if requested is None:
+            patch_cache_control(response, public=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response, public=True, immutable=True,
+                max_age=getattr(settings, 'QUESTIONNAIRE_MAX_AGE', 31536000),
+            )
+        return response
+
+
+class UserStatsViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Precomputed per-user analytics (read-only)
+    Endpoints:
+    - GET /api/analytics/users/ - List user rollups (?department= to filter)
+    - GET /api/analytics/users/{user_id}/ - Get one user's rollup
+    """
+    queryset = UserStats.objects.all().order_by('user_id')
+    serializer_class = UserStatsSerializer
+    lookup_field = 'user'
+    cache_namespaces = ('analytics',)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        department = self.request.query_params.get('department')
+        if department:
+            queryset = queryset.filter(department=department)
+        return queryset
+
+
+class DepartmentStatsViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Precomputed per-department analytics (read-only)
+    Endpoints:
+    - GET /api/analytics/departments/ - List department rollups
+    - GET /api/analytics/departments/{department}/ - Get one department's rollup
+    """
+    queryset = DepartmentStats.objects.all()
+    serializer_class = DepartmentStatsSerializer
+    lookup_value_regex = '[^/]+'
+    cache_namespaces = ('analytics',)
+
+
+class ModuleStatsViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Precomputed per-module analytics (read-only)
+    Endpoints:
+    - GET /api/analytics/modules/ - List module rollups
+    - GET /api/analytics/modules/{module_id}/ - Get one module's rollup
+    """
+    queryset = ModuleStats.objects.all().select_related('module').order_by('module__order', 'module_id')
+    serializer_class = ModuleStatsSerializer
+    lookup_field = 'module'
+    cache_namespaces = ('module_analytics', 'content')
+
+
+class LeaderboardViewSet(viewsets.ViewSet):
+    """
+    Rankings by module-final test score, then modules completed, then tests passed (read-only)
+    Endpoints:
+    - GET /api/leaderboards/top/ - Top entries (?module_id= or ?department=, else global; ?limit=)
+    - GET /api/leaderboards/rank/?user_id={id} - A user's rank on the same boards
+    """
+
+    def _board(self, request):
+        """(board, None) from the query string, or (None, error response)"""
+        module_id = request.query_params.get('module_id')
+        department = request.query_params.get('department')
+        if module_id is not None and department is not None:
+            return None, Response({'error': 'Use either module_id or department'}, status=status.HTTP_400_BAD_REQUEST)
+        if module_id is not None and not module_id.isdigit():
+            return None, Response({'error': 'module_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return leaderboards.board_for(module_id, department), None
+
+    @action(detail=False, methods=['get'])
+    @cached_response('leaderboards')
+    def top(self, request):
+        """First entries of a board"""
+        board, error = self._board(request)
+        if error:
+            return error
+        max_limit = getattr(settings, 'LEADERBOARD_MAX_LIMIT', 100)
+        limit = request.query_params.get('limit', str(getattr(settings, 'LEADERBOARD_DEFAULT_LIMIT', 10)))
+        if not limit.isdigit() or not 1 <= int(limit) <= max_limit:
+            return Response(
+                {'error': f'limit must be between 1 and {max_limit}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        entries = leaderboards.top(board, int(limit))
+        return Response({'board': board, 'results': LeaderboardEntrySerializer(entries, many=True).data})
+
+    @action(detail=False, methods=['get'])
+    @cached_response('leaderboards')
+    def rank(self, request):
+        """A user's entry and rank on a board"""
+        board, error = self._board(request)
+        if error:
+            return error
+        user_id = request.query_params.get('user_id')
+        if not user_id or not user_id.isdigit():
+            return Response({'error': 'user_id parameter required'}, status=status.HTTP_400_BAD_REQUEST)
+        entry = leaderboards.rank_of(board, int(user_id))
+        if entry is None:
+            return Response({'error': 'User is not on this leaderboard'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'board': board, **LeaderboardEntrySerializer(entry).data})
+
+
+class MeViewSet(viewsets.ViewSet):
+    """
+    Aggregate endpoints for the current student
+    Endpoints:
+    - GET /api/me/dashboard/?user_id={id} - Catalog, progress, final results and AI agent status (ETag/304)
+    """
+
+    @action(detail=False, methods=['get'])
+    def dashboard(self, request):
+        """Home screen data in one response"""
+        user_id = request.query_params.get('user_id')
+        if not user_id and request.user.is_authenticated:
+            user_id = request.user.pk
+        if not user_id or not str(user_id).isdigit():
+            return Response({'error': 'user_id parameter required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = dashboard.load_user(user_id)
+        if user is None:
+            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        snapshot = catalog.get_snapshot()
+        etag = dashboard.etag_for(user, snapshot, request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            patch_cache_control(not_modified, private=True, no_cache=True)
+            return not_modified
+
+        response = Response(dashboard.build(user, catalog.modules_for(snapshot, request)))
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ContentViewSet(viewsets.ViewSet):
+    """
+    Bulk import/export of module trees (staff only)
+    Endpoints:
+    - GET /api/content/export/ - Export modules with lessons, questions and answers (?module=, ?format=json|yaml)
+    - POST /api/content/import/ - Import a content document (JSON or YAML body, ?dry_run=1)
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [JSONRenderer, content.YAMLRenderer]
+    parser_classes = [JSONParser, content.YAMLParser]
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Export the content document"""
+        module_ids = request.query_params.getlist('module')
+        if not all(value.isdigit() for value in module_ids):
+            return Response({'error': 'module must be an integer id'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(content.export_tree([int(value) for value in module_ids] or None))
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_content(self, request):
+        """Import a content document, writing only changed rows"""
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        try:
+            stats = content.import_tree(request.data, dry_run=dry_run)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'dry_run': dry_run, 'tables': stats})
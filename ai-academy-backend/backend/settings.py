@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -42,6 +43,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.replicas.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -72,6 +74,12 @@ DATABASES = {
     }
 }
 
+# Safe api reads go to DATABASE_REPLICAS (api.replicas); inert while that list is empty
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+# Custom user model
+AUTH_USER_MODEL = 'api.User'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -118,6 +126,67 @@ REST_FRAMEWORK = {
     ]
 }
 
+# Cache: in-process LRU per worker (settings_prod switches to Redis when REDIS_URL is set)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'istudy',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+# Namespaced response cache (api.caching): cache alias and entry timeout in seconds; responses are only cached in a shared cache
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 300
+
+# Browser/CDN lifetime of the versioned AI agent questionnaire (?v=<version>), in seconds
+QUESTIONNAIRE_MAX_AGE = 31536000
+
+# Bulk user provisioning: roster size limit and password hashing processes (None = available CPUs)
+PROVISIONING_MAX_ROWS = 10000
+PROVISIONING_HASH_WORKERS = None
+
+# Read replicas: DATABASES aliases for safe api reads, seconds a writing client stays on the primary,
+# and the META key with the client address behind a proxy (e.g. 'HTTP_X_FORWARDED_FOR'; None = REMOTE_ADDR)
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = 5
+REPLICA_CLIENT_IP_HEADER = None
+
+# GET /api/leaderboards/top/: entries returned without ?limit= and the largest accepted ?limit=
+LEADERBOARD_DEFAULT_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
+
+# Module catalog snapshot (any alias from CACHES; keyed by the content version, expires after the timeout in seconds)
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = 300
+
+# Upper bound for POST /api/progress/bulk_update_or_create/
+PROGRESS_BULK_MAX_ITEMS = 500
+
+# Module-final TestResult row keeps the 'latest' or the 'best' attempt
+TEST_RESULT_MODE = 'latest'
+
+# GET /api/users/search/: shortest accepted query and cap on ranked hits
+USER_SEARCH_MIN_LENGTH = 2
+USER_SEARCH_MAX_RESULTS = 500
+
+# Refresh user and department rollups and leaderboards after each write (False: rely on `manage.py rebuild_analytics` / `rebuild_leaderboards`)
+ANALYTICS_LIVE_UPDATES = True
+
+# Rows fetched per database round trip by the streaming exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Minimal score (percent) for a test graded by POST /api/test-results/grade/ to pass
+TEST_PASS_SCORE = 70
+
+# Seconds between write-behind flushes of user heartbeats (<= 0: write immediately)
+ACTIVITY_FLUSH_INTERVAL = 10
+
+# Per-endpoint metrics (GET /api/metrics/): on/off, N+1 threshold (same SQL per request), series cap
+METRICS_ENABLED = True
+METRICS_N_PLUS_ONE_THRESHOLD = 10
+METRICS_MAX_SERIES = 1000
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -24,6 +24,27 @@ DATABASES = {
     )
 }
 
+# Read replicas: comma-separated DATABASE_REPLICA_URLS (see api.replicas); tests mirror them to default
+DATABASE_REPLICAS = []
+REPLICA_URLS = [url.strip() for url in config('DATABASE_REPLICA_URLS', default='').split(',') if url.strip()]
+for index, url in enumerate(REPLICA_URLS, start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True)
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+REPLICA_CLIENT_IP_HEADER = config('REPLICA_CLIENT_IP_HEADER', default='HTTP_X_FORWARDED_FOR')
+
+# Shared cache for all workers; without REDIS_URL the per-process LRU from settings.py is used and API responses are not cached
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'istudy',
+        }
+    }
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='').split(',')
 
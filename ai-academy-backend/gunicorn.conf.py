@@ -0,0 +1,13 @@
+"""
+Gunicorn settings, read from the working directory by `gunicorn` (Procfile, Dockerfile).
+"""
+
+
+def worker_exit(server, worker):
+    """Write the heartbeats this worker still buffers before it goes away"""
+    from api.activity import buffer
+
+    try:
+        buffer.flush()
+    except Exception:
+        server.log.exception('Failed to flush user activity on worker exit')